@@ -5,6 +5,7 @@ root_dir = Path(__file__).resolve().parents[2]
 sys.path.append(str(root_dir))
 
 from src.server.DataProcessing import DataProcessing
+from src.server.ResultCache import ResultCache
 from src.server.Visualization.VisualizationFactory import VisualizationFactory
 import streamlit as st
 import matplotlib.pyplot as plt
@@ -21,7 +22,7 @@ class DataVisualizationDashboard:
 
     @st.cache_resource
     def initialize_pipeline(_self):
-        pipeline = DataProcessing()
+        pipeline = DataProcessing(parallel=True, cache=ResultCache())
         pipeline.ingest_data()
         pipeline.process_data()
         return pipeline
@@ -38,7 +39,7 @@ class DataVisualizationDashboard:
     
     def render_json_visualizations(self):
         json_data = self.pipeline.processed_data.get('json')
-        visualization = VisualizationFactory.create_visualization('json', json_data)
+        visualization = VisualizationFactory.create_visualization('json', json_data, metrics=self.pipeline.metrics)
 
         st.header("JSON Data Visualizations")
 
@@ -93,7 +94,7 @@ class DataVisualizationDashboard:
 
     def render_csv_visualizations(self):
         csv_data = self.pipeline.processed_data.get('csv')
-        visualization = VisualizationFactory.create_visualization('csv', csv_data)
+        visualization = VisualizationFactory.create_visualization('csv', csv_data, metrics=self.pipeline.metrics)
 
         st.header("CSV Data Visualizations")
         
@@ -106,7 +107,7 @@ class DataVisualizationDashboard:
 
     def render_pdf_visualizations(self):
         pdf_data = self.pipeline.processed_data.get('pdf')
-        visualization = VisualizationFactory.create_visualization('pdf', pdf_data)
+        visualization = VisualizationFactory.create_visualization('pdf', pdf_data, metrics=self.pipeline.metrics)
 
         st.header("PDF Data Visualizations")
         
@@ -118,7 +119,7 @@ class DataVisualizationDashboard:
     
     def render_pptx_visualizations(self):
         pptx_data = self.pipeline.processed_data.get('pptx')
-        visualization = VisualizationFactory.create_visualization('pptx', pptx_data)
+        visualization = VisualizationFactory.create_visualization('pptx', pptx_data, metrics=self.pipeline.metrics)
 
         st.header("PPTX Data Visualizations")
         
@@ -1,32 +1,526 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, g, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.datastructures import MultiDict
+from src.server.DataProcessor.ProcessedDataset import ProcessedDataset
+from src.server.Metrics import Metrics
+from src.server.TableIndex import TableIndex
+from src.server.PreforkServer import PreforkServer
+import pyarrow as pa
+import pyarrow.parquet as pq
+import base64
+import gzip
+import hashlib
+import json
+import sys
+import threading
+import time
+import zlib
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where the peak RSS gauge is left out
+    resource = None
+
+class CachedResponse:
+    def __init__(self, version, body, gzip_body):
+        self.version = version
+        self.body = body
+        self.gzip_body = gzip_body
+        # Strong ETags must differ between the identity and gzip representations
+        digest = hashlib.sha1(body).hexdigest()
+        self.etag = digest
+        self.gzip_etag = f"{digest}-gzip"
+
+class DatasetJSONProvider(DefaultJSONProvider):
+    """Serialize a ProcessedDataset as its records, which are only built while encoding."""
+    @staticmethod
+    def default(o):
+        if isinstance(o, ProcessedDataset):
+            return o.to_records()
+        return DefaultJSONProvider.default(o)
 
 class APIHandler:
-    def __init__(self, json_data, csv_data, pdf_data, pptx_data):
-        self.json_data = json_data
-        self.csv_data = csv_data
-        self.pdf_data = pdf_data
-        self.pptx_data = pptx_data
+    DATA_TYPES = ("json", "csv", "pdf", "pptx")
+    GZIP_LEVEL = 6
+    FORMAT_PARAMETERS = ("stream", "format")
+    PAGINATION_PARAMETERS = ("limit", "offset", "cursor")
+    QUERY_PARAMETERS = PAGINATION_PARAMETERS + ("fields",) + FORMAT_PARAMETERS
+    AGGREGATE_PARAMETERS = ("group_by", "metric", "reducer", "q")
+    # Tabular views that can be queried and aggregated, with the data type they are derived from
+    TABLES = {"csv": "csv", "pdf": "pdf", "json": "json", "employees": "json", "performance": "json"}
+    CHILD_TABLES = {"employees": "Employees", "performance": "Performance"}
+    # Output formats by media type, in order of preference when the client accepts several
+    MIMETYPES = {
+        "json": "application/json",
+        "ndjson": "application/x-ndjson",
+        "arrow": "application/vnd.apache.arrow.stream",
+        "parquet": "application/vnd.apache.parquet",
+    }
+    COLUMNAR_FORMATS = ("arrow", "parquet")
+    # Routes whose representation is picked from the Accept and Accept-Encoding headers
+    NEGOTIATED_ROUTES = ("/api/data", "/api/data/<file_type>")
+    MAX_CACHED_AGGREGATES = 256
+    # Streamed lines are sent in chunks of about this many bytes, filtered rows are serialized this many at a time
+    STREAM_BUFFER_SIZE = 64 * 1024
+    STREAM_BATCH_ROWS = 1000
+
+    def __init__(self, json_data, csv_data, pdf_data, pptx_data, metrics=None):
+        # Requests read this (datasets, versions) pair once and update_data replaces it whole, so a
+        # reader never sees a mix of old and new results. Versions key the serialized responses.
+        self.snapshot = ({"json": json_data, "csv": csv_data, "pdf": pdf_data, "pptx": pptx_data}, dict.fromkeys(self.DATA_TYPES, 0))
+        self.update_lock = threading.Lock()
+        # One CachedResponse per route key, replaced when its data version moves on
+        self.response_cache = {}
+        # One (version, TableIndex) per tabular data type, built on the first query of a version
+        self.table_indexes = {}
+        # Aggregate results keyed by table and query, each stored with the data version it was computed on
+        self.aggregate_cache = {}
+        # (version, encoded body) of each whole table per columnar format
+        self.columnar_cache = {}
+        # Shared with DataProcessing so /metrics also reports the pipeline stages
+        self.metrics = metrics or Metrics()
         self.app = Flask(__name__)
+        self.app.json = DatasetJSONProvider(self.app)
+        self.setup_metrics()
         self.setup_routes()
 
+    @property
+    def datasets(self):
+        return self.snapshot[0]
+
+    def update_data(self, data_type, data):
+        """Atomically swap in a new processed result for one data type."""
+        with self.update_lock:
+            datasets, versions = self.snapshot
+            datasets = dict(datasets)
+            versions = dict(versions)
+            datasets[data_type] = data
+            versions[data_type] += 1
+            self.snapshot = (datasets, versions)
+
+    def setup_metrics(self):
+        @self.app.before_request
+        def start_timer():
+            g.request_start = time.perf_counter()
+
+        @self.app.after_request
+        def record_request(response):
+            # Latency is measured up to the response headers, so streamed bodies only count their first chunk
+            labels = {"route": request.url_rule.rule if request.url_rule else "unmatched", "file_type": self.get_route_file_type()}
+            self.metrics.observe("http_request_duration_seconds", time.perf_counter() - g.request_start, labels)
+            self.metrics.inc("http_requests_total", {**labels, "status": str(response.status_code)})
+            if response.is_streamed:
+                response.response = self.count_streamed_bytes(response.response, labels)
+            else:
+                self.metrics.inc("http_response_bytes_total", labels, response.content_length or 0)
+            return response
+
+        @self.app.route('/metrics', methods=['GET'])
+        def get_metrics():
+            if resource:
+                peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+                self.metrics.set("process_peak_rss_bytes", peak_rss if sys.platform == 'darwin' else peak_rss * 1024)
+            return Response(self.metrics.render(), mimetype='text/plain; version=0.0.4')
+
+    def get_route_file_type(self):
+        view_args = request.view_args or {}
+        file_type = view_args.get('file_type') or view_args.get('table') or ""
+        # Unknown types from the URL would add a label series per distinct path
+        if file_type and file_type not in self.TABLES and file_type not in self.DATA_TYPES:
+            return "invalid"
+        return file_type
+
+    def count_streamed_bytes(self, chunks, labels):
+        for chunk in chunks:
+            self.metrics.inc("http_response_bytes_total", labels, len(chunk))
+            yield chunk
+
     def setup_routes(self):
+        @self.app.after_request
+        def vary_on_format(response):
+            # Set on every response of these routes, errors included, so shared caches keep the formats apart
+            if request.url_rule and request.url_rule.rule in self.NEGOTIATED_ROUTES:
+                response.headers['Vary'] = 'Accept, Accept-Encoding'
+            return response
+
         @self.app.route('/api/data', methods=['GET'])
         def get_data():
-            return jsonify({"json_data": self.json_data['json_data'], "csv_data": self.csv_data, "pdf_data": self.pdf_data, "pptx_data": self.pptx_data})
-        
+            datasets, versions = self.snapshot
+            output_format = self.negotiate_format()
+            if output_format is None:
+                return jsonify({"error": f"Unsupported format: {request.args['format']}"}), 400
+            if output_format in self.COLUMNAR_FORMATS:
+                return jsonify({"error": "Columnar formats are only available from /api/data/<file_type>"}), 406
+            if output_format == 'ndjson':
+                if set(request.args) - set(self.FORMAT_PARAMETERS):
+                    return jsonify({"error": "Only /api/data/<file_type> supports query parameters"}), 400
+                return self.stream_response({"type": data_type, "record": record} for data_type in self.DATA_TYPES for record in self.iter_records(data_type, datasets[data_type]))
+            version = tuple(versions[data_type] for data_type in self.DATA_TYPES)
+            return self.cached_response('all', version, lambda: self.all_payload(datasets))
+
         @self.app.route('/api/data/<file_type>', methods=['GET'])
         def get_data_by_type(file_type):
+            if file_type not in self.TABLES and file_type != 'pptx':
+                return jsonify({"error": "Invalid file type"}), 404
+
+            datasets, versions = self.snapshot
+            data_type = self.TABLES.get(file_type, file_type)
+            data, version = datasets[data_type], versions[data_type]
+
+            output_format = self.negotiate_format()
+            if output_format is None:
+                return jsonify({"error": f"Unsupported format: {request.args['format']}"}), 400
+            if output_format == 'ndjson':
+                return self.stream_query_response(file_type, data, version)
+            if output_format in self.COLUMNAR_FORMATS:
+                return self.columnar_response(file_type, data, version, output_format)
+            # The tables flattened out of the JSON data only exist as query results
+            if request.args or file_type not in self.DATA_TYPES:
+                return self.query_response(file_type, data, version)
+
             if file_type == 'json':
-                return self.json_data
-            elif file_type == 'csv':
-                return jsonify({"csv_data": self.csv_data})
-            elif file_type == 'pdf':
-                return jsonify({"pdf_data": self.pdf_data})
-            elif file_type == 'pptx':
-                return jsonify({"pptx_data": self.pptx_data})
+                return self.cached_response(file_type, version, lambda: data)
+            return self.cached_response(file_type, version, lambda: {f"{file_type}_data": data})
+
+        @self.app.route('/api/aggregate/<table>', methods=['GET'])
+        def get_aggregate(table):
+            if table not in self.TABLES:
+                return jsonify({"error": "Invalid table"}), 404
+
+            datasets, versions = self.snapshot
+            data_type = self.TABLES[table]
+            return self.aggregate_response(table, datasets[data_type], versions[data_type])
+
+    def warm_caches(self):
+        """Build the whole-table responses and table indexes of the current data versions up front.
+
+        Forked workers then share them copy-on-write instead of each building its own copy after
+        the fork. Aggregate results depend on the query and are still computed by each worker,
+        from the shared indexes and cubes.
+        """
+        with self.app.app_context():
+            datasets, versions = self.snapshot
+            self.get_cached_body('all', tuple(versions[data_type] for data_type in self.DATA_TYPES), lambda: self.all_payload(datasets))
+            for data_type in self.DATA_TYPES:
+                data = datasets[data_type]
+                self.get_cached_body(data_type, versions[data_type], lambda: data if data_type == 'json' else {f"{data_type}_data": data})
+
+            for table, data_type in self.TABLES.items():
+                table_index = self.get_table_index(table, datasets[data_type], versions[data_type])
+                table_index.build_indexes()
+                for output_format in self.COLUMNAR_FORMATS:
+                    try:
+                        self.get_columnar_body(table, table_index, versions[data_type], output_format)
+                    except pa.ArrowException:
+                        # Answered with 406 when asked for, as before
+                        pass
+
+    def all_payload(self, datasets):
+        return {"json_data": datasets['json']['json_data'], "csv_data": datasets['csv'], "pdf_data": datasets['pdf'], "pptx_data": datasets['pptx']}
+
+    def get_cached_body(self, route_key, version, build_payload):
+        cached = self.response_cache.get(route_key)
+        if cached is None or cached.version != version:
+            body = (self.app.json.dumps(build_payload()) + "\n").encode('utf-8')
+            cached = CachedResponse(version, body, gzip.compress(body, compresslevel=self.GZIP_LEVEL))
+            self.response_cache[route_key] = cached
+        return cached
+
+    def cached_response(self, route_key, version, build_payload):
+        """Serve the payload serialized once per data version, answering If-None-Match with 304."""
+        cached = self.get_cached_body(route_key, version, build_payload)
+
+        use_gzip = request.accept_encodings['gzip'] > 0
+        etag = cached.gzip_etag if use_gzip else cached.etag
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(cached.gzip_body if use_gzip else cached.body, mimetype='application/json')
+            if use_gzip:
+                response.headers['Content-Encoding'] = 'gzip'
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    def query_response(self, file_type, data, version):
+        """Answer limit/offset/cursor pagination, fields projection and Column=value or Column__gte=value filters."""
+        args = request.args
+        fields = args['fields'].split(',') if args.get('fields') else None
+
+        if file_type == 'pptx':
+            if set(args) - {'fields', *self.FORMAT_PARAMETERS}:
+                return jsonify({"error": "Only fields is supported for pptx data"}), 400
+            missing = [field for field in fields or [] if field not in data]
+            if missing:
+                return jsonify({"error": f"Unknown field: {', '.join(missing)}"}), 400
+            return jsonify({"pptx_data": {key: value for key, value in data.items() if not fields or key in fields}})
+
+        # The filters and fields travel in the cursor, so following it alone keeps paging the same query
+        query = self.get_query_items(args)
+        try:
+            if 'cursor' in args:
+                cursor_version, offset, limit, cursor_query = self.decode_cursor(args['cursor'])
+                if cursor_version != version:
+                    return jsonify({"error": "Cursor expired, the data has changed"}), 410
+                if query and query != cursor_query:
+                    return jsonify({"error": "cursor does not match the query parameters"}), 400
+                query = cursor_query
+                args = MultiDict(query)
+                fields = args['fields'].split(',') if args.get('fields') else None
             else:
-                return jsonify({"error": "Invalid file type"}), 404
+                offset, limit = self.parse_offset_limit(args)
+
+            filters, ranges = self.parse_filters(args, self.QUERY_PARAMETERS)
+            table_index = self.get_table_index(file_type, data, version)
+            total, records = table_index.query(filters, ranges, offset, limit, fields)
+        except KeyError as e:
+            return jsonify({"error": e.args[0]}), 400
+        except (ValueError, TypeError) as e:
+            return jsonify({"error": str(e)}), 400
+
+        payload = {f"{file_type}_data": records, "total": total, "offset": offset, "next_cursor": None}
+        if limit is not None and offset + len(records) < total:
+            payload["next_cursor"] = self.encode_cursor(version, offset + len(records), limit, query)
+        return jsonify(payload)
+
+    def stream_query_response(self, file_type, data, version):
+        """Stream a data type as newline-delimited JSON, one record per line.
+
+        offset, limit, fields and filters apply as in query_response; cursors do not, since the
+        stream already carries every matching record.
+        """
+        args = request.args
+        if not set(args) - set(self.FORMAT_PARAMETERS):
+            return self.stream_response(self.iter_records(file_type, data))
+        if file_type == 'pptx':
+            return jsonify({"error": "Query parameters are not supported for streamed pptx data"}), 400
+        if 'cursor' in args:
+            return jsonify({"error": "cursor cannot be combined with stream"}), 400
+
+        try:
+            offset, limit = self.parse_offset_limit(args)
+            fields = args['fields'].split(',') if args.get('fields') else None
+            filters, ranges = self.parse_filters(args, self.QUERY_PARAMETERS)
+            table_index = self.get_table_index(file_type, data, version)
+            _, page = table_index.select(filters, ranges, offset, limit, fields)
+        except KeyError as e:
+            return jsonify({"error": e.args[0]}), 400
+        except (ValueError, TypeError) as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Rows are converted to dicts a batch at a time instead of materializing the whole page
+        batches = (page.iloc[start:start + self.STREAM_BATCH_ROWS].to_dict(orient='records') for start in range(0, len(page), self.STREAM_BATCH_ROWS))
+        return self.stream_response(record for batch in batches for record in batch)
+
+    def stream_response(self, records):
+        """Serialize records lazily into an NDJSON response, gzip-compressed per chunk when accepted."""
+        use_gzip = request.accept_encodings['gzip'] > 0
+        dumps = self.app.json.dumps
+        buffer_size = self.STREAM_BUFFER_SIZE
+
+        def generate():
+            compressor = zlib.compressobj(self.GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if use_gzip else None
+            buffer = []
+            buffered = 0
+            for record in records:
+                line = (dumps(record) + "\n").encode('utf-8')
+                buffer.append(line)
+                buffered += len(line)
+                if buffered >= buffer_size:
+                    chunk = b"".join(buffer)
+                    buffer = []
+                    buffered = 0
+                    # A sync flush lets the client decompress everything sent so far
+                    yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH) if compressor else chunk
+            chunk = b"".join(buffer)
+            yield compressor.compress(chunk) + compressor.flush() if compressor else chunk
+
+        response = Response(generate(), mimetype=self.MIMETYPES['ndjson'])
+        if use_gzip:
+            response.headers['Content-Encoding'] = 'gzip'
+        return response
+
+    def columnar_response(self, table, data, version, output_format):
+        """Answer with the table as an Arrow IPC stream or a Parquet file.
+
+        offset, limit, fields and filters apply as in query_response. The whole table is encoded
+        once per data version, filtered results on every request.
+        """
+        args = request.args
+        if table == 'pptx':
+            return jsonify({"error": "pptx data is not tabular"}), 406
+        if 'cursor' in args:
+            return jsonify({"error": f"cursor cannot be combined with {output_format}"}), 400
+
+        try:
+            table_index = self.get_table_index(table, data, version)
+            if set(args) - set(self.FORMAT_PARAMETERS):
+                offset, limit = self.parse_offset_limit(args)
+                fields = args['fields'].split(',') if args.get('fields') else None
+                filters, ranges = self.parse_filters(args, self.QUERY_PARAMETERS)
+                _, page = table_index.select(filters, ranges, offset, limit, fields)
+                body = self.encode_columnar(page, output_format)
+            else:
+                body = self.get_columnar_body(table, table_index, version, output_format)
+        except KeyError as e:
+            return jsonify({"error": e.args[0]}), 400
+        except (ValueError, TypeError) as e:
+            return jsonify({"error": str(e)}), 400
+        except pa.ArrowException as e:
+            return jsonify({"error": f"{table} data cannot be encoded as {output_format}: {e}"}), 406
+
+        return Response(body, mimetype=self.MIMETYPES[output_format])
+
+    def get_columnar_body(self, table, table_index, version, output_format):
+        cached = self.columnar_cache.get((table, output_format))
+        if cached is None or cached[0] != version:
+            cached = (version, self.encode_columnar(table_index.frame, output_format))
+            self.columnar_cache[(table, output_format)] = cached
+        return cached[1]
+
+    def encode_columnar(self, frame, output_format):
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        if output_format == 'arrow':
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+        else:
+            pq.write_table(table, sink)
+        return sink.getvalue().to_pybytes()
+
+    def negotiate_format(self):
+        """Pick the output format from ?format=, ?stream=1 or the Accept header, defaulting to json.
+
+        Returns None for a format parameter naming an unknown format.
+        """
+        args = request.args
+        if 'format' in args:
+            return args['format'] if args['format'] in self.MIMETYPES else None
+        if args.get('stream') in ('1', 'true'):
+            return 'ndjson'
+        mimetype = request.accept_mimetypes.best_match(list(self.MIMETYPES.values()))
+        return next((name for name, value in self.MIMETYPES.items() if value == mimetype), 'json')
+
+    def iter_records(self, table, data):
+        if table == 'pptx':
+            # One line per top-level section of the extracted deck data
+            return ({key: value} for key, value in data.items())
+        return iter(self.get_table_records(table, data))
+
+    def aggregate_response(self, table, data, version):
+        """Answer group_by/metric/reducer (sum, mean, count, min, max, median or quantile with q) over a table.
+
+        The csv table can also be grouped by week, month or quarter with group_by=Date:month.
+        """
+        args = request.args
+        cache_key = (table, tuple(sorted(args.items(multi=True))))
+        cached = self.aggregate_cache.get(cache_key)
+        if cached is not None and cached[0] == version:
+            return jsonify(cached[1])
+
+        try:
+            group_by = args['group_by'].split(',') if args.get('group_by') else []
+            metric = args.get('metric')
+            reducer = args.get('reducer', 'sum')
+            quantiles = [float(quantile) for quantile in args['q'].split(',')] if args.get('q') else None
+            filters, ranges = self.parse_filters(args, self.AGGREGATE_PARAMETERS)
+
+            # Processed CSV data carries a pre-aggregated cube that answers most queries without a scan
+            cube = getattr(data, 'cube', None)
+            if cube is not None and cube.supports(group_by, metric, reducer, filters, ranges):
+                rows = cube.aggregate(group_by, metric, reducer, filters, ranges).to_dict(orient='records')
+            else:
+                table_index = self.get_table_index(table, data, version)
+                rows = table_index.aggregate(group_by, metric, reducer, quantiles, filters, ranges)
+        except KeyError as e:
+            return jsonify({"error": e.args[0]}), 400
+        except (ValueError, TypeError) as e:
+            return jsonify({"error": str(e)}), 400
+
+        payload = {"table": table, "group_by": group_by, "metric": metric, "reducer": reducer, "rows": rows}
+        if len(self.aggregate_cache) >= self.MAX_CACHED_AGGREGATES:
+            self.aggregate_cache.pop(next(iter(self.aggregate_cache)))
+        self.aggregate_cache[cache_key] = (version, payload)
+        return jsonify(payload)
+
+    def parse_offset_limit(self, args):
+        offset = int(args.get('offset', 0))
+        limit = int(args['limit']) if 'limit' in args else None
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("limit and offset must not be negative")
+        return offset, limit
+
+    def parse_filters(self, args, reserved):
+        filters = {}
+        ranges = []
+        for key in args:
+            if key in reserved:
+                continue
+            column, _, operator = key.rpartition('__')
+            if column and operator in TableIndex.RANGE_OPERATORS:
+                ranges.append((column, operator, args[key]))
+            else:
+                filters[key] = args.getlist(key)
+        return filters, ranges
+
+    def get_table_index(self, table, data, version):
+        cached = self.table_indexes.get(table)
+        if cached is None or cached[0] != version:
+            cached = (version, TableIndex(self.get_table_records(table, data)))
+            self.table_indexes[table] = cached
+        return cached[1]
+
+    def get_table_records(self, table, data):
+        if table == 'json':
+            return data['json_data']
+        if table in self.CHILD_TABLES and isinstance(data['json_data'], ProcessedDataset):
+            # The flattened tables are kept as the dataset's child tables, there is no nesting to undo
+            return ProcessedDataset(data['json_data'].child_frame(self.CHILD_TABLES[table]))
+        if table == 'employees':
+            return [{**employee, 'Company_Id': company['Company_Id']} for company in data['json_data'] for employee in company['Employees']]
+        if table == 'performance':
+            return [row for company in data['json_data'] for row in company['Performance']]
+        return data
+
+    def get_query_items(self, args):
+        """The filter and fields parameters of a query as sorted [key, value] pairs."""
+        return sorted([key, value] for key, value in args.items(multi=True) if key not in self.PAGINATION_PARAMETERS + self.FORMAT_PARAMETERS)
+
+    def encode_cursor(self, version, offset, limit, query):
+        cursor = json.dumps({"v": version, "o": offset, "l": limit, "q": query}).encode('utf-8')
+        return base64.urlsafe_b64encode(cursor).decode('ascii')
+
+    def decode_cursor(self, cursor):
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return cursor["v"], cursor["o"], cursor["l"], [[str(key), str(value)] for key, value in cursor["q"]]
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Invalid cursor")
+
+    def run(self, workers=None, host="127.0.0.1", port=5000, on_tick=None, use_reloader=True):
+        """Run the Flask app.
+
+        Without workers this is Flask's development server. With workers the already processed
+        data is shared by that many forked worker processes; on_tick is polled by the supervisor
+        and new workers are forked whenever it reports a data update. The caches derived from the
+        data are warmed in the supervisor before every fork, so the workers share them too, and
+        /metrics adds up the samples of all workers.
+
+        use_reloader=False keeps the development server from re-running the calling script in a
+        child process, e.g. when the caller already reloads changed data itself.
+        """
+        if workers:
+            def warm_on_tick():
+                changed = on_tick() if on_tick else False
+                if changed:
+                    self.warm_caches()
+                return changed
 
-    def run(self):
-        """Run the Flask app."""
-        self.app.run(debug=True)
\ No newline at end of file
+            self.warm_caches()
+            PreforkServer(self.app, host, port, workers, metrics=self.metrics).serve(warm_on_tick)
+        else:
+            self.app.run(host=host, port=port, debug=True, use_reloader=use_reloader)
\ No newline at end of file
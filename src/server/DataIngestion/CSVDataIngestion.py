@@ -1,10 +1,139 @@
 from .DataIngestion import DataIngestion
 from ..DataProcessor.CSVDataProcessor import CSVDataProcessor
+import hashlib
+import io
+import mmap
+import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+class CSVCheckpoint:
+    """Where an incremental load of an append-only CSV file stopped.
+
+    The header, the file's inode and a digest of the bytes just before offset tell an append
+    apart from a file that was truncated, rewritten or replaced since.
+    """
+    DIGEST_BYTES = 4096
+
+    def __init__(self, offset, header, inode, digest):
+        self.offset = offset
+        self.header = header
+        self.inode = inode
+        self.digest = digest
+
+    @classmethod
+    def create(cls, data, offset, header, inode):
+        return cls(offset, header, inode, cls.get_digest(data, offset, len(header)))
+
+    @classmethod
+    def get_digest(cls, data, offset, header_end):
+        return hashlib.sha1(data[max(header_end, offset - cls.DIGEST_BYTES):offset]).hexdigest()
+
+    def matches(self, data, inode):
+        if inode != self.inode or len(data) < self.offset or data[:len(self.header)] != self.header:
+            return False
+        return self.get_digest(data, self.offset, len(self.header)) == self.digest
 
 class CSVDataIngestion(DataIngestion):
+    processor_class = CSVDataProcessor
+
+    BACKENDS = ("pandas", "arrow")
+    # Arrow types for the Schema column dtypes; categories are dictionary encoded while parsing
+    ARROW_TYPES = {
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "datetime": pa.timestamp('us'),
+        "str": pa.string()
+    }
+
+    def __init__(self, chunksize=None, backend="pandas", block_size=None, incremental=False):
+        super().__init__()
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unsupported CSV backend: {backend}")
+        if chunksize and backend != "pandas":
+            raise ValueError("chunksize is only supported by the pandas backend")
+        if chunksize and incremental:
+            raise ValueError("chunksize cannot be combined with incremental")
+        # When set, the file is read lazily in chunks of this many rows
+        self.chunksize = chunksize
+        # "arrow" memory-maps the file and parses blocks of block_size bytes on all cores
+        self.backend = backend
+        self.block_size = block_size
+        # When set, only complete lines are loaded and the CSVCheckpoint after them is kept,
+        # so a later load_appended can parse just the rows appended since
+        self.incremental = incremental
+        self.checkpoint = None
+
     def load_data(self, file_path):
-        self.data = pd.read_csv(file_path)
+        if self.incremental:
+            self.load_appended(file_path)
+            return
+        if self.backend == "arrow":
+            self.data = self.read_arrow(file_path)
+            return
+
+        # Text and categorical columns are parsed straight into their final dtype
+        options = self.processor_class.SCHEMA.read_options()
+        if self.chunksize:
+            self.data = pd.read_csv(file_path, chunksize=self.chunksize, **options)
+        else:
+            self.data = pd.read_csv(file_path, **options)
+
+    def load_appended(self, file_path, checkpoint=None):
+        """Load the complete lines appended to file_path after checkpoint, or the whole file without one.
+
+        Returns False, loading nothing, when the file was truncated or rewritten since the
+        checkpoint was taken; it then has to be loaded again from the start.
+        """
+        with open(file_path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            inode = stat.st_ino
+            if stat.st_size == 0:
+                if checkpoint is not None:
+                    return False
+                raise pd.errors.EmptyDataError(f"No columns to parse from {file_path}")
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                if checkpoint is not None and not checkpoint.matches(data, inode):
+                    return False
+
+                header = checkpoint.header if checkpoint else data[:data.find(b'\n') + 1]
+                start = checkpoint.offset if checkpoint else len(header)
+                # A line still being written is left for the next load
+                end = max(data.rfind(b'\n') + 1, start)
+                self.data = self.read_bytes(header + data[start:end])
+                self.checkpoint = CSVCheckpoint.create(data, end, header, inode)
+        return True
+
+    def read_bytes(self, content):
+        if self.backend == "arrow":
+            return self.read_arrow(pa.BufferReader(content))
+        return pd.read_csv(io.BytesIO(content), **self.processor_class.SCHEMA.read_options())
+
+    def read_arrow(self, source):
+        """Parse a file path or Arrow input with Arrow's multi-threaded reader, which splits it into blocks at line boundaries.
+
+        Files are memory-mapped rather than read through Python buffers, and columns are converted
+        to the types of the processor schema while parsing.
+        """
+        columns = self.processor_class.SCHEMA.columns
+        read_options = pa_csv.ReadOptions(use_threads=True, **({"block_size": self.block_size} if self.block_size else {}))
+        convert_options = pa_csv.ConvertOptions(
+            column_types={name: self.ARROW_TYPES[column.dtype] for name, column in columns.items() if column.dtype},
+            timestamp_parsers=sorted({column.date_format for column in columns.values() if column.date_format}),
+            # Empty text fields are missing values, as pandas reads them
+            strings_can_be_null=True,
+            quoted_strings_can_be_null=True
+        )
+
+        if isinstance(source, str):
+            with pa.memory_map(source) as mapped:
+                table = pa_csv.read_csv(mapped, read_options=read_options, convert_options=convert_options)
+        else:
+            table = pa_csv.read_csv(source, read_options=read_options, convert_options=convert_options)
+        return table.to_pandas()
 
     def create_processor(self):
-        return CSVDataProcessor(self.data)
\ No newline at end of file
+        return self.processor_class(self.data, checkpoint=self.checkpoint)
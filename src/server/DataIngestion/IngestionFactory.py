@@ -12,8 +12,15 @@ class IngestionFactory:
     }
     
     @classmethod
-    def create_ingestion(cls, data_type):
+    def create_ingestion(cls, data_type, **options):
         if data_type not in cls._ingestion_classes:
             raise ValueError(f"Unsupported data type: {data_type}")
             
-        return cls._ingestion_classes[data_type]()
\ No newline at end of file
+        return cls._ingestion_classes[data_type](**options)
+
+    @classmethod
+    def get_processor_class(cls, data_type):
+        if data_type not in cls._ingestion_classes:
+            raise ValueError(f"Unsupported data type: {data_type}")
+
+        return cls._ingestion_classes[data_type].processor_class
\ No newline at end of file
@@ -3,9 +3,101 @@ from ..DataProcessor.JSONDataProcessor import JSONDataProcessor
 import json
 
 class JSONDataIngestion(DataIngestion):
+    processor_class = JSONDataProcessor
+
+    WHITESPACE = " \t\r\n"
+    SEPARATORS = WHITESPACE + ","
+    READ_SIZE = 64 * 1024
+
+    def __init__(self, stream=False):
+        super().__init__()
+        # When set, companies are decoded one at a time instead of loading the whole document
+        self.stream = stream
+
     def load_data(self, file_path):
+        if self.stream:
+            self.data = self.iter_companies(file_path)
+        else:
+            with open(file_path, 'r') as f:
+                self.data = json.load(f)
+
+    def iter_companies(self, file_path):
+        """Yield each entry of the top-level "companies" array without building the full parse tree.
+
+        The other top-level values are decoded and dropped on the way, so a "companies" key nested
+        in one of them is not mistaken for the array. A top-level array is read as the companies.
+        """
+        decoder = json.JSONDecoder()
+
         with open(file_path, 'r') as f:
-            self.data = json.load(f)
+            buffer = ''
+            position = 0
+
+            def peek(separators):
+                """Skip separators and return the next character, reading more input when needed; '' at the end."""
+                nonlocal buffer, position
+                while True:
+                    while position < len(buffer) and buffer[position] in separators:
+                        position += 1
+                    if position < len(buffer):
+                        return buffer[position]
+                    chunk = f.read(self.READ_SIZE)
+                    if not chunk:
+                        return ''
+                    buffer, position = buffer[position:] + chunk, 0
+
+            def decode():
+                nonlocal buffer, position
+                peek(self.WHITESPACE)
+                while True:
+                    try:
+                        value, end = decoder.raw_decode(buffer, position)
+                    except json.JSONDecodeError:
+                        # The value is split across reads
+                        chunk = f.read(self.READ_SIZE)
+                        if not chunk:
+                            raise
+                        buffer, position = buffer[position:] + chunk, 0
+                        continue
+                    # A number at the end of the buffer may go on in the next read
+                    if end == len(buffer):
+                        chunk = f.read(self.READ_SIZE)
+                        if chunk:
+                            buffer, position = buffer[position:] + chunk, 0
+                            continue
+                    position = end
+                    return value
+
+            start = peek(self.WHITESPACE)
+            if start == '{':
+                position += 1
+                while True:
+                    if peek(self.SEPARATORS) != '"':
+                        raise ValueError(f"No companies array found in {file_path}")
+                    key = decode()
+                    if peek(self.WHITESPACE) != ':':
+                        raise ValueError(f"Expected ':' after {key!r} in {file_path}")
+                    position += 1
+                    if key == 'companies':
+                        break
+                    decode()
+                start = peek(self.WHITESPACE)
+            if start != '[':
+                raise ValueError(f"No companies array found in {file_path}")
+            position += 1
+
+            while True:
+                # Skip whitespace and commas between companies
+                next_char = peek(self.SEPARATORS)
+                if not next_char:
+                    raise ValueError(f"Unterminated companies array in {file_path}")
+                if next_char == ']':
+                    return
+
+                yield decode()
+
+                if position > self.READ_SIZE:
+                    buffer, position = buffer[position:], 0
     
     def create_processor(self):
-        return JSONDataProcessor(self.data)
\ No newline at end of file
+        return self.processor_class(self.data)
\ No newline at end of file
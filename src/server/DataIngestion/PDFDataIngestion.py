@@ -1,11 +1,66 @@
 from .DataIngestion import DataIngestion
 from ..DataProcessor.PDFDataProcessor import PDFDataProcessor
+from concurrent.futures import ThreadPoolExecutor
+from pypdf import PdfReader
+from pypdf.errors import PdfReadError
 import tabula
+import threading
+
+# tabula-py starts its JVM on the first call without a lock, and concurrent first calls fail with
+# "JVM is already started". The first call of the process is made alone, later ones run concurrently.
+tabula_lock = threading.Lock()
+tabula_started = False
+
+def read_pdf(file_path, pages):
+    global tabula_started
+    if not tabula_started:
+        with tabula_lock:
+            if not tabula_started:
+                tables = tabula.read_pdf(file_path, pages=pages)
+                tabula_started = True
+                return tables
+    return tabula.read_pdf(file_path, pages=pages)
+
+class PDFTable:
+    def __init__(self, file_path, page, data):
+        self.file_path = file_path
+        # None when the page count could not be read and the file was extracted in one call
+        self.page = page
+        self.data = data
 
 class PDFDataIngestion(DataIngestion):
+    processor_class = PDFDataProcessor
+
+    def __init__(self, all_tables=False, max_workers=None):
+        super().__init__()
+        # When set, every table is kept with its page provenance instead of only the first one
+        self.all_tables = all_tables
+        self.max_workers = max_workers
+
     def load_data(self, file_path):
-        tables = tabula.read_pdf(file_path, pages='all')
-        self.data = tables[0]
+        if not self.all_tables:
+            tables = read_pdf(file_path, pages='all')
+            self.data = tables[0]
+            return
+
+        # tabula-py keeps its JVM alive in-process (via jpype) after the first call, so the
+        # pages below and every later file share one backend instead of paying JVM start-up;
+        # read_pdf makes the call that starts it before the others
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(lambda page: self.extract_tables(file_path, page), self.list_pages(file_path))
+            self.data = [table for tables in results for table in tables]
+
+    def extract_tables(self, file_path, page):
+        tables = read_pdf(file_path, pages=page or 'all')
+        return [PDFTable(file_path, page, table) for table in tables]
+
+    def list_pages(self, file_path):
+        """Page numbers from the document's page tree; a file pypdf cannot read is extracted whole."""
+        try:
+            page_count = len(PdfReader(file_path).pages)
+        except PdfReadError:
+            page_count = 0
+        return list(range(1, page_count + 1)) or [None]
 
     def create_processor(self):
-        return PDFDataProcessor(self.data)
\ No newline at end of file
+        return self.processor_class(self.data)
\ No newline at end of file
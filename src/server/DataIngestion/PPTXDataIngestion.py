@@ -1,10 +1,31 @@
 from .DataIngestion import DataIngestion
+from .PPTXXMLReader import PPTXXMLReader
 from ..DataProcessor.PPTXDataProcessor import PPTXDataProcessor
 from pptx import Presentation
 
 class PPTXDataIngestion(DataIngestion):
+    processor_class = PPTXDataProcessor
+
+    BACKENDS = ("python-pptx", "xml")
+
+    def __init__(self, backend="python-pptx"):
+        super().__init__()
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unsupported PPTX backend: {backend}")
+        # "xml" streams slide parts from the archive instead of building the python-pptx object model
+        self.backend = backend
+
     def load_data(self, file_path):
-        self.data = Presentation(file_path)
+        self.data = self.read(file_path)
+
+    def load_batch(self, file_paths):
+        # The processor handles a list of decks with a single process_data call
+        self.data = [self.read(file_path) for file_path in file_paths]
+
+    def read(self, file_path):
+        if self.backend == "xml":
+            return PPTXXMLReader().read(file_path)
+        return Presentation(file_path)
 
     def create_processor(self):
-        return PPTXDataProcessor(self.data)
\ No newline at end of file
+        return self.processor_class(self.data)
\ No newline at end of file
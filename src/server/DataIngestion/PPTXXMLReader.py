@@ -0,0 +1,105 @@
+from ..DataProcessor.PPTXDataProcessor import PPTXContent
+import posixpath
+import xml.etree.ElementTree as ET
+import zipfile
+
+NAMESPACES = {
+    "a": "http://schemas.openxmlformats.org/drawingml/2006/main",
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships"
+}
+
+def qualify(tag):
+    prefix, name = tag.split(":")
+    return f"{{{NAMESPACES[prefix]}}}{name}"
+
+class PPTXXMLReader:
+    # Reads shape text and "Quarter" tables straight from the slide XML parts of the archive,
+    # producing the same PPTXContent as PPTXDataProcessor.collect_content. Media is never opened.
+    SP_TREE = qualify("p:spTree")
+    SHAPE = qualify("p:sp")
+    GRAPHIC_FRAME = qualify("p:graphicFrame")
+    RUN = qualify("a:r")
+    FIELD = qualify("a:fld")
+    LINE_BREAK = qualify("a:br")
+
+    def read(self, file_path):
+        texts = []
+        tables = []
+        with zipfile.ZipFile(file_path) as archive:
+            for part_name in self.list_slide_parts(archive):
+                self.read_slide(archive, part_name, texts, tables)
+        return PPTXContent(texts, tables)
+
+    def list_slide_parts(self, archive):
+        """Resolve slide part names in presentation order."""
+        with archive.open("ppt/_rels/presentation.xml.rels") as f:
+            targets = {
+                relationship.get("Id"): relationship.get("Target")
+                for relationship in ET.parse(f).getroot().iter(qualify("rel:Relationship"))
+            }
+
+        with archive.open("ppt/presentation.xml") as f:
+            slide_ids = ET.parse(f).getroot().iter(qualify("p:sldId"))
+            relationship_ids = [slide_id.get(qualify("r:id")) for slide_id in slide_ids]
+
+        part_names = []
+        for relationship_id in relationship_ids:
+            target = targets[relationship_id]
+            if target.startswith("/"):
+                part_names.append(target.lstrip("/"))
+            else:
+                part_names.append(posixpath.normpath(posixpath.join("ppt", target)))
+        return part_names
+
+    def read_slide(self, archive, part_name, texts, tables):
+        depth = 0
+        tree_depth = None
+
+        with archive.open(part_name) as f:
+            for event, element in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if tree_depth is None and element.tag == self.SP_TREE:
+                        tree_depth = depth
+                    continue
+
+                # Only direct children of the shape tree are shapes, as with python-pptx's slide.shapes
+                if tree_depth is not None and depth == tree_depth + 1:
+                    self.read_shape(element, texts, tables)
+                    element.clear()
+                depth -= 1
+
+    def read_shape(self, element, texts, tables):
+        if element.tag == self.SHAPE:
+            text = self.text_body_text(element.find("p:txBody", NAMESPACES)).strip()
+            if text:
+                texts.append(text)
+
+        elif element.tag == self.GRAPHIC_FRAME:
+            table = element.find("a:graphic/a:graphicData/a:tbl", NAMESPACES)
+            if table is None:
+                return
+
+            rows = [
+                [self.text_body_text(cell.find("a:txBody", NAMESPACES)).strip() for cell in row.findall("a:tc", NAMESPACES)]
+                for row in table.findall("a:tr", NAMESPACES)
+            ]
+            if rows and rows[0] and rows[0][0] == "Quarter":
+                tables.append(rows)
+
+    def text_body_text(self, text_body):
+        if text_body is None:
+            return ""
+        return "\n".join(self.paragraph_text(paragraph) for paragraph in text_body.findall("a:p", NAMESPACES))
+
+    def paragraph_text(self, paragraph):
+        parts = []
+        for child in paragraph:
+            if child.tag in (self.RUN, self.FIELD):
+                text = child.find("a:t", NAMESPACES)
+                parts.append((text.text or "") if text is not None else "")
+            elif child.tag == self.LINE_BREAK:
+                parts.append("\v")
+        return "".join(parts)
@@ -5,53 +5,417 @@ root_dir = Path(__file__).resolve().parents[2]
 sys.path.append(str(root_dir))
 
 from src.server.DataSource import DataSource
+from src.server.DataSourceRegistry import DataSourceRegistry
 from src.server.DataIngestion.IngestionFactory import IngestionFactory
+from src.server.DataProcessor.ProcessedDataset import ProcessedDataset
 from src.server.APIHandler import APIHandler
+from src.server.Metrics import Metrics
+from src.server.ResultCache import ResultCache
+from src.server.Tracer import Tracer, span
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+import argparse
+import logging
 import os
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+@contextmanager
+def traced_memory(enabled):
+    """Run the block under tracemalloc when enabled, stopping it afterwards only if it was started here."""
+    started = enabled and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if started:
+            tracemalloc.stop()
+
+class SourceStats:
+    """Stage durations, cache outcome, peak traced memory and trace spans of one source's trip through the pipeline."""
+    def __init__(self, trace_memory=False, trace=False):
+        self.durations = {}
+        self.cache_hit = False
+        self.trace_memory = trace_memory
+        self.peak_memory = None
+        # Chrome trace events, only collected when tracing
+        self.trace = trace
+        self.spans = []
+
+    @contextmanager
+    def stage(self, name):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.durations[name] = end - start
+            if self.trace:
+                self.spans.append(Tracer.make_event(name, start, end))
+            if self.trace_memory:
+                self.peak_memory = max(self.peak_memory or 0, tracemalloc.get_traced_memory()[1])
+
+    @contextmanager
+    def span(self, name):
+        """A trace span grouping stages, which is not timed when tracing is off."""
+        if not self.trace:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append(Tracer.make_event(name, start, time.perf_counter()))
 
 class DataProcessing:
-    def __init__(self):
+    EXECUTORS = {
+        "thread": ThreadPoolExecutor,
+        "process": ProcessPoolExecutor
+    }
+
+    def __init__(self, parallel=False, executor="thread", max_workers=None, cache=None, watch_interval=None, registry=None, workers=None, metrics=None, trace_memory=False, tracer=None):
+        if executor not in self.EXECUTORS:
+            raise ValueError(f"Unsupported executor: {executor}")
+
         datasets_dir = os.path.join(os.path.dirname(__file__), '../..', 'datasets')
         
-        self.data_sources = [
-            DataSource("json", os.path.join(datasets_dir, 'dataset1.json')),
-            DataSource("csv", os.path.join(datasets_dir, 'dataset2.csv')),
-            DataSource("pdf", os.path.join(datasets_dir, 'dataset3.pdf')),
-            DataSource("pptx", os.path.join(datasets_dir, 'dataset4.pptx'))
-        ]
+        if registry:
+            self.data_sources = registry.discover()
+        else:
+            self.data_sources = [
+                DataSource("json", os.path.join(datasets_dir, 'dataset1.json')),
+                DataSource("csv", os.path.join(datasets_dir, 'dataset2.csv')),
+                DataSource("pdf", os.path.join(datasets_dir, 'dataset3.pdf')),
+                DataSource("pptx", os.path.join(datasets_dir, 'dataset4.pptx'))
+            ]
         
         self.ingestors = []
+        self.ingestor_sources = {}
         
         self.processed_data = {}
+
+        # Results of every source, keyed by type and then file path; processed_data holds their per-type merge
+        self.source_results = {}
+
+        # Optional ResultCache; cache_keys maps each ingestor to the key its result is stored under
+        self.cache = cache
+        self.cache_keys = {}
+
+        self.parallel = parallel
+        self.executor = executor
+        self.max_workers = max_workers
+
+        # When set, source files are polled every watch_interval seconds once the API is up
+        self.watch_interval = watch_interval
+        self.api_handler = None
+        self.stop_event = threading.Event()
+
+        # When set, the API is served by this many forked worker processes sharing processed_data
+        self.workers = workers
+
+        # Stage timings per source end up here and are served by the API's /metrics. trace_memory
+        # adds tracemalloc peaks per source, which slows allocation-heavy parsing down noticeably;
+        # with the thread executor the peaks include whatever other sources were processing meanwhile.
+        self.metrics = metrics or Metrics()
+        self.trace_memory = trace_memory
+        self.started_tracing = False
+        self.ingestor_stats = {}
+
+        # Optional Tracer recording nested spans of each run; it is saved once processing is done
+        self.tracer = tracer
         
     def ingest_data(self):
+        if self.parallel:
+            self.ingest_data_parallel()
+            return
+
+        # Tracing runs on until process_data, which stops it only if it was started here
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.started_tracing = True
+
         for source in self.data_sources:
-            ingestor = IngestionFactory.create_ingestion(source.type)
-            ingestor.load_data(source.file_path)
+            stats = SourceStats(self.trace_memory, self.tracer is not None)
+            result = None
+            with stats.span(os.path.basename(source.file_path)):
+                if self.cache:
+                    with stats.stage("cache_get"):
+                        key = self.cache.get_key(source)
+                        result = self.cache.get(key)
+
+                if result is None:
+                    with stats.stage("load_data"):
+                        ingestor = IngestionFactory.create_ingestion(source.type, **source.options)
+                        ingestor.load_data(source.file_path)
+
+            # Recorded once the span has closed, so a cache hit keeps its span like a load does
+            if result is not None:
+                stats.cache_hit = True
+                self.record_source_stats(source.type, source.file_path, stats)
+                self.store_result(source.type, source.file_path, result)
+                continue
+
             self.ingestors.append(ingestor)
-            
+            self.ingestor_sources[ingestor] = source
+            self.ingestor_stats[ingestor] = stats
+
+            if self.cache:
+                self.cache_keys[ingestor] = key
+
+        self.merge_results()
+
+    def ingest_data_parallel(self):
+        # Each source is loaded and processed in its own worker, so the slowest
+        # source bounds start-up instead of the sum of all of them. Results are
+        # collected as they complete and nothing is left for process_data.
+        executor_class = self.EXECUTORS[self.executor]
+        # Threads share this process's tracemalloc, so it is switched on once around the whole pool
+        with traced_memory(self.trace_memory and self.executor == "thread"):
+            with executor_class(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self.load_and_process, source, self.cache, self.trace_memory, self.tracer is not None): source for source in self.data_sources}
+                for future in as_completed(futures):
+                    data_type, result, stats = future.result()
+                    self.record_source_stats(data_type, futures[future].file_path, stats)
+                    self.store_result(data_type, futures[future].file_path, result)
+
+        self.merge_results()
+
+    @staticmethod
+    def load_and_process(source, cache=None, trace_memory=False, trace=False):
+        """Load and process one source, returning (data type, result, SourceStats)."""
+        stats = SourceStats(trace_memory, trace)
+        with traced_memory(trace_memory):
+            with stats.span(os.path.basename(source.file_path)):
+                if cache:
+                    with stats.stage("cache_get"):
+                        key = cache.get_key(source)
+                        result = cache.get(key)
+                    if result is not None:
+                        stats.cache_hit = True
+                        return source.type, result, stats
+
+                with stats.stage("load_data"):
+                    ingestor = IngestionFactory.create_ingestion(source.type, **source.options)
+                    ingestor.load_data(source.file_path)
+                with stats.stage("create_processor"):
+                    processor = ingestor.create_processor()
+                with stats.stage("process_data"):
+                    result = processor.process_data()
+
+                if cache:
+                    with stats.stage("cache_put"):
+                        cache.put(key, result)
+                return processor.get_data_type(), result, stats
+
+    @staticmethod
+    def load_appended(source, previous, trace_memory=False):
+        """Process the rows appended to a source since previous was loaded and add them to it.
+
+        Returns (data type, result, SourceStats) like load_and_process, or None when the file
+        was truncated or rewritten and has to be loaded whole. The result is not cached, caching
+        it would mean hashing and writing the whole file again on every append.
+        """
+        stats = SourceStats(trace_memory)
+        with traced_memory(trace_memory):
+            with stats.span(os.path.basename(source.file_path)):
+                with stats.stage("load_data"):
+                    ingestor = IngestionFactory.create_ingestion(source.type, **source.options)
+                    if not ingestor.load_appended(source.file_path, previous.checkpoint):
+                        return None
+                with stats.stage("create_processor"):
+                    processor = ingestor.create_processor()
+                with stats.stage("process_data"):
+                    result = processor.append_results(previous, processor.process_data())
+                return processor.get_data_type(), result, stats
+
     def process_data(self):
         for ingestor in self.ingestors:
-            processor = ingestor.create_processor()
-            
-            result = processor.process_data()
-            
-            data_type = processor.get_data_type()
-            self.processed_data[data_type] = result
+            stats = self.ingestor_stats.get(ingestor) or SourceStats(self.trace_memory and tracemalloc.is_tracing(), self.tracer is not None)
+            source = self.ingestor_sources.get(ingestor)
+            file_path = source.file_path if source else None
+
+            with stats.span(os.path.basename(file_path or "source")):
+                with stats.stage("create_processor"):
+                    processor = ingestor.create_processor()
+                
+                with stats.stage("process_data"):
+                    result = processor.process_data()
+                
+                data_type = processor.get_data_type()
+                self.store_result(data_type, file_path, result)
+
+                if ingestor in self.cache_keys:
+                    with stats.stage("cache_put"):
+                        self.cache.put(self.cache_keys[ingestor], result)
+            self.record_source_stats(data_type, file_path, stats)
+
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+        self.merge_results()
+
+    def record_source_stats(self, data_type, file_path, stats):
+        labels = {"type": data_type, "source": file_path or ""}
+        for stage, seconds in stats.durations.items():
+            self.metrics.observe("pipeline_stage_duration_seconds", seconds, {"stage": stage, **labels})
+        self.metrics.inc("pipeline_sources_total", {"type": data_type, "cache": "hit" if stats.cache_hit else "miss"})
+        if stats.peak_memory is not None:
+            self.metrics.set("pipeline_source_peak_memory_bytes", stats.peak_memory, labels)
+        if self.tracer and stats.spans:
+            for event in stats.spans:
+                event["args"].update(labels)
+            self.tracer.add_events(stats.spans)
+            stats.spans = []
+
+    def store_result(self, data_type, file_path, result):
+        self.source_results.setdefault(data_type, {})[file_path] = result
+
+    def get_source_result(self, file_path):
+        for results in self.source_results.values():
+            if file_path in results:
+                return results[file_path]
+        return None
+
+    def merge_results(self, data_types=None):
+        """Combine the per-source results of each data type into processed_data, in data_sources order."""
+        positions = {source.file_path: index for index, source in enumerate(self.data_sources)}
+
+        for data_type in data_types or list(self.source_results):
+            results = sorted(self.source_results[data_type].items(), key=lambda item: positions.get(item[0], len(positions)))
+            results = [result for _, result in results]
+
+            if len(results) == 1:
+                self.processed_data[data_type] = results[0]
+            else:
+                with span(self.tracer, "merge_results", type=data_type, sources=len(results)):
+                    processor_class = IngestionFactory.get_processor_class(data_type)
+                    self.processed_data[data_type] = processor_class.merge_results(results)
+
+        for table, columns in self.memory_report(data_types).items():
+            self.metrics.set("processed_table_memory_bytes", sum(columns.values()), {"table": table})
+
+    def memory_report(self, data_types=None):
+        """Bytes held by each column of the processed tables, keyed by table name, e.g. "json.employees"."""
+        report = {}
+        for data_type in data_types or list(self.processed_data):
+            data = self.processed_data.get(data_type)
+            dataset = data.get('json_data') if isinstance(data, dict) else data
+            if isinstance(dataset, ProcessedDataset):
+                report.update(dataset.memory_report(data_type))
+        return report
+
+    def print_memory_report(self):
+        for table, columns in self.memory_report().items():
+            print(f"{table}: {sum(columns.values()) / 1024 ** 2:.2f} MiB")
+            for column, size in columns.items():
+                print(f"  {column:<32} {size:>14,} B")
 
     def handle_api(self):
         json_data = self.processed_data.get('json')
         csv_data = self.processed_data.get('csv')
         pdf_data = self.processed_data.get('pdf')
         pptx_data = self.processed_data.get('pptx')
-        api_handler = APIHandler(json_data, csv_data, pdf_data, pptx_data)
-        api_handler.run()
+        self.api_handler = APIHandler(json_data, csv_data, pdf_data, pptx_data, metrics=self.metrics)
+
+        if self.workers:
+            # Forked workers do not see updates made in this process, so the supervisor polls
+            # the sources instead of a watcher thread and re-forks the workers on a change
+            on_tick = None
+            if self.watch_interval:
+                file_states = {source.file_path: self.get_file_state(source.file_path) for source in self.data_sources}
+                on_tick = lambda: self.refresh_changed_sources(file_states)
+            self.api_handler.run(workers=self.workers, on_tick=on_tick)
+            return
+
+        if self.watch_interval:
+            # The debug reloader would run the pipeline and a second watcher in its parent process,
+            # ingesting every change twice
+            self.start_watching()
+            self.api_handler.run(use_reloader=False)
+            return
+        self.api_handler.run()
 
-    def run_pipeline(self):
-        self.ingest_data()
-        self.process_data()
+    def start_watching(self):
+        file_states = {source.file_path: self.get_file_state(source.file_path) for source in self.data_sources}
+        watcher = threading.Thread(target=self.watch, args=(file_states,), daemon=True)
+        watcher.start()
+        return watcher
+
+    def watch(self, file_states):
+        while not self.stop_event.wait(self.watch_interval):
+            self.refresh_changed_sources(file_states)
+
+    def refresh_changed_sources(self, file_states):
+        """Re-ingest only the sources whose files changed since the last check and swap the results into the API."""
+        changed = False
+        for source in self.data_sources:
+            file_state = self.get_file_state(source.file_path)
+            if file_state is None or file_state == file_states.get(source.file_path):
+                continue
+            file_states[source.file_path] = file_state
+
+            try:
+                # An incrementally loaded CSV only parses its appended tail, unless it was rewritten
+                previous = self.get_source_result(source.file_path)
+                appended = self.load_appended(source, previous, self.trace_memory) if getattr(previous, 'checkpoint', None) else None
+                data_type, result, stats = appended or self.load_and_process(source, self.cache, self.trace_memory)
+            except Exception:
+                # Usually a file caught mid-write; the finished write changes its state again
+                logger.exception("Failed to reload %s, keeping the previous result", source.file_path)
+                continue
+
+            self.record_source_stats(data_type, source.file_path, stats)
+            self.store_result(data_type, source.file_path, result)
+            self.merge_results([data_type])
+            if self.api_handler:
+                self.api_handler.update_data(data_type, self.processed_data[data_type])
+            changed = True
+
+        if changed and self.tracer:
+            self.tracer.save()
+        return changed
+
+    @staticmethod
+    def get_file_state(file_path):
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def run_pipeline(self, print_memory_report=False):
+        if self.tracer:
+            self.tracer.start_sampling()
+        try:
+            with span(self.tracer, "ingest_data"):
+                self.ingest_data()
+            with span(self.tracer, "process_data"):
+                self.process_data()
+        finally:
+            if self.tracer:
+                self.tracer.stop_sampling()
+                self.tracer.save()
+        if print_memory_report:
+            self.print_memory_report()
         self.handle_api()
 
 if __name__ == '__main__':
-    pipeline = DataProcessing()
-    pipeline.run_pipeline()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run the data pipeline and serve the API.")
+    parser.add_argument("config", nargs="?", help="JSON source config, see DataSourceRegistry.from_config")
+    parser.add_argument("--workers", type=int, help="serve with this many forked worker processes instead of the development server")
+    parser.add_argument("--trace-memory", action="store_true", help="report the peak traced memory of each source on /metrics (slows ingestion)")
+    parser.add_argument("--trace", metavar="PATH", help="write a Chrome trace (.json) or collapsed stacks (.folded) of the run to PATH")
+    parser.add_argument("--trace-sample-interval", type=float, metavar="SECONDS", help="also sample call stacks at this interval while ingesting")
+    parser.add_argument("--memory-report", action="store_true", help="print the memory held by each column of the processed tables before serving")
+    args = parser.parse_args()
+
+    registry = DataSourceRegistry.from_config(args.config) if args.config else None
+    tracer = Tracer(args.trace, args.trace_sample_interval) if args.trace else None
+    pipeline = DataProcessing(parallel=True, cache=ResultCache(), watch_interval=1.0, registry=registry, workers=args.workers, trace_memory=args.trace_memory, tracer=tracer)
+    pipeline.run_pipeline(print_memory_report=args.memory_report)
\ No newline at end of file
@@ -0,0 +1,102 @@
+from .ProcessedDataset import ProcessedDataset
+import pandas as pd
+
+class AggregateCube:
+    """Sums and counts of measures materialized per day and combination of dimensions.
+
+    The base cuboid holds one row per (day, dimensions...) combination that occurs, so its size
+    depends on the cardinality of the dimensions rather than on the number of rows. Groupings by
+    fewer dimensions or by week, month or quarter ("Date:month") are rolled up from it.
+    """
+    DATE_LEVELS = {"day": "D", "week": "W", "month": "M", "quarter": "Q"}
+    REDUCERS = ("sum", "count", "mean")
+
+    def __init__(self, base, date_column, dimensions, measures, whole_days=True):
+        self.base = base
+        self.date_column = date_column
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        # Date ranges can only be answered from daily buckets when no row has a time of day
+        self.whole_days = whole_days
+
+    @classmethod
+    def build(cls, frame, date_column, dimensions, measures):
+        days = frame[date_column].dt.floor('D')
+        # Rows without a date fall in no range and do not count against whole days
+        dates = frame[date_column]
+        whole_days = bool((dates == days)[dates.notna()].all())
+        frame = frame.assign(**{date_column: days})
+        grouped = frame.groupby([date_column] + list(dimensions), observed=True, sort=False, dropna=False)
+
+        base = grouped[list(measures)].agg(['sum', 'count'])
+        base.columns = [f"{measure} {reducer}" for measure, reducer in base.columns]
+        base['rows'] = grouped.size()
+        return cls(base.reset_index(), date_column, dimensions, measures, whole_days)
+
+    @classmethod
+    def merge(cls, cubes):
+        """One cube over the rows of every cube, e.g. of several CSV sources."""
+        first = cubes[0]
+        base = ProcessedDataset.concat_frames([cube.base for cube in cubes])
+        base = base.groupby([first.date_column] + first.dimensions, observed=True, sort=False, dropna=False).sum().reset_index()
+        return cls(base, first.date_column, first.dimensions, first.measures, all(cube.whole_days for cube in cubes))
+
+    def parse_group(self, group):
+        column, _, level = group.partition(':')
+        return column, level or "day"
+
+    def supports(self, group_by, metric, reducer, filters=None, ranges=None):
+        """Whether aggregate can answer the query; TableIndex.aggregate answers the rest from the rows."""
+        for group in group_by:
+            column, level = self.parse_group(group)
+            if column == self.date_column:
+                if level not in self.DATE_LEVELS:
+                    return False
+            elif column not in self.dimensions or level != "day":
+                return False
+        if reducer not in self.REDUCERS or (reducer != "count" and metric not in self.measures):
+            return False
+        if any(column not in self.dimensions for column in filters or {}):
+            return False
+        return all(column == self.date_column and self.whole_days for column, _, _ in ranges or [])
+
+    def aggregate(self, group_by, metric=None, reducer="sum", filters=None, ranges=None):
+        """Reduce metric per group_by combination like TableIndex.aggregate, returning a DataFrame.
+
+        filters maps a dimension to its accepted values and ranges is a list of
+        (date column, operator, value) with operator one of TableIndex.RANGE_OPERATORS.
+        """
+        if not self.supports(group_by, metric, reducer, filters, ranges):
+            raise ValueError("The aggregate cube cannot answer this query")
+
+        frame = self.base
+        for column, values in (filters or {}).items():
+            frame = frame[frame[column].isin(values)]
+        for column, operator, value in ranges or []:
+            day = frame[column]
+            value = pd.Timestamp(value)
+            frame = frame[{"gte": day >= value, "gt": day > value, "lte": day <= value, "lt": day < value}[operator]]
+
+        levels = {}
+        for group in group_by:
+            column, level = self.parse_group(group)
+            if column == self.date_column and group != column:
+                levels[group] = frame[column].dt.to_period(self.DATE_LEVELS[level]).dt.start_time
+        frame = frame.assign(**levels) if levels else frame
+
+        if not group_by:
+            grouped = frame.assign(_all=0).groupby("_all")
+        else:
+            grouped = frame.groupby(group_by, sort=True, observed=True)
+
+        if reducer == "count":
+            result = grouped["rows"].sum().rename("count")
+        else:
+            sums = grouped[[f"{metric} sum", f"{metric} count"]].sum()
+            result = sums[f"{metric} sum"] if reducer == "sum" else sums[f"{metric} sum"] / sums[f"{metric} count"]
+            result = result.rename(metric)
+
+        result = result.reset_index()
+        if not group_by:
+            result = result.drop(columns="_all")
+        return result
@@ -1,17 +1,106 @@
+from .AggregateCube import AggregateCube
 from .DataProcessor import DataProcessor
+from .ProcessedDataset import ProcessedDataset
+from .Schema import Column, Schema
 import pandas as pd
 
 class CSVDataProcessor(DataProcessor):
-    def __init__(self, csv_data):
+    # Version 2 parses with SCHEMA: categorical text columns and downcast integers
+    VERSION = 2
+    SCHEMA = Schema({
+        'Date': Column('datetime', date_format='%Y-%m-%d'),
+        'Membership_ID': Column('str'),
+        'Membership_Type': Column('category'),
+        'Activity': Column('category'),
+        'Revenue': Column('float', rename='Revenue (in $)'),
+        'Duration (Minutes)': Column('int'),
+        'Location': Column('category')
+    })
+    # The aggregate cube materialized over every processed CSV (see AggregateCube)
+    CUBE_DATE = 'Date'
+    CUBE_DIMENSIONS = ('Membership_Type', 'Activity', 'Location')
+    CUBE_MEASURES = ('Revenue (in $)', 'Duration (Minutes)')
+
+    def __init__(self, csv_data, checkpoint=None):
         super().__init__(csv_data)
         self.csv_data = csv_data
+        # Where an incremental CSVDataIngestion stopped reading, kept on the processed dataset
+        self.checkpoint = checkpoint
 
     def process_data(self):
-        self.csv_data['Date'] = pd.to_datetime(self.csv_data['Date'])
-        self.csv_data = self.csv_data.rename(columns={
-            'Revenue': 'Revenue (in $)'
-        })
-        return self.csv_data.to_dict(orient='records')
+        if isinstance(self.csv_data, pd.DataFrame):
+            self.csv_data = self.transform(self.csv_data)
+            return self.add_cube(ProcessedDataset(self.csv_data, checkpoint=self.checkpoint))
+
+        # Chunks are consumed as they are read: their cubes are merged right away and only
+        # the processed columns are kept, so no raw chunk outlives its iteration
+        frames = []
+        cube = None
+        for chunk in self.iter_chunks():
+            if not frames:
+                cube = chunk.cube
+            elif cube is not None and chunk.cube is not None:
+                cube = AggregateCube.merge([cube, chunk.cube])
+            else:
+                cube = None
+            frames.append(chunk.frame)
+        if not frames:
+            return ProcessedDataset()
+        return ProcessedDataset(self.concat_chunks(frames), cube=cube)
+
+    def iter_chunks(self):
+        """Yield each processed chunk as a ProcessedDataset, with its cube, so only a single raw chunk is held in memory."""
+        if isinstance(self.csv_data, pd.DataFrame):
+            yield self.add_cube(ProcessedDataset(self.transform(self.csv_data)))
+            return
+
+        with self.csv_data as reader:
+            for chunk in reader:
+                yield self.add_cube(ProcessedDataset(self.transform(chunk)))
+
+    @staticmethod
+    def concat_chunks(frames):
+        """Concatenate processed chunks a column at a time, releasing each chunk's column once it is copied.
+
+        Peak memory stays near the size of the result instead of twice it. The frames are emptied.
+        """
+        columns = {}
+        for name in list(frames[0].columns):
+            columns[name] = ProcessedDataset.concat_frames([frame[[name]] for frame in frames])[name]
+            for frame in frames:
+                del frame[name]
+        return pd.DataFrame(columns, copy=False)
+
+    @classmethod
+    def add_cube(cls, dataset):
+        """Attach the aggregate cube, unless the file lacks one of the cube's columns."""
+        columns = (cls.CUBE_DATE,) + cls.CUBE_DIMENSIONS + cls.CUBE_MEASURES
+        if all(column in dataset.frame.columns for column in columns):
+            dataset.cube = AggregateCube.build(dataset.frame, cls.CUBE_DATE, cls.CUBE_DIMENSIONS, cls.CUBE_MEASURES)
+        return dataset
+
+    @classmethod
+    def from_cache(cls, result):
+        return cls.add_cube(result)
+
+    def transform(self, csv_data):
+        return self.SCHEMA.apply(csv_data)
     
+    @classmethod
+    def merge_results(cls, results):
+        return ProcessedDataset.concat(results)
+
+    @classmethod
+    def append_results(cls, dataset, appended):
+        """dataset followed by the rows processed from the tail appended to its file.
+
+        The cube is merged from both cubes' pre-aggregated rows, so it is not rebuilt from every row.
+        The columns are still copied into a new frame, so an append costs a copy of the table,
+        though no parsing or conversion of the rows already loaded.
+        """
+        merged = cls.merge_results([dataset, appended])
+        merged.checkpoint = appended.checkpoint
+        return merged
+
     def get_data_type(self):
         return 'csv'
\ No newline at end of file
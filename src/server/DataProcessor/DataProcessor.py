@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
 
 class DataProcessor(ABC):
+    # Bump when the processed output changes so cached results are not reused
+    VERSION = 1
+
     def __init__(self, data):
         self.data = data
 
@@ -10,4 +13,19 @@ class DataProcessor(ABC):
 
     @abstractmethod
     def get_data_type(self):
-        pass
\ No newline at end of file
+        pass
+
+    @classmethod
+    def to_cache(cls, result):
+        """The part of a result ResultCache stores, restored by from_cache."""
+        return result
+
+    @classmethod
+    def from_cache(cls, result):
+        """Restore what ResultCache does not store (e.g. the CSV aggregate cube) on a cached result."""
+        return result
+
+    @classmethod
+    def merge_results(cls, results):
+        """Combine the results of several sources of this type; types without a natural merge keep the first."""
+        return results[0]
\ No newline at end of file
@@ -1,42 +1,45 @@
 from .DataProcessor import DataProcessor
+from .ProcessedDataset import ProcessedDataset
+from .Schema import Column, Schema
 import pandas as pd
 
 class JSONDataProcessor(DataProcessor):
+    # Version 2 returns a ProcessedDataset instead of nested record lists, version 3 parses with the schemas below,
+    # version 4 links child rows to the position of their company, version 5 is cached as Parquet
+    VERSION = 5
+    COMPANIES_SCHEMA = Schema({
+        'id': Column('int', rename='Company_Id'),
+        'name': Column('str', rename='Company_Name'),
+        'industry': Column('category', rename='Industry'),
+        'revenue': Column('float', rename='Revenue', fill='median'),
+        'location': Column('category', rename='Location')
+    })
+    EMPLOYEES_SCHEMA = Schema({
+        'id': Column('str', rename='Employee_Id'),
+        'name': Column('str', rename='Employee_Name'),
+        'role': Column('category', rename='Role'),
+        'cashmoneh': Column('int', rename='Cash_Money'),
+        'hired_date': Column('datetime', rename='Hired_Date', date_format='%Y-%m-%d', fill='median'),
+        'company_id': Column('int', rename='Company_Id'),
+        'company_name': Column('str', rename='Company_Name')
+    })
+    # Only the declared columns are kept, the raw revenue is replaced by its filled copy
+    PERFORMANCE_SCHEMA = Schema({
+        'quarter': Column('str', rename='Quarter'),
+        'revenue': Column('float', rename='Revenue (in $)', fill='median'),
+        'profit_margin': Column('float', rename='Profit_Margin'),
+        'company_id': Column('int', rename='Company_Id')
+    }, select=True)
+
     def __init__(self, json_data):
         super().__init__(json_data)
         self.json_data = json_data
 
     def process_data(self):
-        companies_df = pd.json_normalize(
-            self.json_data['companies'],
-            meta=[
-                'id', 'name', 'industry', 'revenue', 'location'
-            ],
-            errors='ignore'
-        )
-
-        employees_df = pd.json_normalize(
-            self.json_data['companies'],
-            record_path='employees',
-            meta=[
-            ['id'],
-            ['name']
-            ],
-            meta_prefix='company_',
-            errors='ignore'
-        )
+        # Accept either the loaded document or a stream of companies from JSONDataIngestion
+        companies = self.json_data['companies'] if isinstance(self.json_data, dict) else self.json_data
 
-        performance_data = []
-        for company in self.json_data['companies']:
-            company_id = company['id']
-            for quarter, data in company['performance'].items():
-                performance_data.append({
-                'company_id': company_id,
-                'quarter': quarter,
-                'revenue': data['revenue'],
-                'profit_margin': data['profit_margin']
-        })
-        performance_df = pd.DataFrame(performance_data)
+        companies_df, employees_df, performance_df = self.build_tables(companies)
 
         companies_df = self.clean_companies_df(companies_df)
         employees_df = self.clean_employees_df(employees_df)
@@ -44,73 +47,63 @@ class JSONDataProcessor(DataProcessor):
 
         return self.jsonify(companies_df, employees_df, performance_df)
 
-    def clean_companies_df(self, companies_df):
-        companies_df.drop(columns=['employees', 'performance.2023_Q1.revenue', 'performance.2023_Q1.profit_margin', 'performance.2023_Q2.revenue', 'performance.2023_Q2.profit_margin'], axis='columns', inplace=True)
-
-        companies_df['revenue'] = companies_df['revenue'].fillna(companies_df['revenue'].median())
+    def build_tables(self, companies):
+        """Build the companies, employees and performance tables in a single pass over the companies."""
+        companies_data = []
+        employees_data = []
+        performance_data = []
 
-        companies_df = companies_df.rename(columns={
-            'id': 'Company_Id',
-            'name': 'Company_Name',
-            'industry': 'Industry',
-            'revenue': 'Revenue',
-            'location': 'Location'
-        })
+        for company in companies:
+            companies_data.append({
+                key: value for key, value in company.items() if key not in ('employees', 'performance')
+            })
 
-        return companies_df
+            for employee in company.get('employees', []):
+                employees_data.append({
+                    **employee,
+                    'company_id': company['id'],
+                    'company_name': company['name']
+                })
 
-    def clean_employees_df(self, employees_df):
-        employees_df['hired_date'] = pd.to_datetime(employees_df['hired_date'])
-        median_date = employees_df['hired_date'].median()
-        employees_df['hired_date'] = employees_df['hired_date'].fillna(median_date)
-
-        employees_df = employees_df.rename(columns={
-            'id': 'Employee_Id',
-            'name': 'Employee_Name',
-            'role': 'Role',
-            'cashmoneh': 'Cash_Money',
-            'hired_date': 'Hired_Date',
-            'company_id': 'Company_Id',
-            'company_name': 'Company_Name'
-        })
-
-        return employees_df
+            for quarter, data in company.get('performance', {}).items():
+                performance_data.append({
+                    'company_id': company['id'],
+                    'quarter': quarter,
+                    'revenue': data['revenue'],
+                    'profit_margin': data['profit_margin']
+                })
 
-    def clean_performance_df(self, performance_df):
-        performance_df['revenue (in $)'] = performance_df['revenue'].fillna(performance_df['revenue'].median())
+        return pd.DataFrame(companies_data), pd.DataFrame(employees_data), pd.DataFrame(performance_data)
 
-        performance_df = performance_df[['quarter', 'revenue (in $)', 'profit_margin', 'company_id']]
+    def clean_companies_df(self, companies_df):
+        return self.COMPANIES_SCHEMA.apply(companies_df)
 
-        performance_df = performance_df.rename(columns={
-            'quarter': 'Quarter',
-            'revenue (in $)': 'Revenue (in $)',
-            'profit_margin': 'Profit_Margin',
-            'company_id': 'Company_Id'
-        })
+    def clean_employees_df(self, employees_df):
+        return self.EMPLOYEES_SCHEMA.apply(employees_df)
 
-        return performance_df
+    def clean_performance_df(self, performance_df):
+        return self.PERFORMANCE_SCHEMA.apply(performance_df)
 
     def jsonify(self, companies_df, employees_df, performance_df):
-        companies_data = []
-
-        for index, company_row in companies_df.iterrows():
-            company_dict = company_row.to_dict()
+        """Nest employees and performance under their company; the records are only built when read."""
+        companies = ProcessedDataset(companies_df, {
+            'Employees': (employees_df.drop(columns='Company_Id'), employees_df['Company_Id']),
+            'Performance': (performance_df, performance_df['Company_Id'])
+        }, key='Company_Id')
 
-            employees_data = employees_df[employees_df['Company_Id'] == company_dict['Company_Id']].to_dict('records')
-                
-            for employee in employees_data:
-                del employee['Company_Id'] 
-                
-            company_dict['Employees'] = employees_data
+        return {'json_data': companies}
 
-            performance_data = performance_df[performance_df['Company_Id'] == company_dict['Company_Id']].to_dict('records')
-            company_dict['Performance'] = performance_data
+    @classmethod
+    def to_cache(cls, result):
+        return result['json_data']
 
-            companies_data.append(company_dict)
+    @classmethod
+    def from_cache(cls, result):
+        return {'json_data': result}
 
-        final_json = {'json_data': companies_data}
+    @classmethod
+    def merge_results(cls, results):
+        return {'json_data': ProcessedDataset.concat([result['json_data'] for result in results])}
 
-        return final_json
-    
     def get_data_type(self):
         return 'json'
\ No newline at end of file
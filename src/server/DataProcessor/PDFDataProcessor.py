@@ -1,15 +1,55 @@
 from .DataProcessor import DataProcessor
+from .ProcessedDataset import ProcessedDataset
+from .Schema import Column, Schema
+import pandas as pd
+import os
 
 class PDFDataProcessor(DataProcessor):
+    # Version 2 parses with SCHEMA: downcast integers
+    VERSION = 2
+    REQUIRED_COLUMNS = {'Year', 'Quarter', 'Revenue (in $)'}
+    SCHEMA = Schema({
+        'Year': Column('int'),
+        'Quarter': Column('str'),
+        'Revenue (in $)': Column('float', thousands=','),
+        'Memberships Sold': Column('int'),
+        'Avg Duration (Minutes)': Column('int')
+    })
+
     def __init__(self, pdf_data):
         super().__init__(pdf_data)
         self.pdf_data = pdf_data
 
     def process_data(self):
-        self.pdf_data['Quarter'] = self.pdf_data['Year'].astype(str) + '_' + self.pdf_data['Quarter']
-        self.pdf_data.drop('Year', axis="columns", inplace=True)
-        self.pdf_data['Revenue (in $)'] = self.pdf_data['Revenue (in $)'].str.replace(',', '').astype(float)
-        return self.pdf_data.to_dict(orient='records')
+        if isinstance(self.pdf_data, list):
+            return self.process_tables(self.pdf_data)
+
+        return ProcessedDataset(self.process_table(self.pdf_data))
+
+    def process_tables(self, tables):
+        """Process every extracted PDFTable in one run, tagging rows with their source file and page."""
+        frames = []
+        for table in tables:
+            # Tables that are not quarterly reports (e.g. notes or footers picked up by tabula) are skipped
+            if not self.REQUIRED_COLUMNS.issubset(table.data.columns):
+                continue
+            frame = self.process_table(table.data)
+            frame['Source'] = os.path.basename(table.file_path)
+            frame['Page'] = table.page
+            frames.append(frame)
+
+        if not frames:
+            return ProcessedDataset()
+        return ProcessedDataset(pd.concat(frames, ignore_index=True))
+
+    def process_table(self, pdf_data):
+        pdf_data = self.SCHEMA.apply(pdf_data)
+        pdf_data['Quarter'] = pdf_data['Year'].astype(str) + '_' + pdf_data['Quarter']
+        return pdf_data.drop(columns='Year')
     
+    @classmethod
+    def merge_results(cls, results):
+        return ProcessedDataset.concat(results)
+
     def get_data_type(self):
         return 'pdf'
\ No newline at end of file
@@ -1,23 +1,38 @@
 from .DataProcessor import DataProcessor
 import re
 
+class PPTXContent:
+    def __init__(self, texts, tables):
+        # Stripped text of every shape that has any, in slide order
+        self.texts = texts
+        # Tables whose first header cell is "Quarter", as rows of stripped cell text
+        self.tables = tables
+
 class PPTXDataProcessor(DataProcessor):
     def __init__(self, pptx_data):
         super().__init__(pptx_data)
         self.pptx_data = pptx_data
 
     def process_data(self):
-        # Collect all text
-        combined_text = self.collect_all_text(self.pptx_data)
+        if isinstance(self.pptx_data, list):
+            return self.process_batch(self.pptx_data)
+
+        # Collect text and quarterly tables in one walk over the slides
+        content = self.pptx_data if isinstance(self.pptx_data, PPTXContent) else self.collect_content(self.pptx_data)
         
         # Extract basic data
-        data = self.extract_basic_data(combined_text)
+        data = self.extract_basic_data("\n".join(content.texts))
         
         # Extract quarterly metrics
-        data["Quarterly Metrics"] = self.extract_quarterly_metrics(self.pptx_data)
+        data["Quarterly Metrics"] = self.extract_quarterly_metrics(content.tables)
         
         return data
 
+    @classmethod
+    def process_batch(cls, presentations):
+        """Process many decks in one call, returning their results in input order."""
+        return [cls(presentation).process_data() for presentation in presentations]
+
     REGEX_PATTERNS = {
         "total_revenue": r"Total Revenue:?\s*\$?([0-9,.]+)",
         "total_memberships": r"Total Memberships Sold:?\s*([0-9,.]+)",
@@ -27,24 +42,50 @@ class PPTXDataProcessor(DataProcessor):
         "tennis_revenue": r"Tennis Court:?\s*([0-9,.]+)%?",
         "training_revenue": r"Personal Training:?\s*([0-9,.]+)%?"
     }
-    
-    def extract_text_value(self, text, pattern, remove_percent=False):
-        match = re.search(pattern, text)
-        if match:
-            value = match.group(1).strip()
-            if remove_percent:
-                value = value.replace("%", "")
-            value = value.replace(",", "")
-            return float(value) if value.replace(".", "").isdigit() else value
-        return None
 
-    def collect_all_text(self, presentation):
-        all_text = []
+    COMPILED_PATTERNS = {name: re.compile(pattern) for name, pattern in REGEX_PATTERNS.items()}
+
+    # Every pattern has exactly one capture group, so each value sits right after its named group
+    COMBINED_PATTERN = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in REGEX_PATTERNS.items()))
+
+    def match_highlights(self, text):
+        """Find the first value of every highlight pattern in a single scan of the text."""
+        values = {}
+        for match in self.COMBINED_PATTERN.finditer(text):
+            name = match.lastgroup
+            if name not in values:
+                values[name] = match.group(self.COMBINED_PATTERN.groupindex[name] + 1)
+            if len(values) == len(self.COMPILED_PATTERNS):
+                break
+
+        # A match hidden by an overlapping match of another pattern is looked up on its own
+        for name, pattern in self.COMPILED_PATTERNS.items():
+            if name not in values:
+                match = pattern.search(text)
+                values[name] = match.group(1) if match else None
+        return values
+
+    def parse_value(self, value, remove_percent=False):
+        if value is None:
+            return None
+        value = value.strip()
+        if remove_percent:
+            value = value.replace("%", "")
+        value = value.replace(",", "")
+        return float(value) if value.replace(".", "").isdigit() else value
+
+    def collect_content(self, presentation):
+        texts = []
+        tables = []
         for slide in presentation.slides:
             for shape in slide.shapes:
                 if hasattr(shape, "text") and shape.text.strip():
-                    all_text.append(shape.text.strip())
-        return "\n".join(all_text)
+                    texts.append(shape.text.strip())
+
+                # Only tables with "Quarter" in the first column header are kept
+                if hasattr(shape, 'table') and shape.has_table and shape.table.cell(0, 0).text.strip() == "Quarter":
+                    tables.append([[cell.text.strip() for cell in row.cells] for row in shape.table.rows])
+        return PPTXContent(texts, tables)
 
     def extract_basic_data(self, combined_text):
         data = {
@@ -65,20 +106,22 @@ class PPTXDataProcessor(DataProcessor):
             }
         }
         
+        values = self.match_highlights(combined_text)
+
         # Extract main metrics using global patterns
-        data["FitPro: Annual Summary 2023"]["Key Highlights"]["Total Revenue (in $)"] = self.extract_text_value(combined_text, self.REGEX_PATTERNS["total_revenue"])
-        data["FitPro: Annual Summary 2023"]["Key Highlights"]["Total Memberships Sold"] = int(self.extract_text_value(combined_text, self.REGEX_PATTERNS["total_memberships"]))
-        data["FitPro: Annual Summary 2023"]["Key Highlights"]["Top Location"] = self.extract_text_value(combined_text, self.REGEX_PATTERNS["top_location"])
+        data["FitPro: Annual Summary 2023"]["Key Highlights"]["Total Revenue (in $)"] = self.parse_value(values["total_revenue"])
+        data["FitPro: Annual Summary 2023"]["Key Highlights"]["Total Memberships Sold"] = int(self.parse_value(values["total_memberships"]))
+        data["FitPro: Annual Summary 2023"]["Key Highlights"]["Top Location"] = self.parse_value(values["top_location"])
         
         # Extract revenue breakdown using global patterns
-        data["Revenue Breakdown by Activity"]["Revenue Distribution"]["Gym"] = self.extract_text_value(combined_text, self.REGEX_PATTERNS["gym_revenue"], True)
-        data["Revenue Breakdown by Activity"]["Revenue Distribution"]["Pool"] = self.extract_text_value(combined_text, self.REGEX_PATTERNS["pool_revenue"], True)
-        data["Revenue Breakdown by Activity"]["Revenue Distribution"]["Tennis Court"] = self.extract_text_value(combined_text, self.REGEX_PATTERNS["tennis_revenue"], True)
-        data["Revenue Breakdown by Activity"]["Revenue Distribution"]["Personal Training"] = self.extract_text_value(combined_text, self.REGEX_PATTERNS["training_revenue"], True)
+        data["Revenue Breakdown by Activity"]["Revenue Distribution"]["Gym"] = self.parse_value(values["gym_revenue"], True)
+        data["Revenue Breakdown by Activity"]["Revenue Distribution"]["Pool"] = self.parse_value(values["pool_revenue"], True)
+        data["Revenue Breakdown by Activity"]["Revenue Distribution"]["Tennis Court"] = self.parse_value(values["tennis_revenue"], True)
+        data["Revenue Breakdown by Activity"]["Revenue Distribution"]["Personal Training"] = self.parse_value(values["training_revenue"], True)
         
         return data
     
-    def extract_quarterly_metrics(self, presentation):
+    def extract_quarterly_metrics(self, tables):
         quarterly_metrics = {
             "Q1": {
                 "Revenue": None,
@@ -102,31 +145,25 @@ class PPTXDataProcessor(DataProcessor):
             }
         }
         
-        for slide in presentation.slides:
-            for shape in slide.shapes:
-                if hasattr(shape, 'table') and shape.has_table:
-                    table = shape.table
+        for table in tables:
+            # Iterate through rows (skipping header)
+            for row in table[1:]:
+                quarter = row[0]
+                
+                if quarter in quarterly_metrics:
+                    # Revenue is in column 1
+                    revenue = row[1].replace(",", "")
+                    
+                    # Memberships sold is in column 2
+                    memberships = row[2]
+                    
+                    # Average duration is in column 3
+                    avg_duration = row[3]
                     
-                    # Check if this table has "Quarter" in the first column header
-                    if table.cell(0, 0).text.strip() == "Quarter":
-                        # Iterate through rows (skipping header)
-                        for row_idx in range(1, len(table.rows)):
-                            quarter = table.cell(row_idx, 0).text.strip()
-                            
-                            if quarter in quarterly_metrics:
-                                # Revenue is in column 1
-                                revenue = table.cell(row_idx, 1).text.strip().replace(",", "")
-                                
-                                # Memberships sold is in column 2
-                                memberships = table.cell(row_idx, 2).text.strip()
-                                
-                                # Average duration is in column 3
-                                avg_duration = table.cell(row_idx, 3).text.strip()
-                                
-                                # Update the data dictionary
-                                quarterly_metrics[quarter]["Revenue"] = float(revenue)
-                                quarterly_metrics[quarter]["Memberships Sold"] = int(memberships)
-                                quarterly_metrics[quarter]["Avg Duration (Minutes)"] = int(avg_duration)
+                    # Update the data dictionary
+                    quarterly_metrics[quarter]["Revenue"] = float(revenue)
+                    quarterly_metrics[quarter]["Memberships Sold"] = int(memberships)
+                    quarterly_metrics[quarter]["Avg Duration (Minutes)"] = int(avg_duration)
         
         return quarterly_metrics
     
@@ -0,0 +1,189 @@
+from collections.abc import Sequence
+import numpy as np
+import pandas as pd
+
+class ProcessedDataset(Sequence):
+    """Processed rows kept as typed columns in a DataFrame, read like a list of record dicts.
+
+    Records are only built when asked for, a batch at a time while iterating, so the pipeline,
+    the API and the visualizations can share the one columnar copy. children nests related
+    tables into every record: name -> (frame, keys), where keys holds the value of key for
+    each child row and the frame holds the columns shown in the nested records. Child rows are
+    linked to the position of the first parent row with their key, so datasets concatenated
+    from several sources keep their children apart even when their keys overlap. cube holds the
+    AggregateCube a processor materialized over the rows, if any, and checkpoint the
+    CSVCheckpoint an incremental load of its source file stopped at.
+    Treat the frames as read-only, they are handed out without copying.
+    """
+    BATCH_ROWS = 1000
+
+    def __init__(self, frame=None, children=None, key=None, cube=None, checkpoint=None):
+        self.frame = frame if frame is not None else pd.DataFrame()
+        self.key = key
+        self.children = {name: self.link(*child) for name, child in (children or {}).items()}
+        # Child row positions per parent position, grouped on the first lookup (see child_positions)
+        self.grouped_children = {}
+        self.cube = cube
+        self.checkpoint = checkpoint
+
+    def link(self, child_frame, keys, parents=None):
+        """(frame, keys, parents) of a child table, where parents holds the position of each child row's parent, -1 for none."""
+        keys = pd.Series(keys).reset_index(drop=True)
+        if parents is None:
+            parent_keys = self.frame[self.key].reset_index(drop=True).drop_duplicates()
+            found = pd.Index(parent_keys).get_indexer(keys)
+            parents = np.where(found >= 0, parent_keys.index.to_numpy()[np.maximum(found, 0)], -1)
+        return child_frame, keys, np.asarray(parents)
+
+    @classmethod
+    def from_records(cls, records):
+        return cls(pd.DataFrame.from_records(records) if records else pd.DataFrame())
+
+    @classmethod
+    def concat(cls, datasets):
+        """One dataset holding the rows of every dataset (or record list) in order."""
+        if not datasets:
+            return cls()
+        datasets = [dataset if isinstance(dataset, cls) else cls.from_records(dataset) for dataset in datasets]
+        frame = cls.concat_frames([dataset.frame for dataset in datasets])
+
+        # Parent positions are shifted by the rows of the datasets before, scoping children to their source
+        offsets = np.cumsum([0] + [len(dataset) for dataset in datasets[:-1]])
+        children = {}
+        for name in datasets[0].children:
+            parts = [dataset.children[name] for dataset in datasets]
+            children[name] = (
+                cls.concat_frames([child_frame for child_frame, _, _ in parts]),
+                pd.concat([keys for _, keys, _ in parts], ignore_index=True),
+                np.concatenate([np.where(parents >= 0, parents + offset, -1) for (_, _, parents), offset in zip(parts, offsets)])
+            )
+
+        # Cubes are merged from their pre-aggregated rows, a missing one leaves the result without
+        cubes = [dataset.cube for dataset in datasets]
+        cube = type(cubes[0]).merge(cubes) if all(cube is not None for cube in cubes) else None
+        return cls(frame, children, datasets[0].key, cube)
+
+    @staticmethod
+    def concat_frames(frames):
+        """pd.concat, keeping categorical columns categorical when their categories differ between frames.
+
+        The categories are unified first, which only remaps the codes of each frame instead of
+        converting the concatenated column back from text.
+        """
+        categorical = {name for part in frames for name, dtype in part.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)}
+        for name in categorical:
+            parts = [part[name] for part in frames if isinstance(part.dtypes.get(name), pd.CategoricalDtype)]
+            categories = parts[0].cat.categories
+            for part in parts[1:]:
+                categories = categories.union(part.cat.categories)
+            frames = [
+                part.assign(**{name: part[name].cat.set_categories(categories)}) if isinstance(part.dtypes.get(name), pd.CategoricalDtype) else part
+                for part in frames
+            ]
+
+        frame = pd.concat(frames, ignore_index=True)
+        for name in categorical:
+            if not isinstance(frame[name].dtype, pd.CategoricalDtype):
+                frame[name] = frame[name].astype('category')
+        return frame
+
+    @staticmethod
+    def as_frame(data):
+        """A DataFrame of a dataset, a DataFrame or a plain list of records."""
+        if isinstance(data, ProcessedDataset):
+            return data.to_frame()
+        if isinstance(data, pd.DataFrame):
+            return data
+        return pd.DataFrame.from_records(data) if data else pd.DataFrame()
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.slice(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ProcessedDataset index out of range")
+
+        record = self.frame.iloc[index:index + 1].to_dict(orient='records')[0]
+        for name, (child_frame, _, _) in self.children.items():
+            record[name] = child_frame.iloc[self.child_positions(name).get(index, [])].to_dict(orient='records')
+        return record
+
+    def slice(self, index):
+        """The rows selected by a slice as a dataset, with the child rows of those rows."""
+        rows = np.arange(len(self))[index]
+        children = {}
+        if self.children:
+            # Position of every row in the slice, -1 for rows left out and for the -1 of parentless child rows
+            moved = np.full(len(self) + 1, -1)
+            moved[rows] = np.arange(len(rows))
+            for name, (child_frame, keys, parents) in self.children.items():
+                kept = moved[parents] >= 0
+                children[name] = (child_frame[kept], keys[kept], moved[parents[kept]])
+        return ProcessedDataset(self.frame.iloc[index], children, self.key)
+
+    def child_positions(self, name):
+        if name not in self.grouped_children:
+            parents = self.children[name][2]
+            self.grouped_children[name] = pd.Series(parents).groupby(parents).indices
+        return self.grouped_children[name]
+
+    def __iter__(self):
+        grouped = {name: self.group_records(child_frame, parents) for name, (child_frame, _, parents) in self.children.items()}
+        for start in range(0, len(self.frame), self.BATCH_ROWS):
+            for position, record in enumerate(self.frame.iloc[start:start + self.BATCH_ROWS].to_dict(orient='records'), start):
+                for name, records_by_parent in grouped.items():
+                    record[name] = records_by_parent.get(position, [])
+                yield record
+
+    def __eq__(self, other):
+        if isinstance(other, ProcessedDataset) and not (self.children or other.children):
+            return self.frame.equals(other.frame)
+        if isinstance(other, (ProcessedDataset, list)):
+            return self.to_records() == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"ProcessedDataset({len(self)} rows, columns={list(self.frame.columns)}, children={list(self.children)})"
+
+    def group_records(self, child_frame, parents):
+        grouped = {}
+        for parent, record in zip(parents.tolist(), child_frame.to_dict(orient='records')):
+            grouped.setdefault(parent, []).append(record)
+        return grouped
+
+    def to_records(self):
+        return list(self)
+
+    def to_dict(self, orient='records'):
+        """Records (with children nested) for orient='records', otherwise DataFrame.to_dict of the columns."""
+        if orient == 'records':
+            return self.to_records()
+        return self.frame.to_dict(orient=orient)
+
+    def to_frame(self):
+        """The columns as a DataFrame, with each child table as a column of nested record lists."""
+        if not self.children:
+            return self.frame
+        frame = self.frame.copy()
+        for name, (child_frame, _, parents) in self.children.items():
+            records_by_parent = self.group_records(child_frame, parents)
+            frame[name] = [records_by_parent.get(position, []) for position in range(len(frame))]
+        return frame
+
+    def memory_report(self, name):
+        """Bytes held by each column of every table, counting the strings of text columns, keyed by table name."""
+        report = {name: self.frame.memory_usage(index=False, deep=True).to_dict()}
+        for child_name, (child_frame, _, _) in self.children.items():
+            report[f"{name}.{child_name.lower()}"] = child_frame.memory_usage(index=False, deep=True).to_dict()
+        return report
+
+    def child_frame(self, name):
+        """A child table flattened, with the key of its parent as a column."""
+        child_frame, keys, _ = self.children[name]
+        if self.key in child_frame.columns:
+            return child_frame
+        return child_frame.assign(**{self.key: keys.to_numpy()})
@@ -0,0 +1,79 @@
+import pandas as pd
+
+class Column:
+    """How one source column is parsed and cleaned.
+
+    dtype is one of DTYPES: integers are downcast to the smallest type holding their values,
+    category columns are stored as pandas categoricals and datetime columns are parsed with
+    date_format. thousands is a separator stripped from text before numbers are parsed, and
+    fill="median" replaces missing values with the column median.
+    """
+    DTYPES = ("int", "float", "category", "datetime", "str")
+    FILLS = ("median",)
+
+    def __init__(self, dtype=None, rename=None, date_format=None, thousands=None, fill=None):
+        if dtype is not None and dtype not in self.DTYPES:
+            raise ValueError(f"Unsupported dtype: {dtype}")
+        if fill is not None and fill not in self.FILLS:
+            raise ValueError(f"Unsupported fill: {fill}")
+        self.dtype = dtype
+        self.rename = rename
+        self.date_format = date_format
+        self.thousands = thousands
+        self.fill = fill
+
+    def convert(self, series):
+        if self.thousands and not pd.api.types.is_numeric_dtype(series):
+            series = series.astype(str).str.replace(self.thousands, '', regex=False)
+
+        if self.dtype == "datetime" and not pd.api.types.is_datetime64_any_dtype(series):
+            series = pd.to_datetime(series, format=self.date_format)
+        elif self.dtype in ("int", "float"):
+            series = pd.to_numeric(series)
+
+        if self.fill == "median":
+            series = series.fillna(series.median())
+
+        if self.dtype == "int":
+            # Columns that still hold missing values stay float
+            series = pd.to_numeric(series, downcast='integer')
+        elif self.dtype == "float":
+            series = series.astype('float64')
+        elif self.dtype == "category":
+            series = self.to_category(series)
+        return series
+
+    def to_category(self, series):
+        """A categorical with sorted categories, whichever order the parser met the values in."""
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            return series.astype('category')
+        if not series.cat.categories.is_monotonic_increasing:
+            return series.cat.reorder_categories(series.cat.categories.sort_values())
+        return series
+
+class Schema:
+    """Declared columns of one table, applied in a single pass over a parsed DataFrame.
+
+    Columns the schema does not declare are kept unchanged unless select is set, in which
+    case only the declared columns are kept, in declaration order.
+    """
+    def __init__(self, columns, select=False):
+        self.columns = columns
+        self.select = select
+
+    def read_options(self):
+        """pd.read_csv arguments that parse text and categorical columns straight into their final dtype."""
+        dtype = {name: column.dtype for name, column in self.columns.items() if column.dtype in ("category", "str")}
+        return {"dtype": dtype} if dtype else {}
+
+    def apply(self, frame):
+        for name, column in self.columns.items():
+            if name in frame.columns:
+                frame[name] = column.convert(frame[name])
+
+        if self.select:
+            frame = frame[[name for name in self.columns if name in frame.columns]]
+
+        renames = {name: column.rename for name, column in self.columns.items() if column.rename}
+        return frame.rename(columns=renames) if renames else frame
+
@@ -1,4 +1,6 @@
 class DataSource:
-    def __init__(self, type, file_path):
+    def __init__(self, type, file_path, options=None):
         self.type = type
-        self.file_path = file_path
\ No newline at end of file
+        self.file_path = file_path
+        # Keyword arguments forwarded to the ingestion class, e.g. {"chunksize": 100000} for CSV
+        self.options = options or {}
\ No newline at end of file
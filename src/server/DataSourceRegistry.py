@@ -0,0 +1,42 @@
+from src.server.DataSource import DataSource
+import glob
+import json
+import os
+
+class DataSourceRegistry:
+    def __init__(self, base_dir='.'):
+        # Relative patterns are resolved against base_dir
+        self.base_dir = base_dir
+        self.entries = []
+
+    @classmethod
+    def from_config(cls, config_path):
+        """Build a registry from a JSON config of the form
+        {"sources": [{"type": "csv", "pattern": "clubs/*.csv", "options": {"chunksize": 100000}}]},
+        with patterns relative to the config file.
+        """
+        with open(config_path, 'r') as f:
+            config = json.load(f)
+
+        registry = cls(os.path.dirname(os.path.abspath(config_path)))
+        for entry in config['sources']:
+            registry.add(entry['type'], entry['pattern'], entry.get('options'))
+        return registry
+
+    def add(self, type, pattern, options=None):
+        self.entries.append((type, pattern, options))
+        return self
+
+    def discover(self):
+        data_sources = []
+        seen = set()
+
+        for type, pattern, options in self.entries:
+            for file_path in sorted(glob.glob(os.path.join(self.base_dir, pattern), recursive=True)):
+                # A file matched by several patterns is only ingested once, by the first
+                if file_path in seen or not os.path.isfile(file_path):
+                    continue
+                seen.add(file_path)
+                data_sources.append(DataSource(type, file_path, options))
+
+        return data_sources
@@ -0,0 +1,265 @@
+import sys
+from pathlib import Path
+
+root_dir = Path(__file__).resolve().parents[2]
+sys.path.append(str(root_dir))
+
+from pptx import Presentation
+from pptx.util import Inches
+import argparse
+import json
+import numpy as np
+import os
+import pandas as pd
+import random
+import zlib
+
+class DatasetGenerator:
+    """Write synthetic datasets shaped like the fixtures in datasets/, at any scale.
+
+    The same seed always produces the same files, so benchmark runs are comparable.
+    """
+    MEMBERSHIP_TYPES = ("Basic", "Premium", "VIP")
+    ACTIVITIES = ("Gym", "Pool", "Tennis Court", "Personal Training", "Yoga Class", "Dance Class", "Swimming Class", "Climbing Wall")
+    DURATIONS = (30, 60, 90, 120)
+    LOCATIONS = ("Downtown", "Eastside", "Westside")
+    REGIONS = ("North America", "Europe", "Asia", "South America", "Oceania")
+    COMPANY_NAMES = ("FitPro", "RecreaLife", "ActiveCore", "PeakMotion", "AquaFit", "IronWorks", "ZenBalance", "SportHub")
+    FIRST_NAMES = ("Alice", "Bob", "Carol", "Dave", "Eve", "Frank", "Grace", "Hank", "Isla", "Jake", "Karen", "Leo", "Maya", "Nina", "Omar")
+    ROLES = (
+        "Personal Trainer", "Group Fitness Instructor", "Gym Manager", "Sports Nutritionist", "Marketing Specialist",
+        "Customer Service Lead", "Event Coordinator", "Equipment Maintenance Technician", "Swimming Coach",
+        "Yoga Instructor", "Spa Therapist", "Physiotherapist", "Receptionist"
+    )
+    PDF_COLUMNS = ("Year", "Quarter", "Revenue (in $)", "Memberships Sold", "Avg Duration (Minutes)")
+    PPTX_COLUMNS = ("Quarter", "Revenue (in $)", "Memberships Sold", "Avg Duration (Minutes)")
+    CSV_CHUNK_ROWS = 1_000_000
+
+    # Page geometry and Helvetica glyph widths (per 1000 units of font size) of the FPDF-made fixture
+    PDF_PAGE_SIZE = (595.28, 841.89)
+    PDF_LEFT = 28.35
+    PDF_TOP = 756.85
+    PDF_CELL_WIDTH = 141.73
+    PDF_CELL_HEIGHT = 28.35
+    PDF_GLYPH_WIDTHS = {
+        ",": 278, " ": 278, "(": 333, ")": 333, "$": 556, "Q": 778, "M": 833, "A": 722, "D": 722,
+        "i": 222, "l": 222, "t": 278, "r": 333, "f": 278, "m": 833
+    }
+
+    def __init__(self, seed=0):
+        self.seed = seed
+
+    def generate(self, output_dir, csv_rows=1_000_000, companies=10_000, pdf_pages=50, pptx_slides=300):
+        """Write all four datasets and a DataSourceRegistry config listing them; returns the config path."""
+        os.makedirs(output_dir, exist_ok=True)
+        self.write_json(os.path.join(output_dir, 'dataset1.json'), companies)
+        self.write_csv(os.path.join(output_dir, 'dataset2.csv'), csv_rows)
+        self.write_pdf(os.path.join(output_dir, 'dataset3.pdf'), pdf_pages)
+        self.write_pptx(os.path.join(output_dir, 'dataset4.pptx'), pptx_slides)
+
+        config_path = os.path.join(output_dir, 'sources.json')
+        with open(config_path, 'w') as f:
+            json.dump({"sources": [
+                {"type": "json", "pattern": "dataset1.json"},
+                {"type": "csv", "pattern": "dataset2.csv"},
+                {"type": "pdf", "pattern": "dataset3.pdf"},
+                {"type": "pptx", "pattern": "dataset4.pptx"}
+            ]}, f, indent=2)
+        return config_path
+
+    def write_csv(self, file_path, rows, start_date="2024-01-01", days=31):
+        """Write the club activity log, a million vectorized rows at a time."""
+        rng = np.random.default_rng(self.seed)
+        with open(file_path, 'w', newline='') as f:
+            for start in range(0, max(rows, 1), self.CSV_CHUNK_ROWS):
+                count = min(self.CSV_CHUNK_ROWS, rows - start)
+                member_numbers = np.arange(start + 1, start + count + 1).astype(str)
+                frame = pd.DataFrame({
+                    "Date": np.datetime_as_string(np.datetime64(start_date) + rng.integers(0, days, count), unit='D'),
+                    "Membership_ID": np.char.add("M", np.char.zfill(member_numbers, 3)),
+                    "Membership_Type": rng.choice(self.MEMBERSHIP_TYPES, count),
+                    "Activity": rng.choice(self.ACTIVITIES, count),
+                    "Revenue": rng.uniform(15, 150, count).round(2),
+                    "Duration (Minutes)": rng.choice(self.DURATIONS, count),
+                    "Location": rng.choice(self.LOCATIONS, count)
+                })
+                frame.to_csv(f, header=start == 0, index=False)
+
+    def write_json(self, file_path, companies, employees_per_company=15, quarters=8, missing_rate=0.05):
+        """Write the companies document one company at a time, including the fixture's missing and null values."""
+        rng = random.Random(self.seed)
+        employee_ids = iter(range(1, companies * employees_per_company + 1))
+
+        with open(file_path, 'w') as f:
+            f.write('{\n  "companies": [\n')
+            for company_id in range(1, companies + 1):
+                employees = [self.make_employee(rng, next(employee_ids), missing_rate) for _ in range(employees_per_company)]
+                company = {
+                    "id": company_id,
+                    "name": f"{rng.choice(self.COMPANY_NAMES)} {company_id}",
+                    "industry": "Sports and Leisure",
+                    "revenue": None if rng.random() < missing_rate else rng.randrange(10_000_000, 150_000_000, 1_000_000),
+                    "location": rng.choice(self.REGIONS),
+                    "employees": employees,
+                    "performance": {
+                        f"{2023 + quarter // 4}_Q{quarter % 4 + 1}": {
+                            "revenue": None if rng.random() < missing_rate else rng.randrange(5_000_000, 40_000_000, 500_000),
+                            "profit_margin": rng.randrange(10, 40) / 2
+                        }
+                        for quarter in range(quarters)
+                    }
+                }
+                f.write(("    " if company_id == 1 else ",\n    ") + json.dumps(company))
+            f.write('\n  ]\n}\n')
+
+    def make_employee(self, rng, employee_number, missing_rate):
+        employee = {
+            "id": f"E{employee_number:03d}",
+            "name": rng.choice(self.FIRST_NAMES),
+            "role": rng.choice(self.ROLES),
+            "cashmoneh": rng.randrange(30_000, 90_000, 1_000)
+        }
+        # Like the fixture, some employees have a null hired_date and some none at all
+        roll = rng.random()
+        if roll >= 2 * missing_rate:
+            employee["hired_date"] = f"{rng.randint(2015, 2023)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        elif roll >= missing_rate:
+            employee["hired_date"] = None
+        return employee
+
+    def write_pdf(self, file_path, pages, rows_per_page=25):
+        """Write a quarterly report with one bordered table per page, drawn the way the fixture's FPDF output is.
+
+        Objects are written as they are produced, so memory does not grow with the page count.
+        """
+        rng = random.Random(self.seed)
+        offsets = {}
+        page_ids = []
+
+        with open(file_path, 'wb') as f:
+            def write_object(object_id, body, stream=None):
+                offsets[object_id] = f.tell()
+                f.write(f"{object_id} 0 obj\n".encode('latin-1') + body)
+                if stream is not None:
+                    f.write(b"\nstream\n" + stream + b"\nendstream")
+                f.write(b"\nendobj\n")
+
+            f.write(b"%PDF-1.3\n")
+            row_number = 0
+            for page in range(pages):
+                rows = []
+                for _ in range(rows_per_page):
+                    rows.append((
+                        str(2022 + row_number // 4),
+                        f"Q{row_number % 4 + 1}",
+                        f"{rng.randrange(1_500_000, 4_000_000, 100_000):,}",
+                        str(rng.randrange(250, 550, 10)),
+                        str(rng.randint(80, 100))
+                    ))
+                    row_number += 1
+
+                content = zlib.compress(self.pdf_page_content(rows, with_title=page == 0).encode('latin-1'))
+                page_id, content_id = 3 + 2 * page, 4 + 2 * page
+                page_ids.append(page_id)
+                write_object(page_id, f"<</Type /Page\n/Parent 1 0 R\n/Resources 2 0 R\n/Contents {content_id} 0 R>>".encode('latin-1'))
+                write_object(content_id, f"<</Filter /FlateDecode /Length {len(content)}>>".encode('latin-1'), content)
+
+            font_id = 3 + 2 * pages
+            kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+            write_object(1, f"<</Type /Pages\n/Kids [{kids} ]\n/Count {pages}\n/MediaBox [0 0 {self.PDF_PAGE_SIZE[0]} {self.PDF_PAGE_SIZE[1]}]\n>>".encode('latin-1'))
+            write_object(font_id, b"<</Type /Font\n/BaseFont /Helvetica\n/Subtype /Type1\n/Encoding /WinAnsiEncoding\n>>")
+            write_object(font_id + 1, b"<</Type /Font\n/BaseFont /Helvetica-Bold\n/Subtype /Type1\n/Encoding /WinAnsiEncoding\n>>")
+            write_object(2, f"<<\n/ProcSet [/PDF /Text]\n/Font <<\n/F1 {font_id} 0 R\n/F2 {font_id + 1} 0 R\n>>\n>>".encode('latin-1'))
+            write_object(font_id + 2, b"<<\n/Producer (DatasetGenerator)\n>>")
+            write_object(font_id + 3, f"<<\n/Type /Catalog\n/Pages 1 0 R\n/OpenAction [{page_ids[0] if page_ids else 3} 0 R /FitH null]\n>>".encode('latin-1'))
+
+            xref_offset = f.tell()
+            object_count = font_id + 4
+            f.write(f"xref\n0 {object_count}\n0000000000 65535 f \n".encode('latin-1'))
+            for object_id in range(1, object_count):
+                f.write(f"{offsets[object_id]:010d} 00000 n \n".encode('latin-1'))
+            f.write(f"trailer\n<<\n/Size {object_count}\n/Root {font_id + 3} 0 R\n/Info {font_id + 2} 0 R\n>>\nstartxref\n{xref_offset}\n%%EOF\n".encode('latin-1'))
+
+    def pdf_page_content(self, rows, with_title):
+        commands = ["2 J", "0.57 w"]
+        if with_title:
+            commands.append("BT /F2 14.00 Tf ET")
+            commands.append("BT 146.10 795.17 Td (Sports and Leisure Quarterly Performance Report) Tj ET")
+
+        for index, cells in enumerate([self.PDF_COLUMNS] + rows):
+            # The header row is bold, the font switches to regular once for the data rows
+            if index == 0:
+                commands.append("BT /F2 12.00 Tf ET")
+            elif index == 1:
+                commands.append("BT /F1 12.00 Tf ET")
+            top = self.PDF_TOP - index * self.PDF_CELL_HEIGHT
+            for column, text in enumerate(cells):
+                left = self.PDF_LEFT + column * self.PDF_CELL_WIDTH
+                text_left = left + (self.PDF_CELL_WIDTH - self.pdf_text_width(text, 12)) / 2
+                escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+                commands.append(
+                    f"{left:.2f} {top:.2f} {self.PDF_CELL_WIDTH:.2f} -{self.PDF_CELL_HEIGHT:.2f} re S "
+                    f"BT {text_left:.2f} {top - 17.78:.2f} Td ({escaped}) Tj ET"
+                )
+        return "\n".join(commands) + "\n"
+
+    def pdf_text_width(self, text, font_size):
+        # Digits are 556 units wide in Helvetica; unlisted letters are close enough to that for centering
+        return sum(self.PDF_GLYPH_WIDTHS.get(char, 556) for char in text) * font_size / 1000
+
+    def write_pptx(self, file_path, slides):
+        """Write a deck repeating the fixture's summary, quarterly table and breakdown slides, one year per three slides."""
+        rng = random.Random(self.seed)
+        presentation = Presentation()
+        layout = presentation.slide_layouts[5]
+
+        for index in range(slides):
+            year = 2023 + index // 3
+            slide = presentation.slides.add_slide(layout)
+            kind = index % 3
+
+            if kind == 0:
+                slide.shapes.title.text = f"FitPro: Annual Summary {year}"
+                self.add_text_box(slide, "Key Highlights:", [
+                    f"Total Revenue: ${rng.randrange(5_000_000, 20_000_000, 100_000):,}",
+                    f"Total Memberships Sold: {rng.randrange(800, 3000):,}",
+                    f"Top Location: {rng.choice(self.LOCATIONS)}"
+                ])
+            elif kind == 1:
+                slide.shapes.title.text = "Quarterly Metrics"
+                table = slide.shapes.add_table(5, len(self.PPTX_COLUMNS), Inches(0.5), Inches(1.5), Inches(9), Inches(3)).table
+                for column, header in enumerate(self.PPTX_COLUMNS):
+                    table.cell(0, column).text = header
+                for quarter in range(1, 5):
+                    values = (f"Q{quarter}", f"{rng.randrange(1_500_000, 4_000_000, 100_000):,}", str(rng.randrange(250, 550, 10)), str(rng.randint(80, 100)))
+                    for column, value in enumerate(values):
+                        table.cell(quarter, column).text = value
+            else:
+                slide.shapes.title.text = "Revenue Breakdown by Activity"
+                gym = rng.randrange(25, 45)
+                pool = rng.randrange(15, 30)
+                tennis = rng.randrange(5, 20)
+                self.add_text_box(slide, "Revenue Distribution:", [
+                    f"Gym: {gym}%", f"Pool: {pool}%", f"Tennis Court: {tennis}%", f"Personal Training: {100 - gym - pool - tennis}%"
+                ])
+
+        presentation.save(file_path)
+
+    def add_text_box(self, slide, heading, lines):
+        text_frame = slide.shapes.add_textbox(Inches(1), Inches(1.5), Inches(8), Inches(4)).text_frame
+        text_frame.text = heading
+        for line in lines:
+            text_frame.add_paragraph().text = line
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Write synthetic datasets in the shape of datasets/ for scale testing.")
+    parser.add_argument("output_dir")
+    parser.add_argument("--csv-rows", type=int, default=1_000_000)
+    parser.add_argument("--companies", type=int, default=10_000)
+    parser.add_argument("--pdf-pages", type=int, default=50)
+    parser.add_argument("--pptx-slides", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config_path = DatasetGenerator(args.seed).generate(args.output_dir, args.csv_rows, args.companies, args.pdf_pages, args.pptx_slides)
+    print(f"Wrote datasets to {args.output_dir}; run them with: python src/server/DataProcessing.py {config_path}")
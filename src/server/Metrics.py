@@ -0,0 +1,241 @@
+from contextlib import contextmanager
+import bisect
+import os
+import pickle
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows, which cannot fork the processes that share samples either
+    fcntl = None
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # One count per bucket plus the +Inf bucket; made cumulative when rendered
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other):
+        self.counts = [count + other_count for count, other_count in zip(self.counts, other.counts)]
+        self.sum += other.sum
+        self.count += other.count
+
+class Metrics:
+    """In-process counters, gauges and histograms rendered in the Prometheus text format.
+
+    Each metric is identified by its name and a dict of labels. Recording costs a lock and a
+    dict lookup, so it is cheap enough to call on every request.
+
+    Processes sharing a directory (see share) each write their samples there, and render reports
+    the sum of their counters and histograms and the largest value of each gauge.
+    """
+    # Samples of exited processes, folded together by fold
+    RETIRED_FILE = "retired.pkl"
+    DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        # name -> {label items: value}, with the metric type recorded per name
+        self.samples = {}
+        self.types = {}
+        # Set while the samples are shared with other processes through this directory
+        self.directory = None
+        self.dirty = False
+        self.write_lock = threading.Lock()
+
+    def inc(self, name, labels=None, value=1):
+        key = self.get_key(labels)
+        with self.lock:
+            series = self.get_series(name, "counter")
+            series[key] = series.get(key, 0) + value
+            self.dirty = True
+
+    def set(self, name, value, labels=None):
+        key = self.get_key(labels)
+        with self.lock:
+            self.get_series(name, "gauge")[key] = value
+            self.dirty = True
+
+    def observe(self, name, value, labels=None):
+        key = self.get_key(labels)
+        with self.lock:
+            series = self.get_series(name, "histogram")
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+            self.dirty = True
+
+    @contextmanager
+    def timer(self, name, labels=None):
+        """Observe the seconds spent in the with block into the histogram name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, labels)
+
+    def get(self, name, labels=None):
+        """The current value of a counter or gauge, or the Histogram, for one set of labels."""
+        with self.lock:
+            return self.samples.get(name, {}).get(self.get_key(labels))
+
+    def get_series(self, name, metric_type):
+        if name not in self.samples:
+            self.samples[name] = {}
+            self.types[name] = metric_type
+        elif self.types[name] != metric_type:
+            raise ValueError(f"{name} is a {self.types[name]}, not a {metric_type}")
+        return self.samples[name]
+
+    def get_key(self, labels):
+        return tuple(labels.items()) if labels else ()
+
+    def share(self, directory):
+        """Report the samples of every process sharing directory from render; None stops sharing."""
+        self.directory = directory
+        self.write()
+
+    def reset(self):
+        """Drop all samples, e.g. in a forked child so it only counts its own work."""
+        # The lock may have been held by another thread of the parent at the fork
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.samples = {}
+        self.types = {}
+        self.dirty = False
+
+    def write(self):
+        """Write this process's samples to the shared directory."""
+        if not self.directory:
+            return
+        with self.write_lock:
+            with self.lock:
+                data = pickle.dumps((self.types, self.samples))
+                self.dirty = False
+            path = os.path.join(self.directory, f"{os.getpid()}.pkl")
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+
+    def start_flushing(self, interval):
+        """Write the samples every interval seconds from a daemon thread while they change."""
+        def flush():
+            while True:
+                time.sleep(interval)
+                if self.dirty:
+                    self.write()
+
+        thread = threading.Thread(target=flush, daemon=True)
+        thread.start()
+        return thread
+
+    def merged(self):
+        """A Metrics combining the samples written by the other processes with this one's."""
+        merged = Metrics(self.buckets)
+        own_file = f"{os.getpid()}.pkl"
+        with self.locked(fcntl.LOCK_SH):
+            for name in sorted(os.listdir(self.directory)):
+                if name.endswith(".pkl") and name != own_file:
+                    merged.add(*self.read(name))
+        with self.lock:
+            merged.add(self.types, self.samples)
+        return merged
+
+    def fold(self, pids):
+        """Fold the samples of exited processes into RETIRED_FILE and delete their files.
+
+        Keeps the directory, and the work of each render, bounded by the live processes however
+        often they are replaced.
+        """
+        retired = Metrics(self.buckets)
+        with self.locked(fcntl.LOCK_EX):
+            for name in [self.RETIRED_FILE] + [f"{pid}.pkl" for pid in pids]:
+                try:
+                    retired.add(*self.read(name))
+                except FileNotFoundError:
+                    pass
+
+            path = os.path.join(self.directory, self.RETIRED_FILE)
+            with open(path + ".tmp", "wb") as f:
+                pickle.dump((retired.types, retired.samples), f)
+            os.replace(path + ".tmp", path)
+
+            for pid in pids:
+                for name in (f"{pid}.pkl", f"{pid}.pkl.tmp"):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except FileNotFoundError:
+                        pass
+
+    @contextmanager
+    def locked(self, operation):
+        # Renders take it shared, fold exclusively, so no render sees a sample both folded and in its own file
+        with open(os.path.join(self.directory, ".lock"), "a") as f:
+            fcntl.flock(f, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def read(self, name):
+        with open(os.path.join(self.directory, name), "rb") as f:
+            return pickle.load(f)
+
+    def add(self, types, samples):
+        for name, series in samples.items():
+            metric_type = types[name]
+            target = self.get_series(name, metric_type)
+            for key, value in series.items():
+                if metric_type == "counter":
+                    target[key] = target.get(key, 0) + value
+                elif metric_type == "gauge":
+                    target[key] = max(target.get(key, value), value)
+                else:
+                    target.setdefault(key, Histogram(self.buckets)).merge(value)
+
+    def render(self):
+        if self.directory:
+            return self.merged().render()
+
+        lines = []
+        with self.lock:
+            for name, series in self.samples.items():
+                metric_type = self.types[name]
+                lines.append(f"# TYPE {name} {metric_type}")
+                for key, value in series.items():
+                    if metric_type != "histogram":
+                        lines.append(f"{name}{self.format_labels(key)} {self.format_value(value)}")
+                        continue
+
+                    cumulative = 0
+                    for bucket, count in zip(self.buckets + ("+Inf",), value.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{self.format_labels(key + (('le', self.format_value(bucket)),))} {cumulative}")
+                    lines.append(f"{name}_sum{self.format_labels(key)} {self.format_value(value.sum)}")
+                    lines.append(f"{name}_count{self.format_labels(key)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+    def format_labels(self, key):
+        if not key:
+            return ""
+        labels = ",".join(f'{label}="{self.escape(value)}"' for label, value in key)
+        return f"{{{labels}}}"
+
+    def format_value(self, value):
+        if isinstance(value, str):
+            return value
+        return repr(float(value)) if isinstance(value, float) else str(value)
+
+    def escape(self, value):
+        return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
@@ -0,0 +1,144 @@
+from werkzeug.serving import make_server
+import gc
+import logging
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+class PreforkServer:
+    def __init__(self, app, host="127.0.0.1", port=5000, workers=2, threads=False, backlog=1024, metrics=None, metrics_interval=1.0):
+        if not hasattr(os, "fork"):
+            raise RuntimeError("PreforkServer requires os.fork, which this platform does not provide")
+
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.threads = threads
+        self.backlog = backlog
+        # The app's Metrics; each worker counts its own requests and writes them every metrics_interval
+        # seconds for the others, so /metrics reports the whole server whichever worker answers
+        self.metrics = metrics
+        self.metrics_interval = metrics_interval
+        self.socket = None
+        self.worker_pids = set()
+        self.running = False
+
+    def bind(self):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((self.host, self.port))
+        self.socket.listen(self.backlog)
+        # Report the real port when 0 asked the OS to pick one
+        self.port = self.socket.getsockname()[1]
+        self.socket.set_inheritable(True)
+
+    def serve(self, on_tick=None, tick_interval=1.0):
+        """Fork the workers and supervise them until SIGINT or SIGTERM.
+
+        on_tick is called every tick_interval seconds in the supervisor; when it returns True
+        (e.g. the pipeline swapped in new data) the workers are replaced by fresh forks.
+        """
+        if self.socket is None:
+            self.bind()
+
+        self.running = True
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+
+        # Samples of exited workers are folded into one file, so counters never go backwards on a reload
+        metrics_dir = tempfile.mkdtemp(prefix="metrics-") if self.metrics else None
+        if self.metrics:
+            self.metrics.share(metrics_dir)
+
+        self.spawn_workers()
+        try:
+            while self.running:
+                time.sleep(tick_interval)
+                self.reap_workers()
+                if self.running and on_tick and on_tick():
+                    self.reload()
+                if self.metrics and self.metrics.dirty:
+                    self.metrics.write()
+        finally:
+            self.stop_workers(self.worker_pids)
+            self.socket.close()
+            if self.metrics:
+                self.metrics.share(None)
+                shutil.rmtree(metrics_dir, ignore_errors=True)
+
+    def handle_stop(self, signum, frame):
+        self.running = False
+
+    def spawn_workers(self):
+        # Objects built so far (the processed datasets) move to the permanent generation, so the
+        # collector in each worker never writes to their pages and they stay shared copy-on-write
+        gc.freeze()
+        while len(self.worker_pids) < self.workers:
+            pid = os.fork()
+            if pid == 0:
+                self.run_worker()
+            self.worker_pids.add(pid)
+
+    def run_worker(self):
+        exit_code = 0
+        try:
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            if self.metrics:
+                # The supervisor's own samples (the pipeline's) are already in its file
+                self.metrics.reset()
+                self.metrics.start_flushing(self.metrics_interval)
+            server = make_server(self.host, self.port, self.app, threaded=self.threads, fd=self.socket.fileno())
+            # Finish the request in flight, then leave serve_forever
+            signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+            server.serve_forever()
+        except BaseException:
+            logger.exception("Worker %s failed", os.getpid())
+            exit_code = 1
+        finally:
+            if self.metrics:
+                self.metrics.write()
+            os._exit(exit_code)
+
+    def reap_workers(self):
+        """Replace workers that died unexpectedly."""
+        exited = []
+        for pid in list(self.worker_pids):
+            finished_pid, _ = os.waitpid(pid, os.WNOHANG)
+            if finished_pid:
+                self.worker_pids.discard(pid)
+                exited.append(pid)
+                logger.warning("Worker %s exited, starting a replacement", pid)
+        # Folded before a replacement could be forked with a reused pid
+        if exited and self.metrics:
+            self.metrics.fold(exited)
+        if self.running:
+            self.spawn_workers()
+
+    def reload(self):
+        # Let the replaced datasets be collected before the new generation is frozen
+        gc.unfreeze()
+        old_pids = set(self.worker_pids)
+        self.worker_pids = set()
+        self.spawn_workers()
+        self.stop_workers(old_pids)
+        if self.metrics:
+            self.metrics.fold(old_pids)
+
+    def stop_workers(self, pids):
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
@@ -0,0 +1,163 @@
+from src.server.DataIngestion.IngestionFactory import IngestionFactory
+from src.server.DataProcessor.ProcessedDataset import ProcessedDataset
+import pyarrow as pa
+import pyarrow.parquet as pq
+import hashlib
+import json
+import os
+import pickle
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), '../..', '.cache')
+
+class ResultCache:
+    # Tables are stored as Parquet, everything else (the PPTX summary) is pickled. The child tables of a
+    # dataset (JSON employees and performance) go to a Parquet file each, next to the parent's.
+    TABULAR_TYPES = ("csv", "pdf", "json")
+    # Parquet metadata keys of the pickled CSVCheckpoint of an incrementally loaded result and of the
+    # dataset's key column and child table names
+    CHECKPOINT_KEY = b"checkpoint"
+    CHILDREN_KEY = b"children"
+    # Columns added to a child table for the key and position of each row's parent
+    CHILD_KEY_COLUMN = "__key__"
+    CHILD_PARENT_COLUMN = "__parent__"
+    EXTENSIONS = (".parquet", ".pkl")
+    HASH_BLOCK_SIZE = 1024 * 1024
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def get_key(self, source):
+        """Key a source on its file content, its ingestion options and the version of its processor."""
+        digest = hashlib.sha256()
+        # Options such as stream, backend or all_tables change the result of the same file
+        digest.update(json.dumps(source.options, sort_keys=True, default=repr).encode('utf-8'))
+        with open(source.file_path, 'rb') as f:
+            for block in iter(lambda: f.read(self.HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+
+        processor_class = IngestionFactory.get_processor_class(source.type)
+        return f"{source.type}-{digest.hexdigest()}-v{processor_class.VERSION}"
+
+    def get(self, key):
+        for extension in self.EXTENSIONS:
+            path = os.path.join(self.cache_dir, key + extension)
+            if not os.path.exists(path):
+                continue
+
+            # Another worker may evict the entry meanwhile, which is a miss like any other
+            try:
+                # Touch the entry so eviction drops the least recently used results first
+                os.utime(path)
+                if extension == ".parquet":
+                    dataset = self.read_dataset(key, path)
+                    if dataset is None:
+                        return None
+                    processor_class = IngestionFactory.get_processor_class(key.split('-', 1)[0])
+                    return processor_class.from_cache(dataset)
+                with open(path, 'rb') as f:
+                    return pickle.load(f)
+            except FileNotFoundError:
+                return None
+        return None
+
+    def put(self, key, result):
+        data_type = key.split('-', 1)[0]
+        if data_type in self.TABULAR_TYPES:
+            processor_class = IngestionFactory.get_processor_class(data_type)
+            self.write_dataset(key, processor_class.to_cache(result))
+        else:
+            path = os.path.join(self.cache_dir, key + ".pkl")
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        self.evict()
+
+    def read_dataset(self, key, path):
+        """The ProcessedDataset stored under key, or None when one of its child tables is gone."""
+        table = pq.read_table(path)
+        metadata = table.schema.metadata or {}
+        checkpoint = metadata.get(self.CHECKPOINT_KEY)
+        linked = json.loads(metadata[self.CHILDREN_KEY]) if self.CHILDREN_KEY in metadata else {"key": None, "children": []}
+
+        children = {}
+        for name in linked["children"]:
+            child_path = self.get_child_path(key, name)
+            try:
+                child_frame = pq.read_table(child_path).to_pandas()
+            except FileNotFoundError:
+                return None
+            os.utime(child_path)
+            keys = child_frame.pop(self.CHILD_KEY_COLUMN)
+            parents = child_frame.pop(self.CHILD_PARENT_COLUMN).to_numpy()
+            children[name] = (child_frame, keys, parents)
+
+        return ProcessedDataset(table.to_pandas(), children, linked["key"], checkpoint=pickle.loads(checkpoint) if checkpoint else None)
+
+    def write_dataset(self, key, dataset):
+        metadata = {}
+        # Kept so an incremental source restored from the cache goes on reading where it stopped
+        checkpoint = getattr(dataset, 'checkpoint', None)
+        if checkpoint is not None:
+            metadata[self.CHECKPOINT_KEY] = pickle.dumps(checkpoint)
+
+        # Child tables are written first, so a reader finding the parent's file finds them too
+        children = getattr(dataset, 'children', None)
+        if children:
+            for name, (child_frame, keys, parents) in children.items():
+                child_frame = child_frame.assign(**{self.CHILD_KEY_COLUMN: keys.set_axis(child_frame.index), self.CHILD_PARENT_COLUMN: parents})
+                self.write_table(child_frame, self.get_child_path(key, name))
+            metadata[self.CHILDREN_KEY] = json.dumps({"key": dataset.key, "children": list(children)})
+
+        frame = dataset.frame if isinstance(dataset, ProcessedDataset) else ProcessedDataset.as_frame(dataset)
+        self.write_table(frame, os.path.join(self.cache_dir, key + ".parquet"), metadata)
+
+    def write_table(self, frame, path, metadata=None):
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if metadata:
+            table = table.replace_schema_metadata({**table.schema.metadata, **metadata})
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        pq.write_table(table, temp_path)
+        # Readers in other processes only ever see a complete file
+        os.replace(temp_path, path)
+
+    def get_child_path(self, key, name):
+        return os.path.join(self.cache_dir, f"{key}.{name}.parquet")
+
+    def invalidate(self, data_type=None):
+        """Remove the cached results of one data type, or of every type when none is given."""
+        for entry in self.list_entries():
+            if data_type is None or entry.name.startswith(f"{data_type}-"):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    def evict(self):
+        # A result and its child tables (key.<name>.parquet) are evicted together, by their latest use.
+        # Workers evict concurrently, so entries can vanish between listing, stat and remove.
+        results = {}
+        for entry in self.list_entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            results.setdefault(entry.name.split('.', 1)[0], []).append((entry.path, stat))
+        ordered = sorted(results.values(), key=lambda files: max(stat.st_mtime for _, stat in files))
+        total_bytes = sum(stat.st_size for files in ordered for _, stat in files)
+
+        for files in ordered:
+            if total_bytes <= self.max_bytes:
+                break
+            for path, stat in files:
+                total_bytes -= stat.st_size
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def list_entries(self):
+        with os.scandir(self.cache_dir) as entries:
+            return [entry for entry in entries if entry.name.endswith(self.EXTENSIONS)]
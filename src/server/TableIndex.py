@@ -0,0 +1,159 @@
+from src.server.DataProcessor.ProcessedDataset import ProcessedDataset
+import numpy as np
+import pandas as pd
+
+class TableIndex:
+    RANGE_OPERATORS = ("gte", "gt", "lte", "lt")
+    REDUCERS = ("sum", "mean", "count", "min", "max", "median", "quantile")
+    # Reducers that also order and average dates; sum needs numbers
+    DATETIME_REDUCERS = ("mean", "min", "max", "median", "quantile")
+
+    def __init__(self, records):
+        # A ProcessedDataset is indexed in place, record lists are converted once
+        self.frame = ProcessedDataset.as_frame(records)
+        # Built lazily per column on first use: value -> row positions, and a sort order for ranges
+        self.equality_indexes = {}
+        self.sorted_indexes = {}
+
+    def query(self, filters=None, ranges=None, offset=0, limit=None, fields=None):
+        """Return (total matching rows, records of the requested page).
+
+        filters maps a column to a list of accepted values, ranges is a list of
+        (column, operator, value) with operator one of RANGE_OPERATORS.
+        """
+        total, page = self.select(filters, ranges, offset, limit, fields)
+        return total, page.to_dict(orient='records')
+
+    def select(self, filters=None, ranges=None, offset=0, limit=None, fields=None):
+        """Like query, but return the requested page as a DataFrame."""
+        positions = self.match(filters, ranges)
+
+        end = None if limit is None else offset + limit
+        if positions is None:
+            total = len(self.frame)
+            page = self.frame.iloc[offset:end]
+        else:
+            total = len(positions)
+            page = self.frame.iloc[positions[offset:end]]
+
+        if fields:
+            self.check_columns(fields)
+            page = page[fields]
+        return total, page
+
+    def aggregate(self, group_by, metric=None, reducer="sum", quantiles=None, filters=None, ranges=None):
+        """Reduce metric per group_by combination over the matching rows, returning one record per group."""
+        if reducer not in self.REDUCERS:
+            raise ValueError(f"Unsupported reducer: {reducer}")
+        if reducer != "count" and not metric:
+            raise ValueError(f"metric is required for {reducer}")
+        if reducer == "quantile" and not quantiles:
+            raise ValueError("q is required for quantile")
+        self.check_columns(group_by + ([metric] if metric else []))
+        if reducer != "count":
+            self.check_metric(metric, reducer)
+
+        positions = self.match(filters, ranges)
+        frame = self.frame if positions is None else self.frame.iloc[positions]
+
+        if not group_by:
+            # A single group holding every matching row
+            frame = frame.assign(_all=0)
+            grouped = frame.groupby("_all")
+        else:
+            grouped = frame.groupby(group_by, sort=True, observed=True)
+
+        if reducer == "count":
+            result = grouped.size().rename("count")
+        elif reducer == "quantile":
+            result = grouped[metric].quantile(quantiles).unstack()
+            result.columns = [f"{metric} q{quantile}" for quantile in result.columns]
+        else:
+            result = grouped[metric].agg(reducer)
+
+        result = result.reset_index()
+        if not group_by:
+            result = result.drop(columns="_all")
+        return result.to_dict(orient='records')
+
+    def check_metric(self, metric, reducer):
+        dtype = self.frame[metric].dtype
+        if pd.api.types.is_numeric_dtype(dtype) or (reducer in self.DATETIME_REDUCERS and pd.api.types.is_datetime64_any_dtype(dtype)):
+            return
+        raise ValueError(f"Cannot {reducer} non-numeric column: {metric}")
+
+    def match(self, filters=None, ranges=None):
+        """Sorted positions of the rows passing every filter, or None when nothing is filtered."""
+        positions = None
+        for column, values in (filters or {}).items():
+            matched = np.unique(np.concatenate([self.lookup(column, value) for value in values]))
+            positions = matched if positions is None else np.intersect1d(positions, matched, assume_unique=True)
+        for column, operator, value in ranges or []:
+            matched = self.range_lookup(column, operator, value)
+            positions = matched if positions is None else np.intersect1d(positions, matched, assume_unique=True)
+        return positions
+
+    def build_indexes(self):
+        """Build the indexes of every categorical, numeric and date column now rather than on first use.
+
+        Other text columns are left lazy, their equality index can hold one entry per row.
+        """
+        for column, dtype in self.frame.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype):
+                self.get_equality_index(column)
+            elif pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype):
+                self.get_sorted_index(column)
+
+    def get_equality_index(self, column):
+        if column not in self.equality_indexes:
+            self.equality_indexes[column] = self.frame.groupby(column, sort=False).indices
+        return self.equality_indexes[column]
+
+    def get_sorted_index(self, column):
+        if column not in self.sorted_indexes:
+            # Missing values never satisfy a range, so they are left out of the sort order
+            series = self.frame[column]
+            present = np.flatnonzero(series.notna().to_numpy())
+            values = series.to_numpy()[present]
+            order = np.argsort(values, kind='stable')
+            self.sorted_indexes[column] = (present[order], values[order])
+        return self.sorted_indexes[column]
+
+    def lookup(self, column, value):
+        self.check_columns([column])
+        return self.get_equality_index(column).get(self.coerce(column, value), np.empty(0, dtype=np.intp))
+
+    def range_lookup(self, column, operator, value):
+        self.check_columns([column])
+        if operator not in self.RANGE_OPERATORS:
+            raise ValueError(f"Unsupported range operator: {operator}")
+        order, sorted_values = self.get_sorted_index(column)
+        value = self.coerce(column, value)
+        if isinstance(value, pd.Timestamp):
+            value = value.to_datetime64()
+
+        if operator in ("gte", "gt"):
+            start = np.searchsorted(sorted_values, value, side='left' if operator == "gte" else 'right')
+            matched = order[start:]
+        else:
+            end = np.searchsorted(sorted_values, value, side='right' if operator == "lte" else 'left')
+            matched = order[:end]
+        return np.sort(matched)
+
+    def coerce(self, column, value):
+        """Convert a query string value to the type of the column it is compared with."""
+        dtype = self.frame[column].dtype
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return pd.Timestamp(value)
+        if pd.api.types.is_bool_dtype(dtype):
+            return value.lower() == 'true'
+        if pd.api.types.is_integer_dtype(dtype):
+            return int(value)
+        if pd.api.types.is_float_dtype(dtype):
+            return float(value)
+        return value
+
+    def check_columns(self, columns):
+        missing = [column for column in columns if column not in self.frame.columns]
+        if missing:
+            raise KeyError(f"Unknown field: {', '.join(missing)}")
@@ -0,0 +1,114 @@
+from collections import Counter
+from contextlib import contextmanager
+import json
+import os
+import sys
+import threading
+import time
+
+class Tracer:
+    """Collect pipeline spans as Chrome trace events and, optionally, sampled call stacks.
+
+    Spans recorded in worker processes are shipped back as plain event dicts and merged with
+    add_events; timestamps come from time.perf_counter, which is system-wide on Linux and macOS.
+    Stack sampling only covers threads of the process that owns the Tracer.
+    """
+    COLLAPSED_EXTENSIONS = (".folded", ".txt")
+
+    def __init__(self, output_path=None, sample_interval=None):
+        if output_path and output_path.endswith(self.COLLAPSED_EXTENSIONS) and not sample_interval:
+            raise ValueError("Collapsed stacks are built from samples, so sample_interval is required")
+
+        self.output_path = output_path
+        self.sample_interval = sample_interval
+        self.lock = threading.Lock()
+        self.events = []
+        # "outer;...;inner" frame stack -> number of samples it was seen in
+        self.stacks = Counter()
+        self.sampler = None
+        self.stop_event = threading.Event()
+
+    @contextmanager
+    def span(self, name, **args):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_events([self.make_event(name, start, time.perf_counter(), args)])
+
+    @staticmethod
+    def make_event(name, start, end, args=None):
+        """A Chrome trace complete event; start and end are time.perf_counter() readings."""
+        return {
+            "name": name, "cat": "pipeline", "ph": "X",
+            "ts": start * 1e6, "dur": (end - start) * 1e6,
+            "pid": os.getpid(), "tid": threading.get_ident(), "args": args or {}
+        }
+
+    def add_events(self, events):
+        with self.lock:
+            self.events.extend(events)
+
+    def start_sampling(self):
+        if not self.sample_interval or self.sampler:
+            return
+        self.stop_event.clear()
+        self.sampler = threading.Thread(target=self.sample, daemon=True)
+        self.sampler.start()
+
+    def stop_sampling(self):
+        if self.sampler:
+            self.stop_event.set()
+            self.sampler.join()
+            self.sampler = None
+
+    def sample(self):
+        sampler_id = threading.get_ident()
+        while not self.stop_event.wait(self.sample_interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == sampler_id:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)})")
+                    frame = frame.f_back
+                with self.lock:
+                    self.stacks[";".join(reversed(frames))] += 1
+
+    def save(self):
+        """Write the trace to output_path: collapsed stacks for .folded/.txt, Chrome trace JSON otherwise.
+
+        A Chrome trace also gets its samples written next to it as <name>.folded.
+        """
+        if not self.output_path:
+            return
+        if self.output_path.endswith(self.COLLAPSED_EXTENSIONS):
+            self.write_collapsed_stacks(self.output_path)
+            return
+
+        self.write_chrome_trace(self.output_path)
+        if self.stacks:
+            self.write_collapsed_stacks(os.path.splitext(self.output_path)[0] + ".folded")
+
+    def write_chrome_trace(self, path):
+        with self.lock:
+            events = sorted(self.events, key=lambda event: event["ts"])
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def write_collapsed_stacks(self, path):
+        with self.lock:
+            stacks = sorted(self.stacks.items())
+        with open(path, 'w') as f:
+            for stack, count in stacks:
+                f.write(f"{stack} {count}\n")
+
+@contextmanager
+def span(tracer, name, **args):
+    """Tracer.span when tracing is on, otherwise a no-op."""
+    if tracer is None:
+        yield
+        return
+    with tracer.span(name, **args):
+        yield
@@ -1,12 +1,14 @@
 from .Visualization import Visualization
+from src.server.DataProcessor.ProcessedDataset import ProcessedDataset
 import matplotlib.pyplot as plt
 import seaborn as sns
-import pandas as pd
 
 class CSVDataVisualization(Visualization):
     def __init__(self, csv_data):
         super().__init__(csv_data)
-        self.csv_data = pd.DataFrame(csv_data)
+        self.csv_data = ProcessedDataset.as_frame(csv_data)
+        # The processor's aggregate cube answers the revenue group-bys without scanning the rows
+        self.cube = getattr(csv_data, 'cube', None)
 
     def plot(self):
         fig1 = self.plot_average_revenue_by_membership_type()
@@ -14,8 +16,13 @@ class CSVDataVisualization(Visualization):
         fig3 = self.plot_total_revenue_by_activity()
         return fig1, fig2, fig3
     
+    def revenue_by(self, column, reducer):
+        if self.cube is not None:
+            return self.cube.aggregate([column], "Revenue (in $)", reducer)
+        return self.csv_data.groupby(column)["Revenue (in $)"].agg(reducer).reset_index()
+
     def plot_average_revenue_by_membership_type(self):
-        revenue_by_membership_type = self.csv_data.groupby("Membership_Type")["Revenue (in $)"].mean().reset_index()
+        revenue_by_membership_type = self.revenue_by("Membership_Type", "mean")
 
         fig, ax = plt.subplots(figsize=(13, 6))
         sns.barplot(x='Membership_Type', y='Revenue (in $)', data=revenue_by_membership_type, ci=None)
@@ -25,7 +32,7 @@ class CSVDataVisualization(Visualization):
         return fig
     
     def plot_total_revenue_by_location(self):
-        revenue_by_location = self.csv_data.groupby("Location")["Revenue (in $)"].sum().reset_index()
+        revenue_by_location = self.revenue_by("Location", "sum")
 
         fig, ax = plt.subplots(figsize=(13, 6))
         sns.barplot(x='Location', y='Revenue (in $)', data=revenue_by_location, ci=None)
@@ -35,7 +42,7 @@ class CSVDataVisualization(Visualization):
         return fig
     
     def plot_total_revenue_by_activity(self):
-        revenue_by_activity = self.csv_data.groupby("Activity")["Revenue (in $)"].sum().reset_index()
+        revenue_by_activity = self.revenue_by("Activity", "sum")
 
         fig, ax = plt.subplots(figsize=(13, 6))
         sns.barplot(x='Activity', y='Revenue (in $)', data=revenue_by_activity, ci=None)
@@ -1,4 +1,5 @@
 from .Visualization import Visualization
+from src.server.DataProcessor.ProcessedDataset import ProcessedDataset
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
@@ -10,16 +11,21 @@ class JSONDataVisualization(Visualization):
 
         companies_list = self.json_data["json_data"]
 
-        self.companies_df = pd.json_normalize(companies_list, sep="_", 
-                                        meta=["Company_Id", "Company_Name", "Industry", "Location", "Revenue"])
+        if isinstance(companies_list, ProcessedDataset):
+            # Both tables are already columnar, so no records are built
+            self.companies_df = companies_list.frame
+            self.employees_df = companies_list.child_frame("Employees")
+        else:
+            self.companies_df = pd.json_normalize(companies_list, sep="_", 
+                                            meta=["Company_Id", "Company_Name", "Industry", "Location", "Revenue"])
 
-        employees_data = []
-        for company in companies_list:
-            for employee in company["Employees"]:
-                employee["Company_Id"] = company["Company_Id"]
-                employees_data.append(employee)
+            employees_data = []
+            for company in companies_list:
+                for employee in company["Employees"]:
+                    employee["Company_Id"] = company["Company_Id"]
+                    employees_data.append(employee)
 
-        self.employees_df = pd.DataFrame(employees_data)
+            self.employees_df = pd.DataFrame(employees_data)
 
     def plot(self):
         pass
@@ -51,7 +57,8 @@ class JSONDataVisualization(Visualization):
         role_salary = filtered_employees.groupby('Role')['Cash_Money'].mean().reset_index()
         role_salary = role_salary.sort_values('Cash_Money', ascending=sort_order).head(top_n)
         
-        sns.barplot(x='Cash_Money', y='Role', data=role_salary)
+        # An explicit order keeps a categorical Role from plotting the roles cut by top_n
+        sns.barplot(x='Cash_Money', y='Role', data=role_salary, order=role_salary['Role'].tolist())
         ax.set_title('Top N Roles by Average Salary')
         ax.set_xlabel('Average Salary (in $)')
         ax.set_ylabel('Role')
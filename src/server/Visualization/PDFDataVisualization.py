@@ -1,12 +1,12 @@
 from .Visualization import Visualization
+from src.server.DataProcessor.ProcessedDataset import ProcessedDataset
 import matplotlib.pyplot as plt
 import seaborn as sns
-import pandas as pd
 
 class PDFDataVisualization(Visualization):
     def __init__(self, pdf_data):
         super().__init__(pdf_data)
-        self.pdf_data = pd.DataFrame(pdf_data)
+        self.pdf_data = ProcessedDataset.as_frame(pdf_data)
 
     def plot(self):
         fig1 = self.plot_quarterly_revenue()
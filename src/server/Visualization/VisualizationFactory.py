@@ -5,7 +5,14 @@ from .PPTXDataVisualization import PPTXDataVisualization
 
 class VisualizationFactory:
     @staticmethod
-    def create_visualization(data_type: str, data):
+    def create_visualization(data_type: str, data, metrics=None):
+        if metrics is None:
+            return VisualizationFactory.build_visualization(data_type, data)
+        with metrics.timer("visualization_build_duration_seconds", {"type": data_type.lower()}):
+            return VisualizationFactory.build_visualization(data_type, data)
+
+    @staticmethod
+    def build_visualization(data_type: str, data):
         if data_type.lower() == 'json':
             return JSONDataVisualization(data)
         elif data_type.lower() == 'csv':
@@ -15,4 +22,4 @@ class VisualizationFactory:
         elif data_type.lower() == 'pptx':
             return PPTXDataVisualization(data)
         else:
-            raise ValueError(f"Unsupported data type: {data_type}. Supported types are 'json', 'csv', 'pdf' and 'pptx'.")
\ No newline at end of file
+            raise ValueError(f"Unsupported data type: {data_type}. Supported types are 'json', 'csv', 'pdf' and 'pptx'.")
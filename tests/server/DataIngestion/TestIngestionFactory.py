@@ -1,10 +1,17 @@
 import pytest
+import json
+import threading
+import time
+import pandas as pd
+from pptx import Presentation
+from pypdf import PdfWriter
 from unittest.mock import Mock, patch, mock_open
 from src.server.DataIngestion.IngestionFactory import IngestionFactory
 from src.server.DataIngestion.JSONDataIngestion import JSONDataIngestion
 from src.server.DataIngestion.CSVDataIngestion import CSVDataIngestion
 from src.server.DataIngestion.PPTXDataIngestion import PPTXDataIngestion
 from src.server.DataIngestion.PDFDataIngestion import PDFDataIngestion
+from src.server.DataProcessor.ProcessedDataset import ProcessedDataset
 
 @pytest.fixture
 def mock_json_data():
@@ -76,6 +83,119 @@ class TestIngestionFactoryUnit:
         assert processor.__class__.__name__ == "CSVDataProcessor"
         assert processor.data == mock_df
 
+    def test_csv_chunked_ingestion(self, tmp_path):
+        file_path = tmp_path / "test.csv"
+        file_path.write_text("Date,Revenue\n2024-01-01,10.5\n2024-01-02,11.0\n2024-01-03,12.5\n")
+
+        ingestor = IngestionFactory.create_ingestion("csv")
+        ingestor.load_data(str(file_path))
+        expected = ingestor.create_processor().process_data()
+
+        chunked_ingestor = IngestionFactory.create_ingestion("csv", chunksize=2)
+        chunked_ingestor.load_data(str(file_path))
+        chunks = list(chunked_ingestor.create_processor().iter_chunks())
+
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        assert ProcessedDataset.concat(chunks) == expected
+        assert "Revenue (in $)" in expected[0]
+
+    def test_csv_arrow_backend(self, tmp_path):
+        file_path = tmp_path / "test.csv"
+        file_path.write_text("Date,Membership_Type,Revenue,Location\n" + "2024-01-01,VIP,10.5,Westside\n2024-01-02,Basic,11.0,Downtown\n" * 50)
+
+        frames = []
+        for backend in ["pandas", "arrow"]:
+            ingestor = IngestionFactory.create_ingestion("csv", backend=backend, block_size=64)
+            ingestor.load_data(str(file_path))
+            frames.append(ingestor.create_processor().process_data().frame)
+
+        assert frames[1].equals(frames[0])
+        assert frames[1]["Location"].cat.categories.tolist() == ["Downtown", "Westside"]
+
+    def test_csv_backends_read_empty_fields_alike(self, tmp_path):
+        file_path = tmp_path / "test.csv"
+        file_path.write_text(
+            "Date,Membership_ID,Membership_Type,Activity,Revenue,Duration (Minutes),Location\n"
+            "2024-01-01,,VIP,Gym,10.5,60,Westside\n"
+            "2024-01-02,M2,Basic,\"\",,30,\n"
+            "2024-01-02,M3,,Pool,11.0,45,Downtown\n"
+        )
+
+        datasets = []
+        for backend in ["pandas", "arrow"]:
+            ingestor = IngestionFactory.create_ingestion("csv", backend=backend)
+            ingestor.load_data(str(file_path))
+            datasets.append(ingestor.create_processor().process_data())
+
+        assert datasets[1].frame.equals(datasets[0].frame)
+        assert datasets[1].frame["Location"].isna().tolist() == [False, True, False]
+        assert datasets[1].cube.base.equals(datasets[0].cube.base)
+
+    def test_csv_invalid_backend(self):
+        with pytest.raises(ValueError):
+            IngestionFactory.create_ingestion("csv", backend="polars")
+        with pytest.raises(ValueError):
+            IngestionFactory.create_ingestion("csv", backend="arrow", chunksize=100)
+        with pytest.raises(ValueError):
+            IngestionFactory.create_ingestion("csv", chunksize=100, incremental=True)
+
+    @pytest.mark.parametrize("backend", ["pandas", "arrow"])
+    def test_csv_incremental_ingestion(self, backend, tmp_path):
+        file_path = tmp_path / "test.csv"
+        file_path.write_text("Date,Membership_Type,Revenue,Location\n2024-01-01,VIP,10.5,Westside\n2024-01-02,Bas")
+
+        ingestor = IngestionFactory.create_ingestion("csv", backend=backend, incremental=True)
+        ingestor.load_data(str(file_path))
+        dataset = ingestor.create_processor().process_data()
+        assert len(dataset) == 1
+
+        with open(file_path, "a") as f:
+            f.write("ic,11.0,Downtown\n2024-01-03,VIP,12.0,Eastside\n")
+        ingestor = IngestionFactory.create_ingestion("csv", backend=backend, incremental=True)
+        assert ingestor.load_appended(str(file_path), dataset.checkpoint)
+        assert ingestor.data["Location"].tolist() == ["Downtown", "Eastside"]
+        assert ingestor.checkpoint.offset == file_path.stat().st_size
+
+        file_path.write_text(file_path.read_text().replace("VIP", "Pro"))
+        assert not ingestor.load_appended(str(file_path), dataset.checkpoint)
+        file_path.write_text("Date,Membership_Type,Revenue,Location\n")
+        assert not ingestor.load_appended(str(file_path), dataset.checkpoint)
+
+    def test_json_streaming_ingestion(self, tmp_path):
+        file_path = tmp_path / "test.json"
+        companies = [{"id": i, "name": f"Company {i}", "employees": [], "performance": {}} for i in range(5)]
+        file_path.write_text(json.dumps({"meta": {"companies": 5}, "companies": companies}, indent=4))
+
+        ingestor = IngestionFactory.create_ingestion("json", stream=True)
+        ingestor.READ_SIZE = 16
+        ingestor.load_data(str(file_path))
+
+        assert list(ingestor.data) == companies
+
+    @pytest.mark.parametrize("document", [
+        {"meta": {"companies": [{"id": 99}], "count": 12345}, "companies": [{"id": 1}, {"id": 2}]},
+        {"companies": [{"id": 1}, {"id": 2}], "meta": {"companies": [{"id": 99}]}},
+        [{"id": 1}, {"id": 2}]
+    ])
+    def test_json_streaming_reads_top_level_companies(self, tmp_path, document):
+        file_path = tmp_path / "test.json"
+        file_path.write_text(json.dumps(document))
+
+        ingestor = IngestionFactory.create_ingestion("json", stream=True)
+        ingestor.READ_SIZE = 4
+        ingestor.load_data(str(file_path))
+
+        assert list(ingestor.data) == [{"id": 1}, {"id": 2}]
+
+    def test_json_streaming_without_companies(self, tmp_path):
+        file_path = tmp_path / "test.json"
+        file_path.write_text(json.dumps({"meta": {"companies": [{"id": 99}]}}))
+
+        ingestor = IngestionFactory.create_ingestion("json", stream=True)
+        ingestor.load_data(str(file_path))
+        with pytest.raises(ValueError):
+            list(ingestor.data)
+
     @patch('src.server.DataIngestion.PPTXDataIngestion.Presentation')
     def test_pptx_ingestion(self, mock_presentation, tmp_path):
         mock_pres = Mock()
@@ -110,6 +230,101 @@ class TestIngestionFactoryUnit:
         assert processor.__class__.__name__ == "PDFDataProcessor"
         assert processor.data == mock_table
 
+    def test_pptx_xml_backend_matches_python_pptx(self, tmp_path):
+        presentation = Presentation()
+        slide = presentation.slides.add_slide(presentation.slide_layouts[5])
+        slide.shapes.title.text = "Total Revenue: $10,400,000"
+        text_frame = slide.shapes.add_textbox(0, 0, 100, 100).text_frame
+        text_frame.text = "Gym: 40%"
+        text_frame.add_paragraph().text = "Top Location:\vDowntown"
+        table = slide.shapes.add_table(2, 2, 0, 0, 100, 100).table
+        for row_idx, row in enumerate([["Quarter", "Revenue"], ["Q1", "2,300,000"]]):
+            for col_idx, value in enumerate(row):
+                table.cell(row_idx, col_idx).text = value
+        file_path = tmp_path / "test.pptx"
+        presentation.save(str(file_path))
+
+        ingestor = IngestionFactory.create_ingestion("pptx", backend="xml")
+        ingestor.load_data(str(file_path))
+        expected = ingestor.processor_class(None).collect_content(Presentation(str(file_path)))
+
+        assert ingestor.data.texts == expected.texts
+        assert ingestor.data.tables == expected.tables == [[["Quarter", "Revenue"], ["Q1", "2,300,000"]]]
+
+    def test_pptx_invalid_backend(self):
+        with pytest.raises(ValueError) as exc_info:
+            IngestionFactory.create_ingestion("pptx", backend="odp")
+        assert str(exc_info.value) == "Unsupported PPTX backend: odp"
+
+    @patch('src.server.DataIngestion.PDFDataIngestion.tabula')
+    def test_pdf_all_tables_ingestion(self, mock_tabula, tmp_path):
+        def read_pdf(file_path, pages):
+            return [pd.DataFrame({"Year": [2023], "Quarter": [f"Q{pages}"], "Revenue (in $)": ["1,000"]})]
+        mock_tabula.read_pdf.side_effect = read_pdf
+
+        file_path = tmp_path / "report.pdf"
+        writer = PdfWriter()
+        for _ in range(3):
+            writer.add_blank_page(width=612, height=792)
+        writer.write(str(file_path))
+
+        ingestor = IngestionFactory.create_ingestion("pdf", all_tables=True, max_workers=2)
+        ingestor.load_data(str(file_path))
+
+        assert [(table.file_path, table.page) for table in ingestor.data] == [(str(file_path), page) for page in [1, 2, 3]]
+
+        records = ingestor.create_processor().process_data()
+        assert len(records) == 3
+        assert records[1] == {"Quarter": "2023_Q2", "Revenue (in $)": 1000.0, "Source": "report.pdf", "Page": 2}
+
+    @patch('src.server.DataIngestion.PDFDataIngestion.tabula_started', False)
+    @patch('src.server.DataIngestion.PDFDataIngestion.tabula')
+    def test_pdf_first_tabula_call_runs_alone(self, mock_tabula, tmp_path):
+        lock = threading.Lock()
+        started = threading.Event()
+        calls = []
+        overlapping = []
+
+        def read_pdf(file_path, pages):
+            with lock:
+                calls.append(pages)
+                first = len(calls) == 1
+            if first:
+                # Stands in for the JVM start-up
+                time.sleep(0.05)
+                started.set()
+            elif not started.is_set():
+                overlapping.append(pages)
+            return [pd.DataFrame({"Year": [2023], "Quarter": [f"Q{pages}"], "Revenue (in $)": ["1,000"]})]
+        mock_tabula.read_pdf.side_effect = read_pdf
+
+        file_path = tmp_path / "report.pdf"
+        writer = PdfWriter()
+        for _ in range(4):
+            writer.add_blank_page(width=612, height=792)
+        writer.write(str(file_path))
+
+        ingestor = IngestionFactory.create_ingestion("pdf", all_tables=True, max_workers=4)
+        ingestor.load_data(str(file_path))
+
+        assert sorted(calls) == [1, 2, 3, 4]
+        assert overlapping == []
+
+    @patch('src.server.DataIngestion.PDFDataIngestion.tabula')
+    def test_pdf_page_count_from_page_tree(self, mock_tabula, tmp_path):
+        file_path = tmp_path / "report.pdf"
+        writer = PdfWriter()
+        writer.add_blank_page(width=612, height=792)
+        writer.add_blank_page(width=612, height=792)
+        writer.write(str(file_path))
+        # Appended bytes holding a page object the page tree does not reference
+        with open(file_path, "ab") as f:
+            f.write(b"\n99 0 obj << /Type /Page >> endobj\n")
+
+        assert PDFDataIngestion().list_pages(str(file_path)) == [1, 2]
+        (tmp_path / "broken.pdf").write_bytes(b"not a pdf")
+        assert PDFDataIngestion().list_pages(str(tmp_path / "broken.pdf")) == [None]
+
 # Integration Tests
 class TestIngestionFactoryIntegration:
     @pytest.mark.parametrize("data_type, class_type", [
@@ -0,0 +1,119 @@
+import pytest
+import pandas as pd
+from src.server.APIHandler import APIHandler
+from src.server.DataProcessor.CSVDataProcessor import CSVDataProcessor
+from src.server.DataProcessor.ProcessedDataset import ProcessedDataset
+from src.server.DataSource import DataSource
+from src.server.ResultCache import ResultCache
+from src.server.TableIndex import TableIndex
+from src.server.Visualization.VisualizationFactory import VisualizationFactory
+
+def activity_frame():
+    return pd.DataFrame({
+        "Date": ["2024-01-05", "2024-01-05", "2024-01-21", "2024-02-03", "2024-04-10", "2024-04-11"],
+        "Membership_ID": ["M1", "M2", "M3", "M4", "M5", "M6"],
+        "Membership_Type": ["Basic", "VIP", "Basic", "Basic", "VIP", "Student"],
+        "Activity": ["Gym", "Pool", "Gym", "Yoga", "Gym", "Pool"],
+        "Revenue": [100.0, 50.0, 25.5, None, 80.0, 10.0],
+        "Duration (Minutes)": [60, 30, 45, 60, 90, 30],
+        "Location": ["Downtown", "Eastside", "Downtown", "Westside", "Eastside", "Downtown"]
+    })
+
+@pytest.fixture
+def dataset():
+    return CSVDataProcessor(activity_frame()).process_data()
+
+# Unit Tests
+class TestAggregateCube:
+    @pytest.mark.parametrize("group_by, metric, reducer, filters, ranges", [
+        (["Location"], "Revenue (in $)", "sum", None, None),
+        (["Membership_Type", "Activity"], "Revenue (in $)", "mean", None, None),
+        (["Activity"], "Duration (Minutes)", "sum", {"Location": ["Downtown", "Eastside"]}, None),
+        ([], None, "count", None, [("Date", "gte", "2024-01-21"), ("Date", "lt", "2024-04-11")]),
+        (["Date"], "Duration (Minutes)", "mean", None, None)
+    ])
+    def test_matches_row_scan(self, dataset, group_by, metric, reducer, filters, ranges):
+        cube = dataset.cube
+        assert cube.supports(group_by, metric, reducer, filters, ranges)
+
+        # Compared as frames, which treat the NaN mean of a group without revenue as equal
+        expected = pd.DataFrame(TableIndex(dataset).aggregate(group_by, metric, reducer, None, filters, ranges))
+        assert pd.DataFrame(cube.aggregate(group_by, metric, reducer, filters, ranges).to_dict(orient='records')).equals(expected)
+
+    def test_date_levels(self, dataset):
+        rows = dataset.cube.aggregate(["Date:month"], "Revenue (in $)", "sum").to_dict(orient='records')
+        assert rows == [
+            {"Date:month": pd.Timestamp("2024-01-01"), "Revenue (in $)": 175.5},
+            {"Date:month": pd.Timestamp("2024-02-01"), "Revenue (in $)": 0.0},
+            {"Date:month": pd.Timestamp("2024-04-01"), "Revenue (in $)": 90.0}
+        ]
+
+        rows = dataset.cube.aggregate(["Date:quarter", "Location"], None, "count").to_dict(orient='records')
+        assert rows[0] == {"Date:quarter": pd.Timestamp("2024-01-01"), "Location": "Downtown", "count": 2}
+        assert dataset.cube.aggregate(["Date:week"], None, "count")["Date:week"].dt.dayofweek.eq(0).all()
+
+    def test_ranges_skip_missing_values(self, dataset):
+        index = TableIndex(dataset)
+        client = APIHandler({"json_data": []}, dataset, [], {}).app.test_client()
+
+        # Row 3 has no revenue and matches no range
+        assert index.range_lookup("Revenue (in $)", "gte", "26").tolist() == [0, 1, 4]
+        assert index.range_lookup("Revenue (in $)", "lt", "26").tolist() == [2, 5]
+        assert client.get('/api/aggregate/csv?reducer=count&Revenue (in $)__gt=0').get_json()["rows"] == [{"count": 5}]
+
+    def test_unsupported_queries(self, dataset):
+        cube = dataset.cube
+        assert not cube.supports(["Location"], "Revenue (in $)", "median")
+        assert not cube.supports(["Membership_ID"], None, "count")
+        assert not cube.supports(["Date:year"], None, "count")
+        assert not cube.supports([], None, "count", {"Membership_ID": ["M1"]})
+        assert not cube.supports([], "Revenue (in $)", "sum", None, [("Revenue (in $)", "gt", "1")])
+        with pytest.raises(ValueError):
+            cube.aggregate([], None, "median")
+
+    def test_date_ranges_need_whole_days(self):
+        frame = activity_frame().assign(Date=["2024-01-05 10:30:00"] * 6)
+        frame["Date"] = pd.to_datetime(frame["Date"])
+        dataset = CSVDataProcessor.add_cube(ProcessedDataset(CSVDataProcessor.SCHEMA.apply(frame)))
+
+        assert dataset.cube.supports(["Date"], None, "count")
+        assert not dataset.cube.supports([], None, "count", None, [("Date", "gte", "2024-01-05")])
+
+    def test_date_ranges_skip_missing_dates(self):
+        frame = activity_frame()
+        frame.loc[[1, 3], "Date"] = None
+        dataset = CSVDataProcessor(frame).process_data()
+        ranges = [("Date", "gte", "2024-01-01")]
+
+        expected = TableIndex(dataset).aggregate(["Location"], None, "count", None, None, ranges)
+        assert dataset.cube.aggregate(["Location"], None, "count", None, ranges).to_dict(orient='records') == expected
+        assert sum(row["count"] for row in expected) == 4
+
+    def test_merged_sources(self, dataset):
+        other = CSVDataProcessor(activity_frame().assign(Location="Northside")).process_data()
+        merged = CSVDataProcessor.merge_results([dataset, other])
+
+        assert merged.cube.aggregate(["Location"], None, "count").to_dict(orient='records') == TableIndex(merged).aggregate(["Location"], None, "count")
+        assert CSVDataProcessor(activity_frame().drop(columns="Activity")).process_data().cube is None
+
+    def test_restored_from_cache(self, dataset, tmp_path):
+        file_path = tmp_path / "activity.csv"
+        file_path.write_text("Date\n")
+        cache = ResultCache(str(tmp_path / "cache"))
+        key = cache.get_key(DataSource("csv", str(file_path)))
+
+        cache.put(key, dataset)
+        cached = cache.get(key)
+        assert cached.cube.aggregate(["Location"], "Revenue (in $)", "sum").equals(dataset.cube.aggregate(["Location"], "Revenue (in $)", "sum"))
+
+    def test_api_and_visualization_use_cube(self, dataset):
+        client = APIHandler({"json_data": []}, dataset, [], {}).app.test_client()
+        response = client.get('/api/aggregate/csv?group_by=Date:month,Location&metric=Revenue (in $)&reducer=mean&Location=Eastside')
+        assert [row["Revenue (in $)"] for row in response.get_json()["rows"]] == [50.0, 80.0]
+        assert client.get('/api/aggregate/csv?group_by=Location&metric=Revenue (in $)&reducer=median').get_json()["rows"][0] == {"Location": "Downtown", "Revenue (in $)": 25.5}
+
+        visualization = VisualizationFactory.create_visualization('csv', dataset)
+        assert visualization.revenue_by("Location", "sum").to_dict(orient='records') == TableIndex(dataset).aggregate(["Location"], "Revenue (in $)", "sum")
+
+if __name__ == '__main__':
+    pytest.main([__file__])
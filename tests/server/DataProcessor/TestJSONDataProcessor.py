@@ -0,0 +1,83 @@
+import pytest
+import time
+import pandas as pd
+from src.server.DataProcessor.JSONDataProcessor import JSONDataProcessor
+
+def build_frames(num_employees, employees_per_company=10):
+    num_companies = max(num_employees // employees_per_company, 1)
+    company_ids = list(range(1, num_companies + 1))
+
+    companies_df = pd.DataFrame({
+        "Company_Id": company_ids,
+        "Company_Name": [f"Company {i}" for i in company_ids],
+        "Industry": "Sports and Leisure",
+        "Revenue": 1000000.0,
+        "Location": "North America"
+    })
+    employees_df = pd.DataFrame({
+        "Employee_Id": [f"E{i}" for i in range(num_employees)],
+        "Role": "Personal Trainer",
+        "Cash_Money": 45000,
+        "Company_Id": [company_ids[i % num_companies] for i in range(num_employees)]
+    })
+    performance_df = pd.DataFrame({
+        "Quarter": ["2023_Q1", "2023_Q2"] * num_companies,
+        "Revenue (in $)": 500000.0,
+        "Profit_Margin": 0.2,
+        "Company_Id": [company_id for company_id in company_ids for _ in range(2)]
+    })
+    return companies_df, employees_df, performance_df
+
+# Unit Tests
+class TestJSONDataProcessor:
+    def test_jsonify_nests_by_company(self):
+        companies_df, employees_df, performance_df = build_frames(5, employees_per_company=2)
+        result = JSONDataProcessor({}).jsonify(companies_df, employees_df, performance_df)
+
+        companies = result["json_data"]
+        assert [company["Company_Id"] for company in companies] == [1, 2]
+        assert [employee["Employee_Id"] for employee in companies[0]["Employees"]] == ["E0", "E2", "E4"]
+        assert "Company_Id" not in companies[0]["Employees"][0]
+        assert [row["Quarter"] for row in companies[1]["Performance"]] == ["2023_Q1", "2023_Q2"]
+
+    def test_jsonify_company_without_employees(self):
+        companies_df, employees_df, performance_df = build_frames(2, employees_per_company=2)
+        companies_df = pd.concat([companies_df, companies_df.assign(Company_Id=99)], ignore_index=True)
+        result = JSONDataProcessor({}).jsonify(companies_df, employees_df, performance_df)
+
+        assert result["json_data"][1]["Employees"] == []
+        assert result["json_data"][1]["Performance"] == []
+
+    def test_merge_sources_with_overlapping_ids(self):
+        first = JSONDataProcessor({}).jsonify(*build_frames(4, employees_per_company=2))
+        second = JSONDataProcessor({}).jsonify(*build_frames(6, employees_per_company=2))
+        companies = JSONDataProcessor.merge_results([first, second])["json_data"]
+
+        assert [company["Company_Id"] for company in companies] == [1, 2, 1, 2, 3]
+        assert [len(company["Employees"]) for company in companies] == [2, 2, 2, 2, 2]
+        assert [len(company["Performance"]) for company in companies] == [2, 2, 2, 2, 2]
+        assert companies[2] == companies.to_records()[2]
+        assert len(companies.child_frame("Employees")) == 10
+
+# Benchmark Tests
+@pytest.mark.benchmark
+class TestJSONDataProcessorBenchmark:
+    def test_jsonify_scales_linearly(self):
+        processor = JSONDataProcessor({})
+        timings = {}
+
+        for num_employees in [100, 1000, 10000, 100000, 1000000]:
+            frames = build_frames(num_employees)
+            # jsonify only links the tables, the nested records are built when they are read
+            start = time.perf_counter()
+            processor.jsonify(*frames)['json_data'].to_records()
+            timings[num_employees] = time.perf_counter() - start
+            print(f"jsonify and to_records {num_employees:>8} employees: {timings[num_employees]:.3f}s")
+
+        # Per-employee cost at 1M should stay close to the cost at 10k
+        per_employee_small = timings[10000] / 10000
+        per_employee_large = timings[1000000] / 1000000
+        assert per_employee_large < per_employee_small * 3
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,45 @@
+import pytest
+from src.server.DataProcessor.PPTXDataProcessor import PPTXDataProcessor, PPTXContent
+
+@pytest.fixture
+def pptx_content():
+    texts = [
+        "FitPro: Annual Summary 2023",
+        "Total Revenue: $10,400,000\nTotal Memberships Sold: 1,520\nTop Location: Downtown",
+        "Gym: 40%\nPool: 25%\nTennis Court: 15%\nPersonal Training: 20%"
+    ]
+    tables = [[
+        ["Quarter", "Revenue", "Memberships Sold", "Avg Duration (Minutes)"],
+        ["Q1", "2,300,000", "320", "90"],
+        ["Q2", "2,500,000", "400", "95"]
+    ]]
+    return PPTXContent(texts, tables)
+
+# Unit Tests
+class TestPPTXDataProcessor:
+    def test_process_content(self, pptx_content):
+        data = PPTXDataProcessor(pptx_content).process_data()
+
+        assert data["FitPro: Annual Summary 2023"]["Key Highlights"] == {
+            "Total Revenue (in $)": 10400000.0,
+            "Total Memberships Sold": 1520,
+            "Top Location": "Downtown"
+        }
+        assert data["Revenue Breakdown by Activity"]["Revenue Distribution"] == {
+            "Gym": 40.0, "Pool": 25.0, "Tennis Court": 15.0, "Personal Training": 20.0
+        }
+        assert data["Quarterly Metrics"]["Q2"] == {"Revenue": 2500000.0, "Memberships Sold": 400, "Avg Duration (Minutes)": 95}
+        assert data["Quarterly Metrics"]["Q3"]["Revenue"] is None
+
+    def test_match_highlights_missing_value(self):
+        values = PPTXDataProcessor(None).match_highlights("Gym: 40%")
+        assert values["gym_revenue"] == "40"
+        assert values["pool_revenue"] is None
+
+    def test_process_batch(self, pptx_content):
+        results = PPTXDataProcessor([pptx_content, pptx_content]).process_data()
+        assert len(results) == 2
+        assert results[0] == results[1]
+
+if __name__ == '__main__':
+    pytest.main([__file__])
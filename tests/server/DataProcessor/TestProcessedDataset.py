@@ -0,0 +1,93 @@
+import pytest
+import pandas as pd
+from src.server.APIHandler import APIHandler
+from src.server.DataProcessor.ProcessedDataset import ProcessedDataset
+from src.server.Visualization.VisualizationFactory import VisualizationFactory
+
+@pytest.fixture
+def dataset():
+    return ProcessedDataset(pd.DataFrame({
+        "Date": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]),
+        "Location": ["Downtown", "Eastside", "Downtown"],
+        "Revenue (in $)": [100.0, 50.0, 25.0]
+    }))
+
+@pytest.fixture
+def companies():
+    employees = pd.DataFrame({"Employee_Id": ["E1", "E2", "E3"], "Role": ["Trainer", "Manager", "Trainer"], "Cash_Money": [40000, 70000, 50000], "Company_Name": ["FitPro", "FitPro", "GymCo"]})
+    performance = pd.DataFrame({"Quarter": ["2023_Q1"], "Company_Id": [2]})
+    return ProcessedDataset(
+        pd.DataFrame({"Company_Id": [1, 2, 3], "Company_Name": ["FitPro", "GymCo", "Empty"]}),
+        {"Employees": (employees, pd.Series([1, 1, 2])), "Performance": (performance, performance["Company_Id"])},
+        key="Company_Id"
+    )
+
+# Unit Tests
+class TestProcessedDataset:
+    def test_record_view(self, dataset):
+        dataset.BATCH_ROWS = 2
+        records = list(dataset)
+
+        assert len(dataset) == 3
+        assert records[1] == {"Date": pd.Timestamp("2024-01-02"), "Location": "Eastside", "Revenue (in $)": 50.0}
+        assert dataset[-1] == records[2]
+        assert dataset == records
+        assert dataset.to_dict(orient='list')["Location"] == ["Downtown", "Eastside", "Downtown"]
+        with pytest.raises(IndexError):
+            dataset[3]
+
+    def test_slice_shares_columns(self, dataset):
+        assert isinstance(dataset[1:], ProcessedDataset)
+        assert dataset[1:] == list(dataset)[1:]
+        assert ProcessedDataset.as_frame(dataset) is dataset.frame
+
+    def test_nested_children(self, companies):
+        records = companies.to_records()
+
+        assert [employee["Employee_Id"] for employee in records[0]["Employees"]] == ["E1", "E2"]
+        assert "Company_Id" not in records[0]["Employees"][0]
+        assert records[1]["Performance"] == [{"Quarter": "2023_Q1", "Company_Id": 2}]
+        assert records[2]["Employees"] == [] and companies[2] == records[2]
+        assert companies.to_frame()["Employees"].tolist() == [record["Employees"] for record in records]
+
+    def test_slice_with_children(self, companies):
+        records = companies.to_records()
+
+        assert isinstance(companies[1:], ProcessedDataset)
+        assert companies[1:] == records[1:]
+        assert companies[::-1] == records[::-1]
+        assert companies[1:2].child_frame("Employees")["Company_Id"].tolist() == [2]
+        assert [companies[index] for index in range(-3, 3)] == records + records
+
+    def test_child_frame(self, companies):
+        employees = companies.child_frame("Employees")
+        assert employees["Company_Id"].tolist() == [1, 1, 2]
+        assert companies.child_frame("Performance") is companies.children["Performance"][0]
+
+    def test_concat(self, dataset, companies):
+        merged = ProcessedDataset.concat([dataset, [{"Location": "Westside", "Revenue (in $)": 10.0}]])
+        assert [record["Location"] for record in merged] == ["Downtown", "Eastside", "Downtown", "Westside"]
+        assert ProcessedDataset.concat([]) == []
+
+        merged = ProcessedDataset.concat([companies, companies])
+        assert len(merged) == 6
+        assert len(merged.child_frame("Employees")) == 6
+
+    def test_api_serializes_records(self, dataset, companies):
+        client = APIHandler({"json_data": companies}, dataset, [], {}).app.test_client()
+
+        assert client.get('/api/data/csv').get_json()["csv_data"][0]["Location"] == "Downtown"
+        assert client.get('/api/data/json').get_json()["json_data"][0]["Employees"][1]["Role"] == "Manager"
+        assert client.get('/api/data/employees?Company_Id=2').get_json()["employees_data"] == [
+            {"Employee_Id": "E3", "Role": "Trainer", "Cash_Money": 50000, "Company_Name": "GymCo", "Company_Id": 2}
+        ]
+
+    def test_visualizations_share_columns(self, dataset, companies):
+        assert VisualizationFactory.create_visualization('csv', dataset).csv_data is dataset.frame
+
+        visualization = VisualizationFactory.create_visualization('json', {"json_data": companies})
+        assert visualization.companies_df is companies.frame
+        assert visualization.employees_df["Company_Id"].tolist() == [1, 1, 2]
+
+if __name__ == '__main__':
+    pytest.main([__file__])
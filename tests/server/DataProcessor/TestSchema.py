@@ -0,0 +1,88 @@
+import pytest
+import numpy as np
+import pandas as pd
+from src.server.APIHandler import APIHandler
+from src.server.DataIngestion.IngestionFactory import IngestionFactory
+from src.server.DataProcessor.Schema import Column, Schema
+
+CSV_TEXT = (
+    "Date,Membership_ID,Membership_Type,Activity,Revenue,Duration (Minutes),Location\n"
+    "2024-01-21,M001,Basic,Gym,113.82,60,Downtown\n"
+    "2024-01-05,M002,VIP,Pool,104.74,30,Eastside\n"
+    "2024-01-07,M003,Basic,Yoga,80.5,45,Downtown\n"
+)
+
+def process_csv(tmp_path, **options):
+    file_path = tmp_path / "activity.csv"
+    file_path.write_text(CSV_TEXT)
+    ingestor = IngestionFactory.create_ingestion("csv", **options)
+    ingestor.load_data(str(file_path))
+    return ingestor.create_processor().process_data()
+
+# Unit Tests
+class TestSchema:
+    def test_column_conversions(self):
+        frame = pd.DataFrame({
+            "amount": ["1,000", "2,500", None],
+            "count": [1, 2, 3],
+            "day": ["2024-01-02", None, "2024-01-04"],
+            "kind": ["a", "b", "a"]
+        })
+        frame = Schema({
+            "amount": Column("float", thousands=",", fill="median"),
+            "count": Column("int"),
+            "day": Column("datetime", date_format="%Y-%m-%d", fill="median"),
+            "kind": Column("category")
+        }).apply(frame)
+
+        assert frame["amount"].tolist() == [1000.0, 2500.0, 1750.0]
+        assert frame["count"].dtype == np.int8
+        assert frame["day"].tolist() == [pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-03"), pd.Timestamp("2024-01-04")]
+        assert isinstance(frame["kind"].dtype, pd.CategoricalDtype)
+
+    def test_select_and_rename(self):
+        frame = pd.DataFrame({"b": [1], "a": [2], "extra": [3]})
+
+        assert Schema({"a": Column(rename="A"), "b": Column()}, select=True).apply(frame.copy()).columns.tolist() == ["A", "b"]
+        assert Schema({"a": Column(rename="A")}).apply(frame.copy()).columns.tolist() == ["b", "A", "extra"]
+        assert Schema({"a": Column("category"), "b": Column("str"), "c": Column("int")}).read_options() == {"dtype": {"a": "category", "b": "str"}}
+
+    def test_invalid_column(self):
+        with pytest.raises(ValueError):
+            Column("decimal")
+        with pytest.raises(ValueError):
+            Column("float", fill="mean")
+
+    def test_csv_parsed_with_schema(self, tmp_path):
+        frame = process_csv(tmp_path).frame
+
+        assert frame.columns.tolist() == ["Date", "Membership_ID", "Membership_Type", "Activity", "Revenue (in $)", "Duration (Minutes)", "Location"]
+        assert isinstance(frame["Location"].dtype, pd.CategoricalDtype)
+        assert frame["Duration (Minutes)"].dtype == np.int8
+        assert pd.api.types.is_datetime64_any_dtype(frame["Date"])
+
+    def test_chunks_stay_categorical(self, tmp_path):
+        dataset = process_csv(tmp_path, chunksize=2)
+
+        whole = process_csv(tmp_path)
+        assert isinstance(dataset.frame["Activity"].dtype, pd.CategoricalDtype)
+        assert dataset == whole.to_records()
+        assert dataset.cube.aggregate(["Date:month", "Location"], "Revenue (in $)", "sum").equals(whole.cube.aggregate(["Date:month", "Location"], "Revenue (in $)", "sum"))
+
+    def test_query_categorical_columns(self, tmp_path):
+        client = APIHandler({"json_data": []}, process_csv(tmp_path), [], {}).app.test_client()
+
+        assert client.get('/api/data/csv?Location=Downtown').get_json()["total"] == 2
+        assert client.get('/api/aggregate/csv?group_by=Location&reducer=count').get_json()["rows"] == [
+            {"Location": "Downtown", "count": 2},
+            {"Location": "Eastside", "count": 1}
+        ]
+        assert client.get('/api/data/csv?Duration (Minutes)__gte=1000').get_json()["total"] == 0
+
+    def test_memory_report(self, tmp_path):
+        report = process_csv(tmp_path).memory_report("csv")
+        assert set(report) == {"csv"}
+        assert report["csv"]["Duration (Minutes)"] == 3
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,274 @@
+import pytest
+import gzip
+import io
+import json
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.server.APIHandler import APIHandler
+
+@pytest.fixture
+def api_handler():
+    return APIHandler(
+        {"json_data": [{"Company_Id": 1, "Company_Name": "FitPro", "Employees": [
+            {"Role": "Trainer", "Cash_Money": 40000, "Company_Name": "FitPro"},
+            {"Role": "Trainer", "Cash_Money": 50000, "Company_Name": "FitPro"},
+            {"Role": "Manager", "Cash_Money": 70000, "Company_Name": "FitPro"}
+        ], "Performance": []}]},
+        [{"Location": "Downtown", "Revenue (in $)": 100.0}, {"Location": "Eastside", "Revenue (in $)": 50.0}],
+        [{"Quarter": "2023_Q1", "Revenue (in $)": 1000.0}],
+        {"Quarterly Metrics": {"Q1": {"Revenue": 100.0}}}
+    )
+
+@pytest.fixture
+def client(api_handler):
+    return api_handler.app.test_client()
+
+# Unit Tests
+class TestAPIHandler:
+    def test_get_data(self, client):
+        response = client.get('/api/data')
+        assert response.status_code == 200
+        assert response.get_json()["json_data"][0]["Company_Name"] == "FitPro"
+        assert len(response.get_json()["csv_data"]) == 2
+
+    @pytest.mark.parametrize("file_type, key", [
+        ("json", "json_data"),
+        ("csv", "csv_data"),
+        ("pdf", "pdf_data"),
+        ("pptx", "pptx_data")
+    ])
+    def test_get_data_by_type(self, client, file_type, key):
+        response = client.get(f'/api/data/{file_type}')
+        assert response.status_code == 200
+        assert key in response.get_json()
+
+    def test_get_data_invalid_type(self, client):
+        response = client.get('/api/data/xml')
+        assert response.status_code == 404
+        assert response.get_json() == {"error": "Invalid file type"}
+
+    def test_update_data_swaps_snapshot(self, api_handler, client):
+        previous = api_handler.datasets
+        api_handler.update_data("pdf", [{"Quarter": "2024_Q1", "Revenue (in $)": 2000.0}])
+
+        assert previous["pdf"] == [{"Quarter": "2023_Q1", "Revenue (in $)": 1000.0}]
+        assert api_handler.datasets is not previous
+        assert client.get('/api/data/pdf').get_json() == {"pdf_data": [{"Quarter": "2024_Q1", "Revenue (in $)": 2000.0}]}
+
+    def test_etag_not_modified(self, client):
+        response = client.get('/api/data/csv')
+        etag = response.headers['ETag']
+
+        response = client.get('/api/data/csv', headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+
+    def test_serializes_once_per_version(self, api_handler, client):
+        client.get('/api/data/pdf')
+        cached = api_handler.response_cache['pdf']
+        client.get('/api/data/pdf')
+        assert api_handler.response_cache['pdf'] is cached
+
+        etag = client.get('/api/data/pdf').headers['ETag']
+        api_handler.update_data("pdf", [{"Quarter": "2024_Q1", "Revenue (in $)": 2000.0}])
+        response = client.get('/api/data/pdf', headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert api_handler.response_cache['pdf'] is not cached
+
+    def test_warm_caches(self, api_handler, client):
+        api_handler.warm_caches()
+        cached = dict(api_handler.response_cache)
+        index = api_handler.table_indexes['csv'][1]
+        arrow_body = api_handler.columnar_cache[('csv', 'arrow')][1]
+
+        assert set(cached) == {'all', 'json', 'csv', 'pdf', 'pptx'}
+        assert set(api_handler.table_indexes) == set(APIHandler.TABLES)
+        assert 'Revenue (in $)' in index.sorted_indexes
+        assert client.get('/api/data/csv').data == cached['csv'].body
+        assert client.get('/api/data/csv?format=arrow').data is arrow_body
+        assert client.get('/api/data/csv?Revenue (in $)__gte=60').get_json()["total"] == 1
+        assert api_handler.table_indexes['csv'][1] is index
+
+    def test_gzip_response(self, client):
+        response = client.get('/api/data', headers={"Accept-Encoding": "gzip"})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert response.headers['ETag'].endswith('-gzip"')
+        assert json.loads(gzip.decompress(response.data)) == client.get('/api/data').get_json()
+
+    def test_query_limit_offset_and_fields(self, client):
+        response = client.get('/api/data/csv?limit=1&offset=1&fields=Location')
+        assert response.get_json() == {"csv_data": [{"Location": "Eastside"}], "total": 2, "offset": 1, "next_cursor": None}
+
+    def test_query_filters(self, client):
+        assert client.get('/api/data/csv?Location=Downtown').get_json()["csv_data"] == [{"Location": "Downtown", "Revenue (in $)": 100.0}]
+        assert client.get('/api/data/csv?Revenue (in $)__lt=100').get_json()["total"] == 1
+        assert client.get('/api/data/csv?Location=Downtown&Location=Eastside').get_json()["total"] == 2
+        assert client.get('/api/data/json?Company_Id=1&fields=Company_Name').get_json()["json_data"] == [{"Company_Name": "FitPro"}]
+
+    def test_query_cursor(self, api_handler, client):
+        first_page = client.get('/api/data/csv?limit=1').get_json()
+        assert first_page["csv_data"] == [{"Location": "Downtown", "Revenue (in $)": 100.0}]
+
+        second_page = client.get(f'/api/data/csv?cursor={first_page["next_cursor"]}').get_json()
+        assert second_page["csv_data"] == [{"Location": "Eastside", "Revenue (in $)": 50.0}]
+        assert second_page["next_cursor"] is None
+
+        api_handler.update_data("csv", [])
+        assert client.get(f'/api/data/csv?cursor={first_page["next_cursor"]}').status_code == 410
+
+    def test_query_cursor_keeps_filters(self, api_handler, client):
+        api_handler.update_data("csv", [{"Location": location, "Revenue (in $)": float(i)} for i, location in enumerate(["Downtown", "Eastside", "Downtown", "Downtown"])])
+        first_page = client.get('/api/data/csv?Location=Downtown&fields=Revenue (in $)&limit=2').get_json()
+        assert first_page["csv_data"] == [{"Revenue (in $)": 0.0}, {"Revenue (in $)": 2.0}]
+
+        second_page = client.get(f'/api/data/csv?cursor={first_page["next_cursor"]}').get_json()
+        assert second_page == {"csv_data": [{"Revenue (in $)": 3.0}], "total": 3, "offset": 2, "next_cursor": None}
+        assert client.get(f'/api/data/csv?cursor={first_page["next_cursor"]}&fields=Revenue (in $)&Location=Downtown').status_code == 200
+        assert client.get(f'/api/data/csv?cursor={first_page["next_cursor"]}&Location=Eastside').status_code == 400
+
+    def test_query_invalid_parameters(self, client):
+        assert client.get('/api/data/csv?fields=Unknown').get_json() == {"error": "Unknown field: Unknown"}
+        assert client.get('/api/data/csv?limit=abc').status_code == 400
+        assert client.get('/api/data/csv?cursor=abc').status_code == 400
+        assert client.get('/api/data/pptx?limit=1').status_code == 400
+
+    def test_query_pptx_fields(self, client):
+        response = client.get('/api/data/pptx?fields=Quarterly Metrics')
+        assert response.get_json() == {"pptx_data": {"Quarterly Metrics": {"Q1": {"Revenue": 100.0}}}}
+
+    def test_aggregate_sum_by_location(self, client):
+        response = client.get('/api/aggregate/csv?group_by=Location&metric=Revenue (in $)&reducer=sum')
+        assert response.get_json()["rows"] == [
+            {"Location": "Downtown", "Revenue (in $)": 100.0},
+            {"Location": "Eastside", "Revenue (in $)": 50.0}
+        ]
+
+    def test_aggregate_employees(self, client):
+        response = client.get('/api/aggregate/employees?group_by=Role&metric=Cash_Money&reducer=mean')
+        assert response.get_json()["rows"] == [{"Role": "Manager", "Cash_Money": 70000.0}, {"Role": "Trainer", "Cash_Money": 45000.0}]
+
+        response = client.get('/api/aggregate/employees?group_by=Company_Name&metric=Cash_Money&reducer=quantile&q=0,0.5,1')
+        assert response.get_json()["rows"] == [{"Company_Name": "FitPro", "Cash_Money q0.0": 40000.0, "Cash_Money q0.5": 50000.0, "Cash_Money q1.0": 70000.0}]
+
+    def test_aggregate_count_with_filter(self, client):
+        response = client.get('/api/aggregate/csv?reducer=count&Location=Downtown')
+        assert response.get_json()["rows"] == [{"count": 1}]
+
+    def test_aggregate_cached_per_version(self, api_handler, client):
+        url = '/api/aggregate/csv?group_by=Location&metric=Revenue (in $)'
+        client.get(url)
+        assert len(api_handler.aggregate_cache) == 1
+
+        api_handler.update_data("csv", [{"Location": "Downtown", "Revenue (in $)": 1.0}])
+        assert client.get(url).get_json()["rows"] == [{"Location": "Downtown", "Revenue (in $)": 1.0}]
+
+    def test_aggregate_invalid_parameters(self, client):
+        assert client.get('/api/aggregate/xml').status_code == 404
+        assert client.get('/api/aggregate/csv?reducer=mode&metric=Location').get_json() == {"error": "Unsupported reducer: mode"}
+        assert client.get('/api/aggregate/csv?reducer=mean').status_code == 400
+        assert client.get('/api/aggregate/csv?group_by=Unknown&reducer=count').get_json() == {"error": "Unknown field: Unknown"}
+
+    @pytest.mark.parametrize("reducer", ["sum", "mean", "min", "max", "median"])
+    def test_aggregate_rejects_non_numeric_metric(self, client, reducer):
+        response = client.get(f'/api/aggregate/csv?group_by=Location&metric=Location&reducer={reducer}')
+        assert response.status_code == 400
+        assert response.get_json() == {"error": f"Cannot {reducer} non-numeric column: Location"}
+
+    def test_aggregate_dates(self, api_handler, client):
+        api_handler.update_data("csv", [{"Location": "Downtown", "Date": pd.Timestamp(f"2024-01-0{day}")} for day in (1, 2)])
+        assert client.get('/api/aggregate/csv?metric=Date&reducer=max').get_json()["rows"] == [{"Date": "Tue, 02 Jan 2024 00:00:00 GMT"}]
+        assert client.get('/api/aggregate/csv?metric=Date&reducer=sum').status_code == 400
+
+    def test_stream_all_data(self, client):
+        response = client.get('/api/data', headers={"Accept": "application/x-ndjson"})
+        assert response.mimetype == "application/x-ndjson"
+
+        lines = [json.loads(line) for line in response.get_data().splitlines()]
+        assert [line["type"] for line in lines] == ["json", "csv", "csv", "pdf", "pptx"]
+        assert lines[1]["record"] == {"Location": "Downtown", "Revenue (in $)": 100.0}
+        assert lines[4]["record"] == {"Quarterly Metrics": {"Q1": {"Revenue": 100.0}}}
+
+    def test_stream_by_type_with_filters(self, client):
+        response = client.get('/api/data/csv?stream=1&Location=Eastside&fields=Revenue (in $)')
+        assert response.get_data() == b'{"Revenue (in $)": 50.0}\n'
+
+        response = client.get('/api/data/csv?stream=1&Unknown=1')
+        assert response.status_code == 400
+        assert client.get('/api/data/csv?stream=1&cursor=abc').status_code == 400
+
+    def test_stream_bounded_gzip_chunks(self, api_handler, client):
+        api_handler.STREAM_BUFFER_SIZE = 100
+        api_handler.update_data("csv", [{"Location": "Downtown", "Revenue (in $)": float(i)} for i in range(50)])
+
+        response = client.get('/api/data/csv?stream=1', headers={"Accept-Encoding": "gzip"}, buffered=False)
+        chunks = list(response.response)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert len(chunks) > 10
+
+        lines = gzip.decompress(b"".join(chunks)).splitlines()
+        assert len(lines) == 50
+        assert json.loads(lines[-1]) == {"Location": "Downtown", "Revenue (in $)": 49.0}
+
+    def test_arrow_response(self, api_handler, client):
+        response = client.get('/api/data/csv', headers={"Accept": "application/vnd.apache.arrow.stream"})
+        assert response.mimetype == "application/vnd.apache.arrow.stream"
+
+        table = pa.ipc.open_stream(response.get_data()).read_all()
+        assert table.to_pylist() == [{"Location": "Downtown", "Revenue (in $)": 100.0}, {"Location": "Eastside", "Revenue (in $)": 50.0}]
+        assert ("csv", "arrow") in api_handler.columnar_cache
+
+    def test_parquet_response_for_flattened_table(self, client):
+        response = client.get('/api/data/employees?format=parquet&Role=Trainer&fields=Cash_Money,Company_Id')
+        table = pq.read_table(io.BytesIO(response.get_data()))
+        assert table.to_pylist() == [{"Cash_Money": 40000, "Company_Id": 1}, {"Cash_Money": 50000, "Company_Id": 1}]
+
+    def test_flattened_table_as_json(self, client):
+        response = client.get('/api/data/employees?limit=1')
+        assert response.get_json()["employees_data"] == [{"Role": "Trainer", "Cash_Money": 40000, "Company_Name": "FitPro", "Company_Id": 1}]
+        assert response.get_json()["total"] == 3
+
+    def test_columnar_invalid_requests(self, client):
+        assert client.get('/api/data/pptx?format=arrow').status_code == 406
+        assert client.get('/api/data?format=parquet').status_code == 406
+        assert client.get('/api/data/csv?format=xml').get_json() == {"error": "Unsupported format: xml"}
+        assert client.get('/api/data/csv?format=arrow&Unknown=1').status_code == 400
+
+    @pytest.mark.parametrize("url, headers", [
+        ('/api/data', {}),
+        ('/api/data/csv', {}),
+        ('/api/data/csv', {"Accept-Encoding": "gzip"}),
+        ('/api/data/csv?limit=1', {}),
+        ('/api/data/csv', {"Accept": "application/x-ndjson"}),
+        ('/api/data/csv', {"Accept": "application/vnd.apache.arrow.stream"}),
+        ('/api/data/csv?format=xml', {})
+    ])
+    def test_negotiated_responses_vary_on_accept(self, client, url, headers):
+        assert client.get(url, headers=headers).headers['Vary'] == 'Accept, Accept-Encoding'
+
+    def test_not_modified_varies_on_accept(self, client):
+        etag = client.get('/api/data/csv').headers['ETag']
+        response = client.get('/api/data/csv', headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers['Vary'] == 'Accept, Accept-Encoding'
+
+    def test_metrics_endpoint(self, api_handler, client):
+        client.get('/api/data/csv')
+        client.get('/api/data/csv?stream=1').get_data()
+        client.get('/api/data/xml')
+        client.get('/api/aggregate/yaml')
+
+        labels = {"route": "/api/data/<file_type>", "file_type": "csv"}
+        assert api_handler.metrics.get("http_request_duration_seconds", labels).count == 2
+        assert api_handler.metrics.get("http_requests_total", {**labels, "status": "200"}) == 2
+        assert api_handler.metrics.get("http_response_bytes_total", labels) > 0
+
+        body = client.get('/metrics').get_data(as_text=True)
+        assert 'http_requests_total{route="/api/data/<file_type>",file_type="invalid",status="404"} 1' in body
+        assert 'http_requests_total{route="/api/aggregate/<table>",file_type="invalid",status="404"} 1' in body
+        assert 'file_type="xml"' not in body
+        assert 'http_request_duration_seconds_count{route="/api/data/<file_type>",file_type="csv"} 2' in body
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,159 @@
+import pytest
+import shutil
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import pandas as pd
+from src.server.DatasetGenerator import DatasetGenerator
+from src.server.DataIngestion.IngestionFactory import IngestionFactory
+from src.server.DataIngestion.PDFDataIngestion import PDFTable
+from src.server.DataProcessor.PDFDataProcessor import PDFDataProcessor
+from src.server.Visualization.VisualizationFactory import VisualizationFactory
+
+CSV_ROWS = [1000, 10000, 100000]
+JSON_COMPANIES = [10, 100, 1000]
+PDF_PAGES = [1, 10, 40]
+PPTX_SLIDES = [3, 30, 300]
+
+@pytest.fixture(scope="module")
+def datasets(tmp_path_factory):
+    """Synthetic inputs at every benchmarked size, written once per run."""
+    directory = tmp_path_factory.mktemp("benchmark_datasets")
+    generator = DatasetGenerator(seed=0)
+    paths = {}
+    for rows in CSV_ROWS:
+        paths["csv", rows] = str(directory / f"activity_{rows}.csv")
+        generator.write_csv(paths["csv", rows], rows)
+    for companies in JSON_COMPANIES:
+        paths["json", companies] = str(directory / f"companies_{companies}.json")
+        generator.write_json(paths["json", companies], companies)
+    for pages in PDF_PAGES:
+        paths["pdf", pages] = str(directory / f"quarterly_{pages}.pdf")
+        generator.write_pdf(paths["pdf", pages], pages)
+    for slides in PPTX_SLIDES:
+        paths["pptx", slides] = str(directory / f"deck_{slides}.pptx")
+        generator.write_pptx(paths["pptx", slides], slides)
+    return paths
+
+def load(data_type, file_path, **options):
+    ingestor = IngestionFactory.create_ingestion(data_type, **options)
+    ingestor.load_data(file_path)
+    return ingestor
+
+def process(data_type, file_path, **options):
+    return load(data_type, file_path, **options).create_processor().process_data()
+
+def pdf_tables(pages, rows_per_page=25):
+    """Tables shaped like tabula's output for the generated report, which needs Java to extract for real."""
+    tables = []
+    for page in range(pages):
+        quarters = range(page * rows_per_page, (page + 1) * rows_per_page)
+        tables.append(PDFTable("quarterly.pdf", page + 1, pd.DataFrame({
+            "Year": [2022 + quarter // 4 for quarter in quarters],
+            "Quarter": [f"Q{quarter % 4 + 1}" for quarter in quarters],
+            "Revenue (in $)": ["2,100,000"] * rows_per_page,
+            "Memberships Sold": [300] * rows_per_page,
+            "Avg Duration (Minutes)": [85] * rows_per_page
+        })))
+    return tables
+
+def plot_all(visualization):
+    try:
+        visualization.plot()
+    finally:
+        plt.close("all")
+
+# Benchmark Tests
+@pytest.mark.benchmark
+class TestIngestionBenchmark:
+    @pytest.mark.parametrize("backend", ["pandas", "arrow"])
+    @pytest.mark.parametrize("rows", CSV_ROWS)
+    def test_csv_load_data(self, benchmark_baseline, datasets, rows, backend):
+        benchmark_baseline.check(f"CSVDataIngestion.load_data[{rows},{backend}]", lambda _: load("csv", datasets["csv", rows], backend=backend))
+
+    @pytest.mark.parametrize("stream", [False, True])
+    @pytest.mark.parametrize("companies", JSON_COMPANIES)
+    def test_json_load_data(self, benchmark_baseline, datasets, companies, stream):
+        def load_companies(_):
+            # A streamed load only opens the file, so it is timed together with decoding every company
+            ingestor = load("json", datasets["json", companies], stream=stream)
+            return list(ingestor.data) if stream else ingestor.data["companies"]
+
+        benchmark_baseline.check(f"JSONDataIngestion.load_data[{companies},stream={stream}]", load_companies)
+
+    @pytest.mark.skipif(shutil.which("java") is None, reason="tabula needs a Java runtime")
+    @pytest.mark.parametrize("pages", PDF_PAGES)
+    def test_pdf_load_data(self, benchmark_baseline, datasets, pages):
+        benchmark_baseline.check(f"PDFDataIngestion.load_data[{pages}]", lambda _: load("pdf", datasets["pdf", pages], all_tables=True), repeat=1)
+
+    @pytest.mark.parametrize("backend", ["python-pptx", "xml"])
+    @pytest.mark.parametrize("slides", PPTX_SLIDES)
+    def test_pptx_load_data(self, benchmark_baseline, datasets, slides, backend):
+        benchmark_baseline.check(f"PPTXDataIngestion.load_data[{slides},{backend}]", lambda _: load("pptx", datasets["pptx", slides], backend=backend))
+
+@pytest.mark.benchmark
+class TestProcessorBenchmark:
+    @pytest.mark.parametrize("rows", CSV_ROWS)
+    def test_csv_process_data(self, benchmark_baseline, datasets, rows):
+        benchmark_baseline.check(
+            f"CSVDataProcessor.process_data[{rows}]",
+            lambda processor: processor.process_data(),
+            setup=lambda: load("csv", datasets["csv", rows]).create_processor()
+        )
+
+    @pytest.mark.parametrize("companies", JSON_COMPANIES)
+    def test_json_process_data(self, benchmark_baseline, datasets, companies):
+        benchmark_baseline.check(
+            f"JSONDataProcessor.process_data[{companies}]",
+            lambda processor: processor.process_data(),
+            setup=lambda: load("json", datasets["json", companies]).create_processor()
+        )
+
+    @pytest.mark.parametrize("pages", PDF_PAGES)
+    def test_pdf_process_data(self, benchmark_baseline, pages):
+        benchmark_baseline.check(
+            f"PDFDataProcessor.process_data[{pages}]",
+            lambda processor: processor.process_data(),
+            setup=lambda: PDFDataProcessor(pdf_tables(pages))
+        )
+
+    @pytest.mark.parametrize("slides", PPTX_SLIDES)
+    def test_pptx_process_data(self, benchmark_baseline, datasets, slides):
+        benchmark_baseline.check(
+            f"PPTXDataProcessor.process_data[{slides}]",
+            lambda processor: processor.process_data(),
+            setup=lambda: load("pptx", datasets["pptx", slides]).create_processor()
+        )
+
+@pytest.mark.benchmark
+class TestVisualizationBenchmark:
+    @pytest.mark.parametrize("rows", CSV_ROWS)
+    def test_csv_plot(self, benchmark_baseline, datasets, rows):
+        csv_data = process("csv", datasets["csv", rows])
+        benchmark_baseline.check(f"CSVDataVisualization.plot[{rows}]", lambda _: plot_all(VisualizationFactory.create_visualization("csv", csv_data)))
+
+    @pytest.mark.parametrize("companies", JSON_COMPANIES)
+    def test_json_plot(self, benchmark_baseline, datasets, companies):
+        def plot(json_data):
+            # JSONDataVisualization.plot is empty; the dashboard draws these two charts
+            visualization = VisualizationFactory.create_visualization("json", json_data)
+            try:
+                visualization.plot_salary_distribution_by_company(visualization.companies_df, visualization.employees_df)
+                visualization.plot_roles_by_average_salary(visualization.employees_df)
+            finally:
+                plt.close("all")
+
+        benchmark_baseline.check(f"JSONDataVisualization.plot[{companies}]", plot, setup=lambda: process("json", datasets["json", companies]), repeat=1)
+
+    @pytest.mark.parametrize("pages", PDF_PAGES)
+    def test_pdf_plot(self, benchmark_baseline, pages):
+        pdf_data = PDFDataProcessor(pdf_tables(pages)).process_data()
+        benchmark_baseline.check(f"PDFDataVisualization.plot[{pages}]", lambda _: plot_all(VisualizationFactory.create_visualization("pdf", pdf_data)))
+
+    @pytest.mark.parametrize("slides", PPTX_SLIDES)
+    def test_pptx_plot(self, benchmark_baseline, datasets, slides):
+        pptx_data = process("pptx", datasets["pptx", slides])
+        benchmark_baseline.check(f"PPTXDataVisualization.plot[{slides}]", lambda _: plot_all(VisualizationFactory.create_visualization("pptx", pptx_data)))
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -1,8 +1,15 @@
 import pytest
 import os
+import tracemalloc
 from unittest.mock import Mock, patch
 
 from src.server.DataProcessing import DataProcessing
+from src.server.DataSource import DataSource
+from src.server.DataSourceRegistry import DataSourceRegistry
+from src.server.DataProcessor.CSVDataProcessor import CSVDataProcessor
+from src.server.DataProcessor.ProcessedDataset import ProcessedDataset
+from src.server.ResultCache import ResultCache
+from src.server.Tracer import Tracer
 
 @pytest.fixture
 def mock_data_source():
@@ -51,6 +58,50 @@ class TestDataProcessing:
         assert mock_ingestor.load_data.called
         assert mock_factory.create_ingestion.call_count == 4
 
+    @patch('src.server.DataProcessing.IngestionFactory')
+    def test_ingest_data_parallel(self, mock_factory, mock_ingestor):
+        mock_factory.create_ingestion.return_value = mock_ingestor
+        # Merging keeps the per-source results as they are, in source order
+        mock_factory.get_processor_class.return_value.merge_results.side_effect = list
+        pipeline = DataProcessing(parallel=True, max_workers=2)
+        pipeline.ingest_data()
+
+        assert mock_factory.create_ingestion.call_count == 4
+        assert mock_ingestor.load_data.call_count == 4
+        assert len(pipeline.source_results["json"]) == 4
+        assert pipeline.processed_data == {"json": [{"test": "data"}] * 4}
+        mock_factory.get_processor_class.assert_called_once_with("json")
+        assert pipeline.ingestors == []
+
+    def test_init_invalid_executor(self):
+        with pytest.raises(ValueError) as exc_info:
+            DataProcessing(executor="fiber")
+        assert str(exc_info.value) == "Unsupported executor: fiber"
+
+    @patch('src.server.DataProcessing.IngestionFactory')
+    def test_ingest_data_cache_hit(self, mock_factory, mock_ingestor):
+        mock_cache = Mock()
+        mock_cache.get.return_value = {"cached": "data"}
+        pipeline = DataProcessing(cache=mock_cache)
+        pipeline.ingest_data()
+
+        assert not mock_factory.create_ingestion.called
+        assert pipeline.ingestors == []
+        assert pipeline.processed_data["csv"] == {"cached": "data"}
+
+    @patch('src.server.DataProcessing.IngestionFactory')
+    def test_process_data_cache_miss(self, mock_factory, mock_ingestor):
+        mock_factory.create_ingestion.return_value = mock_ingestor
+        mock_cache = Mock()
+        mock_cache.get.return_value = None
+        mock_cache.get_key.return_value = "json-abc-v1"
+        pipeline = DataProcessing(cache=mock_cache)
+        pipeline.data_sources = pipeline.data_sources[:1]
+        pipeline.ingest_data()
+        pipeline.process_data()
+
+        mock_cache.put.assert_called_once_with("json-abc-v1", {"test": "data"})
+
     def test_process_data(self, data_pipeline, mock_ingestor):
         data_pipeline.ingestors = [mock_ingestor]
         data_pipeline.process_data()
@@ -75,10 +126,181 @@ class TestDataProcessing:
             {"data": "json"},
             {"data": "csv"},
             {"data": "pdf"},
-            {"data": "pptx"}
+            {"data": "pptx"},
+            metrics=data_pipeline.metrics
         )
         assert mock_handler_instance.run.called
 
+    @patch('src.server.DataProcessing.APIHandler')
+    def test_handle_api_without_reloader_when_watching(self, mock_api_handler_class, data_pipeline):
+        data_pipeline.watch_interval = 60
+        with patch.object(data_pipeline, 'start_watching') as start_watching:
+            data_pipeline.handle_api()
+
+        assert start_watching.called
+        mock_api_handler_class.return_value.run.assert_called_once_with(use_reloader=False)
+
+    @patch('src.server.DataProcessing.IngestionFactory')
+    def test_refresh_changed_sources(self, mock_factory, mock_ingestor, tmp_path):
+        mock_factory.create_ingestion.return_value = mock_ingestor
+        changed_path = tmp_path / "changed.json"
+        unchanged_path = tmp_path / "unchanged.json"
+        changed_path.write_text("{}")
+        unchanged_path.write_text("{}")
+
+        pipeline = DataProcessing()
+        pipeline.data_sources = [DataSource("json", str(changed_path)), DataSource("json", str(unchanged_path))]
+        pipeline.api_handler = Mock()
+        file_states = {source.file_path: pipeline.get_file_state(source.file_path) for source in pipeline.data_sources}
+
+        pipeline.refresh_changed_sources(file_states)
+        assert not mock_factory.create_ingestion.called
+
+        changed_path.write_text('{"companies": []}')
+        pipeline.refresh_changed_sources(file_states)
+
+        mock_ingestor.load_data.assert_called_once_with(str(changed_path))
+        pipeline.api_handler.update_data.assert_called_once_with("json", {"test": "data"})
+        assert pipeline.processed_data["json"] == {"test": "data"}
+
+    @patch('src.server.DataProcessing.IngestionFactory')
+    def test_refresh_keeps_previous_result_on_failure(self, mock_factory, tmp_path):
+        mock_factory.create_ingestion.return_value.load_data.side_effect = ValueError("partial write")
+        file_path = tmp_path / "data.json"
+        file_path.write_text("{")
+
+        pipeline = DataProcessing()
+        pipeline.data_sources = [DataSource("json", str(file_path))]
+        pipeline.processed_data["json"] = {"previous": "data"}
+        pipeline.refresh_changed_sources({})
+
+        assert pipeline.processed_data["json"] == {"previous": "data"}
+
+    def test_refresh_appended_csv(self, tmp_path):
+        file_path = tmp_path / "activity.csv"
+        file_path.write_text("Date,Membership_Type,Activity,Revenue,Duration (Minutes),Location\n2024-01-01,VIP,Gym,10.5,60,Westside\n")
+
+        pipeline = DataProcessing()
+        pipeline.data_sources = [DataSource("csv", str(file_path), {"incremental": True})]
+        pipeline.refresh_changed_sources({})
+        with open(file_path, "a") as f:
+            f.write("2024-01-02,Basic,Pool,11.0,30,Downtown\n")
+
+        with patch.object(pipeline, 'load_and_process', wraps=pipeline.load_and_process) as load_and_process:
+            pipeline.refresh_changed_sources({})
+            assert not load_and_process.called
+            assert [record["Location"] for record in pipeline.processed_data["csv"]] == ["Westside", "Downtown"]
+            assert pipeline.processed_data["csv"].cube.aggregate(["Location"], None, "count")["count"].tolist() == [1, 1]
+
+            # A rewritten file is loaded whole again
+            file_path.write_text(file_path.read_text().replace("Westside", "Eastside"))
+            pipeline.refresh_changed_sources({})
+            assert load_and_process.called
+            assert [record["Location"] for record in pipeline.processed_data["csv"]] == ["Eastside", "Downtown"]
+
+    def test_refresh_appended_csv_after_restart(self, tmp_path):
+        file_path = tmp_path / "activity.csv"
+        file_path.write_text("Date,Membership_Type,Activity,Revenue,Duration (Minutes),Location\n2024-01-01,VIP,Gym,10.5,60,Westside\n")
+        source = DataSource("csv", str(file_path), {"incremental": True})
+        DataProcessing.load_and_process(source, ResultCache(str(tmp_path / "cache")))
+
+        # A restarted pipeline restores the result and its checkpoint from the cache
+        pipeline = DataProcessing(cache=ResultCache(str(tmp_path / "cache")))
+        pipeline.data_sources = [source]
+        pipeline.ingest_data()
+        assert pipeline.get_source_result(str(file_path)).checkpoint.offset == file_path.stat().st_size
+
+        with open(file_path, "a") as f:
+            f.write("2024-01-02,Basic,Pool,11.0,30,Downtown\n")
+        with patch.object(pipeline, 'load_and_process') as load_and_process:
+            pipeline.refresh_changed_sources({})
+        assert not load_and_process.called
+        assert [record["Location"] for record in pipeline.processed_data["csv"]] == ["Westside", "Downtown"]
+
+    @patch('src.server.DataProcessing.IngestionFactory')
+    def test_merge_results_per_type(self, mock_factory, tmp_path):
+        mock_factory.get_processor_class.return_value = CSVDataProcessor
+        registry = DataSourceRegistry(str(tmp_path)).add("csv", "*.csv")
+        for name in ["club_b.csv", "club_a.csv"]:
+            (tmp_path / name).touch()
+
+        pipeline = DataProcessing(registry=registry)
+        pipeline.store_result("csv", str(tmp_path / "club_b.csv"), [{"Location": "Eastside"}])
+        pipeline.store_result("csv", str(tmp_path / "club_a.csv"), [{"Location": "Downtown"}])
+        pipeline.merge_results()
+
+        assert pipeline.processed_data["csv"] == [{"Location": "Downtown"}, {"Location": "Eastside"}]
+        assert pipeline.get_source_result(str(tmp_path / "club_b.csv")) == [{"Location": "Eastside"}]
+        mock_factory.get_processor_class.assert_called_once_with("csv")
+
+    @patch('src.server.DataProcessing.IngestionFactory')
+    def test_stage_metrics(self, mock_factory, mock_ingestor, tmp_path):
+        mock_factory.create_ingestion.return_value = mock_ingestor
+        file_path = str(tmp_path / "data.json")
+
+        pipeline = DataProcessing(parallel=True, trace_memory=True)
+        pipeline.data_sources = [DataSource("json", file_path)]
+        pipeline.ingest_data()
+
+        for stage in ["load_data", "create_processor", "process_data"]:
+            assert pipeline.metrics.get("pipeline_stage_duration_seconds", {"stage": stage, "type": "json", "source": file_path}).count == 1
+        assert pipeline.metrics.get("pipeline_sources_total", {"type": "json", "cache": "miss"}) == 1
+        assert pipeline.metrics.get("pipeline_source_peak_memory_bytes", {"type": "json", "source": file_path}) > 0
+
+    @patch('src.server.DataProcessing.IngestionFactory')
+    def test_trace_memory_keeps_callers_tracing(self, mock_factory, mock_ingestor, tmp_path):
+        mock_factory.create_ingestion.return_value = mock_ingestor
+        pipeline = DataProcessing(trace_memory=True)
+        pipeline.data_sources = [DataSource("json", str(tmp_path / "data.json"))]
+
+        tracemalloc.start()
+        try:
+            pipeline.ingest_data()
+            pipeline.process_data()
+            assert tracemalloc.is_tracing()
+        finally:
+            tracemalloc.stop()
+
+        pipeline.ingest_data()
+        pipeline.process_data()
+        assert not tracemalloc.is_tracing()
+
+    @patch('src.server.DataProcessing.IngestionFactory')
+    def test_trace_spans(self, mock_factory, mock_ingestor, tmp_path):
+        mock_factory.create_ingestion.return_value = mock_ingestor
+        file_path = str(tmp_path / "data.json")
+
+        pipeline = DataProcessing(tracer=Tracer())
+        pipeline.data_sources = [DataSource("json", file_path)]
+        pipeline.ingest_data()
+        pipeline.process_data()
+
+        names = [event["name"] for event in pipeline.tracer.events]
+        assert names.count("data.json") == 2
+        assert {"load_data", "create_processor", "process_data"} <= set(names)
+        assert all(event["args"]["source"] == file_path for event in pipeline.tracer.events)
+
+    def test_trace_spans_of_cache_hits(self, tmp_path):
+        file_path = str(tmp_path / "data.json")
+        cache = Mock()
+        cache.get.return_value = {"cached": "data"}
+
+        pipeline = DataProcessing(cache=cache, tracer=Tracer())
+        pipeline.data_sources = [DataSource("json", file_path)]
+        pipeline.ingest_data()
+
+        assert [event["name"] for event in pipeline.tracer.events] == ["cache_get", "data.json"]
+        assert all(event["args"]["source"] == file_path for event in pipeline.tracer.events)
+
+    def test_memory_report(self, tmp_path):
+        pipeline = DataProcessing(registry=DataSourceRegistry(str(tmp_path)))
+        pipeline.store_result("csv", str(tmp_path / "data.csv"), ProcessedDataset.from_records([{"Revenue (in $)": 1.0}, {"Revenue (in $)": 2.0}]))
+        pipeline.store_result("pptx", str(tmp_path / "deck.pptx"), {"Quarterly Metrics": {}})
+        pipeline.merge_results()
+
+        assert pipeline.memory_report() == {"csv": {"Revenue (in $)": 16}}
+        assert pipeline.metrics.get("processed_table_memory_bytes", {"table": "csv"}) == 16
+
 # Integration Tests
 class TestDataProcessingIntegration:
     @patch('src.server.DataProcessing.IngestionFactory')
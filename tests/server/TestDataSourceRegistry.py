@@ -0,0 +1,38 @@
+import pytest
+import json
+from src.server.DataSourceRegistry import DataSourceRegistry
+
+@pytest.fixture
+def datasets_dir(tmp_path):
+    for name in ["club_a_2024_01.csv", "club_b_2024_01.csv", "companies.json", "notes.txt"]:
+        (tmp_path / name).touch()
+    return tmp_path
+
+# Unit Tests
+class TestDataSourceRegistry:
+    def test_discover_patterns(self, datasets_dir):
+        registry = DataSourceRegistry(str(datasets_dir)).add("csv", "club_*.csv").add("json", "*.json")
+        sources = registry.discover()
+
+        assert [(source.type, source.file_path) for source in sources] == [
+            ("csv", str(datasets_dir / "club_a_2024_01.csv")),
+            ("csv", str(datasets_dir / "club_b_2024_01.csv")),
+            ("json", str(datasets_dir / "companies.json"))
+        ]
+
+    def test_discover_skips_duplicates(self, datasets_dir):
+        registry = DataSourceRegistry(str(datasets_dir)).add("csv", "club_a_*.csv").add("csv", "*.csv")
+        assert len(registry.discover()) == 2
+
+    def test_from_config(self, datasets_dir):
+        config_path = datasets_dir / "sources.json"
+        config_path.write_text(json.dumps({"sources": [
+            {"type": "csv", "pattern": "*.csv", "options": {"chunksize": 1000}}
+        ]}))
+
+        sources = DataSourceRegistry.from_config(str(config_path)).discover()
+        assert len(sources) == 2
+        assert sources[0].options == {"chunksize": 1000}
+
+if __name__ == '__main__':
+    pytest.main([__file__])
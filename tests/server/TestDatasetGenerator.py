@@ -0,0 +1,80 @@
+import pytest
+import json
+import os
+import re
+import zlib
+import pandas as pd
+from pypdf import PdfReader
+from src.server.DatasetGenerator import DatasetGenerator
+from src.server.DataSourceRegistry import DataSourceRegistry
+from src.server.DataIngestion.IngestionFactory import IngestionFactory
+from src.server.DataIngestion.PDFDataIngestion import PDFDataIngestion
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '../..', 'datasets')
+
+@pytest.fixture
+def generated_dir(tmp_path):
+    DatasetGenerator(seed=1).generate(str(tmp_path), csv_rows=500, companies=20, pdf_pages=3, pptx_slides=6)
+    return tmp_path
+
+def process(data_type, file_path, **options):
+    ingestor = IngestionFactory.create_ingestion(data_type, **options)
+    ingestor.load_data(str(file_path))
+    return ingestor.create_processor().process_data()
+
+# Unit Tests
+class TestDatasetGenerator:
+    def test_csv_matches_fixture_schema(self, generated_dir):
+        fixture = pd.read_csv(os.path.join(FIXTURES_DIR, 'dataset2.csv'))
+        generated = pd.read_csv(generated_dir / "dataset2.csv")
+
+        assert list(generated.columns) == list(fixture.columns)
+        assert len(generated) == 500
+        assert generated["Membership_ID"].is_unique
+        assert set(generated["Location"]) <= {"Downtown", "Eastside", "Westside"}
+
+    def test_csv_is_deterministic(self, tmp_path):
+        DatasetGenerator(seed=3).write_csv(str(tmp_path / "a.csv"), 100)
+        DatasetGenerator(seed=3).write_csv(str(tmp_path / "b.csv"), 100)
+        assert (tmp_path / "a.csv").read_bytes() == (tmp_path / "b.csv").read_bytes()
+
+    def test_json_is_processed(self, generated_dir):
+        with open(generated_dir / "dataset1.json") as f:
+            companies = json.load(f)["companies"]
+        assert len(companies) == 20
+        assert set(companies[0]) == {"id", "name", "industry", "revenue", "location", "employees", "performance"}
+
+        result = process("json", generated_dir / "dataset1.json", stream=True)
+        assert len(result["json_data"]) == 20
+        assert len(result["json_data"][0]["Employees"]) == 15
+
+    def test_pdf_has_one_table_per_page(self, generated_dir):
+        pdf_path = generated_dir / "dataset3.pdf"
+        assert PDFDataIngestion().list_pages(str(pdf_path)) == [1, 2, 3]
+
+        streams = re.findall(rb'stream\n(.*?)\nendstream', pdf_path.read_bytes(), re.S)
+        last_page = zlib.decompress(streams[-1]).decode('latin-1')
+        assert "(Revenue \\(in $\\)) Tj" in last_page
+        assert "(2040) Tj" in last_page
+
+    def test_pdf_is_read_by_pdf_parser(self, generated_dir):
+        # strict makes pypdf reject a broken cross-reference table or page tree instead of repairing it
+        reader = PdfReader(str(generated_dir / "dataset3.pdf"), strict=True)
+        assert len(reader.pages) == 3
+
+        for page in reader.pages:
+            lines = page.extract_text().splitlines()
+            assert "Year Quarter Revenue (in $) Memberships Sold Avg Duration (Minutes)" in lines
+            assert len([line for line in lines if re.fullmatch(r"\d{4} Q[1-4] [\d,]+ \d+ \d+", line)]) == 25
+
+    def test_pptx_is_processed(self, generated_dir):
+        result = process("pptx", generated_dir / "dataset4.pptx")
+        assert result["FitPro: Annual Summary 2023"]["Key Highlights"]["Top Location"] in DatasetGenerator.LOCATIONS
+        assert all(metrics["Revenue"] for metrics in result["Quarterly Metrics"].values())
+
+    def test_sources_config(self, generated_dir):
+        sources = DataSourceRegistry.from_config(str(generated_dir / "sources.json")).discover()
+        assert [source.type for source in sources] == ["json", "csv", "pdf", "pptx"]
+
+if __name__ == '__main__':
+    pytest.main([__file__])
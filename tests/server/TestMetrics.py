@@ -0,0 +1,99 @@
+import pytest
+import os
+from unittest.mock import patch
+from src.server.Metrics import Metrics
+
+# Unit Tests
+class TestMetrics:
+    def test_counter_and_gauge(self):
+        metrics = Metrics()
+        metrics.inc("requests_total", {"route": "/api/data"})
+        metrics.inc("requests_total", {"route": "/api/data"}, 2)
+        metrics.set("peak_bytes", 1024)
+
+        assert metrics.get("requests_total", {"route": "/api/data"}) == 3
+        assert metrics.render() == (
+            '# TYPE requests_total counter\n'
+            'requests_total{route="/api/data"} 3\n'
+            '# TYPE peak_bytes gauge\n'
+            'peak_bytes 1024\n'
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        metrics = Metrics(buckets=(0.1, 1.0))
+        for value in [0.05, 0.5, 0.5, 5.0]:
+            metrics.observe("duration_seconds", value, {"stage": "load_data"})
+
+        assert metrics.render().splitlines() == [
+            '# TYPE duration_seconds histogram',
+            'duration_seconds_bucket{stage="load_data",le="0.1"} 1',
+            'duration_seconds_bucket{stage="load_data",le="1.0"} 3',
+            'duration_seconds_bucket{stage="load_data",le="+Inf"} 4',
+            'duration_seconds_sum{stage="load_data"} 6.05',
+            'duration_seconds_count{stage="load_data"} 4',
+        ]
+
+    def test_timer_and_label_escaping(self):
+        metrics = Metrics()
+        with metrics.timer("duration_seconds", {"source": 'C:\\data\\"q".csv'}):
+            pass
+
+        assert metrics.get("duration_seconds", {"source": 'C:\\data\\"q".csv'}).count == 1
+        assert 'source="C:\\\\data\\\\\\"q\\".csv"' in metrics.render()
+
+    def test_type_conflict(self):
+        metrics = Metrics()
+        metrics.inc("requests_total")
+        with pytest.raises(ValueError):
+            metrics.observe("requests_total", 1.0)
+
+    def test_shared_samples_are_merged(self, tmp_path):
+        parent = Metrics(buckets=(1.0,))
+        parent.inc("pipeline_sources_total", {"type": "csv"})
+        parent.share(str(tmp_path))
+
+        worker = Metrics(buckets=(1.0,))
+        worker.directory = str(tmp_path)
+        # Stands in for another process writing its file
+        with patch("os.getpid", return_value=os.getpid() + 1):
+            worker.inc("requests_total", value=2)
+            worker.set("peak_bytes", 4096)
+            worker.observe("duration_seconds", 0.5)
+            worker.write()
+
+        parent.inc("requests_total")
+        parent.set("peak_bytes", 1024)
+        parent.observe("duration_seconds", 2.0)
+
+        merged = parent.merged()
+        assert merged.get("pipeline_sources_total", {"type": "csv"}) == 1
+        assert merged.get("requests_total") == 3
+        assert merged.get("peak_bytes") == 4096
+        assert merged.get("duration_seconds").counts == [1, 1]
+        assert 'requests_total 3' in parent.render()
+
+        parent.share(None)
+        assert 'requests_total 1' in parent.render()
+
+    def test_fold_exited_processes(self, tmp_path):
+        parent = Metrics(buckets=(1.0,))
+        parent.share(str(tmp_path))
+        exited_pids = [os.getpid() + 1, os.getpid() + 2]
+        for pid in exited_pids:
+            with patch("os.getpid", return_value=pid):
+                worker = Metrics(buckets=(1.0,))
+                worker.directory = str(tmp_path)
+                worker.inc("requests_total")
+                worker.observe("duration_seconds", 0.5)
+                worker.write()
+
+        parent.fold(exited_pids[:1])
+        parent.fold(exited_pids[1:])
+
+        assert sorted(os.listdir(tmp_path)) == [".lock", f"{os.getpid()}.pkl", Metrics.RETIRED_FILE]
+        merged = parent.merged()
+        assert merged.get("requests_total") == 2
+        assert merged.get("duration_seconds").count == 2
+
+if __name__ == '__main__':
+    pytest.main([__file__])
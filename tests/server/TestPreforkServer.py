@@ -0,0 +1,165 @@
+import pytest
+import json
+import multiprocessing
+import os
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from src.server.APIHandler import APIHandler
+from src.server.PreforkServer import PreforkServer
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="PreforkServer requires os.fork")
+
+def build_api_handler(num_rows):
+    csv_data = [
+        {"Location": ["Downtown", "Eastside", "Westside"][i % 3], "Revenue (in $)": float(i)}
+        for i in range(num_rows)
+    ]
+    return APIHandler({"json_data": []}, csv_data, [], {})
+
+def start_server(api_handler, workers, metrics=None, on_tick=None):
+    server = PreforkServer(api_handler.app, port=0, workers=workers, metrics=metrics, metrics_interval=0.1)
+    server.bind()
+    process = multiprocessing.get_context("fork").Process(target=server.serve, kwargs={"tick_interval": 0.1, "on_tick": on_tick})
+    process.start()
+    server.socket.close()
+    wait_until_ready(server.port)
+    return server, process
+
+def stop_server(process):
+    process.terminate()
+    process.join(timeout=10)
+
+def wait_until_ready(port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return urllib.request.urlopen(f"http://127.0.0.1:{port}/api/data/pptx", timeout=1).read()
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+def fetch_aggregates(port, first_threshold, count):
+    # A different threshold per request keeps the aggregate cache from answering
+    for threshold in range(first_threshold, first_threshold + count):
+        query = urllib.parse.urlencode({"group_by": "Location", "metric": "Revenue (in $)", "reducer": "quantile", "q": "0.5", "Revenue (in $)__gte": threshold})
+        urllib.request.urlopen(f"http://127.0.0.1:{port}/api/aggregate/csv?{query}").read()
+    return count
+
+def list_worker_pids(supervisor_pid):
+    with open(f"/proc/{supervisor_pid}/task/{supervisor_pid}/children") as f:
+        return [int(pid) for pid in f.read().split()]
+
+def read_pss_kb(pid):
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            if line.startswith("Pss:"):
+                return int(line.split()[1])
+    return 0
+
+def read_private_kb(pid):
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        return sum(int(line.split()[1]) for line in f if line.startswith("Private_"))
+
+# Unit Tests
+class TestPreforkServer:
+    def test_serves_from_workers(self):
+        server, process = start_server(build_api_handler(10), workers=2)
+        try:
+            body = urllib.request.urlopen(f"http://127.0.0.1:{server.port}/api/data/csv?limit=2").read()
+            assert json.loads(body)["total"] == 10
+        finally:
+            stop_server(process)
+        assert process.exitcode == 0
+
+    def test_metrics_add_up_across_workers(self):
+        api_handler = build_api_handler(10)
+        # Recorded before the fork, like the pipeline's stage metrics
+        api_handler.metrics.inc("pipeline_sources_total", {"type": "csv", "cache": "miss"})
+        server, process = start_server(api_handler, workers=2, metrics=api_handler.metrics)
+        try:
+            for _ in range(20):
+                urllib.request.urlopen(f"http://127.0.0.1:{server.port}/api/data/csv?limit=2").read()
+            time.sleep(0.5)
+
+            # Every scrape sees all requests, whichever worker answers it
+            for _ in range(6):
+                body = urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics").read().decode()
+                assert 'http_requests_total{route="/api/data/<file_type>",file_type="csv",status="200"} 20' in body
+                assert 'pipeline_sources_total{type="csv",cache="miss"} 1' in body
+        finally:
+            stop_server(process)
+        assert process.exitcode == 0
+
+    def test_metrics_survive_reloads(self):
+        api_handler = build_api_handler(10)
+        reloads = iter([False] * 5 + [True] * 3)
+        server, process = start_server(api_handler, workers=2, metrics=api_handler.metrics, on_tick=lambda: next(reloads, False))
+        try:
+            for _ in range(10):
+                urllib.request.urlopen(f"http://127.0.0.1:{server.port}/api/data/csv?limit=2").read()
+            # Past the three reloads, which replace every worker that served the requests above
+            time.sleep(1.5)
+
+            body = urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics").read().decode()
+            assert 'http_requests_total{route="/api/data/<file_type>",file_type="csv",status="200"} 10' in body
+        finally:
+            stop_server(process)
+        assert process.exitcode == 0
+
+# Benchmark Tests
+@pytest.mark.benchmark
+class TestPreforkServerBenchmark:
+    def test_throughput_scales_with_workers(self):
+        workers = min(os.cpu_count() or 1, 4)
+        api_handler = build_api_handler(200000)
+        clients = workers * 2
+        requests_per_client = 20
+        throughput = {}
+
+        for worker_count in sorted({1, workers}):
+            server, process = start_server(api_handler, worker_count)
+            try:
+                start = time.perf_counter()
+                with ProcessPoolExecutor(max_workers=clients) as pool:
+                    thresholds = [client * requests_per_client for client in range(clients)]
+                    total = sum(pool.map(fetch_aggregates, [server.port] * clients, thresholds, [requests_per_client] * clients))
+                throughput[worker_count] = total / (time.perf_counter() - start)
+
+                pss_kb = sum(read_pss_kb(pid) for pid in list_worker_pids(process.pid))
+                print(f"{worker_count} workers: {throughput[worker_count]:.1f} req/s, worker PSS {pss_kb / 1024:.1f} MiB")
+            finally:
+                stop_server(process)
+
+        if workers < 2:
+            pytest.skip("scaling needs at least 2 CPU cores")
+        assert throughput[workers] > throughput[1] * 1.5
+
+    def test_derived_caches_shared_by_workers(self):
+        workers = 4
+        paths = ["/api/data/csv", "/api/data/csv?format=arrow", "/api/data/csv?format=parquet", "/api/data/csv?Location=Downtown&limit=5"]
+        private_kb = {}
+
+        for warm in (False, True):
+            for worker_count in (1, workers):
+                api_handler = build_api_handler(200000)
+                if warm:
+                    api_handler.warm_caches()
+                server, process = start_server(api_handler, worker_count)
+                try:
+                    # Enough requests to reach every worker
+                    for _ in range(worker_count * 6):
+                        for path in paths:
+                            urllib.request.urlopen(f"http://127.0.0.1:{server.port}{path}").read()
+                    private_kb[warm, worker_count] = sum(read_private_kb(pid) for pid in list_worker_pids(process.pid))
+                    print(f"{'warmed' if warm else 'cold'} caches, {worker_count} workers: private {private_kb[warm, worker_count] / 1024:.1f} MiB")
+                finally:
+                    stop_server(process)
+
+        # Caches built before the fork are shared, so extra workers add far less than each building its own
+        assert private_kb[True, workers] - private_kb[True, 1] < (private_kb[False, workers] - private_kb[False, 1]) / 2
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,147 @@
+import pytest
+import json
+import os
+import pandas as pd
+from unittest.mock import patch
+
+from src.server.DataSource import DataSource
+from src.server.DataProcessor.CSVDataProcessor import CSVDataProcessor
+from src.server.DataProcessor.JSONDataProcessor import JSONDataProcessor
+from src.server.DataProcessor.ProcessedDataset import ProcessedDataset
+from src.server.ResultCache import ResultCache
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(str(tmp_path / "cache"))
+
+@pytest.fixture
+def csv_source(tmp_path):
+    file_path = tmp_path / "data.csv"
+    file_path.write_text("Date,Revenue\n2024-01-01,10.5\n")
+    return DataSource("csv", str(file_path))
+
+@pytest.fixture
+def json_source(tmp_path):
+    file_path = tmp_path / "data.json"
+    file_path.write_text('{"companies": []}')
+    return DataSource("json", str(file_path))
+
+@pytest.fixture
+def json_result():
+    with open(os.path.join(os.path.dirname(__file__), '../..', 'datasets', 'dataset1.json')) as f:
+        return JSONDataProcessor(json.load(f)).process_data()
+
+@pytest.fixture
+def pptx_source(tmp_path):
+    file_path = tmp_path / "data.pptx"
+    file_path.write_bytes(b"deck")
+    return DataSource("pptx", str(file_path))
+
+# Unit Tests
+class TestResultCache:
+    def test_get_key_tracks_content(self, cache, csv_source):
+        key = cache.get_key(csv_source)
+        assert key.startswith("csv-")
+        assert key.endswith(f"-v{CSVDataProcessor.VERSION}")
+        assert cache.get_key(csv_source) == key
+
+        with open(csv_source.file_path, 'a') as f:
+            f.write("2024-01-02,11.0\n")
+        assert cache.get_key(csv_source) != key
+
+    def test_get_key_tracks_options(self, cache, csv_source):
+        arrow_source = DataSource("csv", csv_source.file_path, {"backend": "arrow"})
+        assert cache.get_key(arrow_source) != cache.get_key(csv_source)
+        assert cache.get_key(arrow_source) == cache.get_key(DataSource("csv", csv_source.file_path, {"backend": "arrow"}))
+
+    def test_miss_returns_none(self, cache, csv_source):
+        assert cache.get(cache.get_key(csv_source)) is None
+
+    def test_tabular_round_trip(self, cache, csv_source):
+        result = [
+            {"Date": pd.Timestamp("2024-01-01"), "Revenue (in $)": 10.5, "Location": "Downtown"},
+            {"Date": pd.Timestamp("2024-01-02"), "Revenue (in $)": 11.0, "Location": "Eastside"}
+        ]
+        key = cache.get_key(csv_source)
+        cache.put(key, result)
+
+        assert cache.list_entries()[0].name.endswith(".parquet")
+        assert isinstance(cache.get(key), ProcessedDataset)
+        assert cache.get(key) == result
+
+    def test_json_round_trip(self, cache, json_source, json_result):
+        # The same ids from two sources, whose children must stay with their own company
+        result = JSONDataProcessor.merge_results([json_result, json_result])
+        key = cache.get_key(json_source)
+        cache.put(key, result)
+
+        assert sorted(entry.name for entry in cache.list_entries()) == [f"{key}.Employees.parquet", f"{key}.Performance.parquet", f"{key}.parquet"]
+        cached = cache.get(key)["json_data"]
+        assert cached.key == "Company_Id"
+        assert cached.to_records() == result["json_data"].to_records()
+        pd.testing.assert_frame_equal(cached.child_frame("Employees"), result["json_data"].child_frame("Employees"))
+
+        cache.invalidate("json")
+        assert cache.list_entries() == []
+
+    def test_json_miss_without_child_table(self, cache, json_source, json_result):
+        key = cache.get_key(json_source)
+        cache.put(key, json_result)
+        os.remove(os.path.join(cache.cache_dir, f"{key}.Employees.parquet"))
+        assert cache.get(key) is None
+
+    def test_nested_round_trip(self, cache, pptx_source):
+        result = {"Quarterly Metrics": {"Q1": {"Revenue": 100.0}}}
+        key = cache.get_key(pptx_source)
+        cache.put(key, result)
+
+        assert cache.list_entries()[0].name.endswith(".pkl")
+        assert cache.get(key) == result
+
+    def test_invalidate_by_type(self, cache, csv_source, pptx_source):
+        cache.put(cache.get_key(csv_source), [{"Revenue (in $)": 1.0}])
+        cache.put(cache.get_key(pptx_source), {"key": "value"})
+
+        cache.invalidate("csv")
+        assert cache.get(cache.get_key(csv_source)) is None
+        assert cache.get(cache.get_key(pptx_source)) == {"key": "value"}
+
+        cache.invalidate()
+        assert cache.list_entries() == []
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = ResultCache(str(tmp_path / "cache"), max_bytes=0)
+        cache.put("pptx-abc-v1", {"key": "value"})
+        assert cache.list_entries() == []
+
+    def test_entries_removed_by_another_worker(self, cache, csv_source, pptx_source):
+        key = cache.get_key(pptx_source)
+        cache.put(key, {"key": "value"})
+        cache.put(cache.get_key(csv_source), [{"Revenue (in $)": 1.0}])
+
+        # Listed before the other worker removed them
+        entries = cache.list_entries()
+        for entry in entries:
+            os.remove(entry.path)
+        cache.max_bytes = 0
+        with patch.object(cache, 'list_entries', return_value=entries):
+            cache.evict()
+            cache.invalidate()
+
+        cache.put(key, {"key": "value"})
+        with patch('os.utime', side_effect=FileNotFoundError):
+            assert cache.get(key) is None
+
+    def test_evicts_child_tables_with_their_result(self, tmp_path, json_source, json_result):
+        cache = ResultCache(str(tmp_path / "cache"))
+        key = cache.get_key(json_source)
+        cache.put(key, json_result)
+        entry_bytes = sum(entry.stat().st_size for entry in cache.list_entries())
+
+        # Room for the JSON result but not for it and a second entry
+        cache.max_bytes = entry_bytes + 1
+        cache.put("pptx-abc-v1", {"key": "value"})
+        assert [entry.name for entry in cache.list_entries()] == ["pptx-abc-v1.pkl"]
+
+if __name__ == '__main__':
+    pytest.main([__file__])
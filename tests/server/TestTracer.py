@@ -0,0 +1,46 @@
+import pytest
+import json
+import time
+from src.server.Tracer import Tracer, span
+
+# Unit Tests
+class TestTracer:
+    def test_nested_spans_written_as_chrome_trace(self, tmp_path):
+        trace_path = tmp_path / "trace.json"
+        tracer = Tracer(str(trace_path))
+        with tracer.span("ingest_data"):
+            with tracer.span("load_data", source="dataset2.csv"):
+                pass
+        tracer.save()
+
+        events = json.loads(trace_path.read_text())["traceEvents"]
+        assert [event["name"] for event in events] == ["ingest_data", "load_data"]
+        assert events[1]["args"] == {"source": "dataset2.csv"}
+        assert events[0]["ts"] <= events[1]["ts"]
+        assert events[1]["ts"] + events[1]["dur"] <= events[0]["ts"] + events[0]["dur"]
+        assert not (tmp_path / "trace.folded").exists()
+
+    def test_sampled_stacks_written_collapsed(self, tmp_path):
+        folded_path = tmp_path / "trace.folded"
+        tracer = Tracer(str(folded_path), sample_interval=0.001)
+        tracer.start_sampling()
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            pass
+        tracer.stop_sampling()
+        tracer.save()
+
+        lines = folded_path.read_text().splitlines()
+        assert any("test_sampled_stacks_written_collapsed (TestTracer.py)" in line for line in lines)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    def test_collapsed_output_requires_sampling(self):
+        with pytest.raises(ValueError):
+            Tracer("trace.folded")
+
+    def test_span_helper_without_tracer(self):
+        with span(None, "merge_results"):
+            pass
+
+if __name__ == '__main__':
+    pytest.main([__file__])
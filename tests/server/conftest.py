@@ -1,10 +1,71 @@
 import pytest
+import json
 import sys
+import time
+import tracemalloc
 from pathlib import Path
 
 root_dir = Path(__file__).resolve().parents[2]
 sys.path.append(str(root_dir))
 
+class BenchmarkBaseline:
+    """Best-of-N timings and tracemalloc peaks per benchmark, compared against and recorded to a JSON file.
+
+    Entries missing from the file are recorded; existing ones are only replaced with update=True.
+    Tiny absolute differences never count as regressions, since they are mostly timer noise.
+    """
+    MIN_SECONDS_DELTA = 0.005
+    MIN_MEMORY_DELTA = 1024 * 1024
+
+    def __init__(self, path, threshold, update=False):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.update = update
+        self.entries = json.loads(self.path.read_text()) if self.path.exists() else {}
+        self.changed = False
+
+    def check(self, name, run, setup=None, repeat=3):
+        """Run run(setup()) repeat times, then fail if it got slower or hungrier than the baseline allows."""
+        seconds = None
+        for _ in range(repeat):
+            args = setup() if setup else None
+            start = time.perf_counter()
+            run(args)
+            elapsed = time.perf_counter() - start
+            seconds = elapsed if seconds is None else min(seconds, elapsed)
+
+        # Memory is traced in a separate run because tracemalloc slows allocations down
+        args = setup() if setup else None
+        tracemalloc.start()
+        try:
+            run(args)
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        result = {"seconds": seconds, "peak_memory": peak_memory}
+        print(f"{name}: {seconds * 1000:.1f} ms, peak {peak_memory / 1024 / 1024:.1f} MiB")
+
+        baseline = self.entries.get(name)
+        if baseline is None or self.update:
+            self.entries[name] = result
+            self.changed = True
+            return result
+
+        regressions = []
+        if seconds > baseline["seconds"] * (1 + self.threshold) and seconds - baseline["seconds"] > self.MIN_SECONDS_DELTA:
+            regressions.append(f"time {baseline['seconds'] * 1000:.1f} ms -> {seconds * 1000:.1f} ms")
+        if peak_memory > baseline["peak_memory"] * (1 + self.threshold) and peak_memory - baseline["peak_memory"] > self.MIN_MEMORY_DELTA:
+            regressions.append(f"peak memory {baseline['peak_memory'] / 1024 / 1024:.1f} MiB -> {peak_memory / 1024 / 1024:.1f} MiB")
+        if regressions:
+            pytest.fail(f"{name} regressed beyond {self.threshold:.0%}: {', '.join(regressions)}")
+        return result
+
+    def save(self):
+        if self.changed:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.entries, indent=2, sort_keys=True) + "\n")
+
 def pytest_addoption(parser):
     parser.addoption(
         "--run-integration", 
@@ -12,13 +73,53 @@ def pytest_addoption(parser):
         default=False, 
         help="run integration tests"
     )
+    parser.addoption(
+        "--run-benchmark", 
+        action="store_true", 
+        default=False, 
+        help="run benchmark tests"
+    )
+    parser.addoption(
+        "--benchmark-baseline",
+        default=str(root_dir / ".benchmarks" / "baseline.json"),
+        help="JSON file benchmark results are compared against and recorded to"
+    )
+    parser.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=0.25,
+        help="fail benchmarks more than this fraction slower or larger than their baseline"
+    )
+    parser.addoption(
+        "--update-benchmark-baseline",
+        action="store_true",
+        default=False,
+        help="overwrite the baseline with this run's benchmark results"
+    )
 
 def pytest_configure(config):
     config.addinivalue_line("markers", "integration: mark test as integration test")
+    config.addinivalue_line("markers", "benchmark: mark test as benchmark test")
 
 def pytest_collection_modifyitems(config, items):
     if not config.getoption("--run-integration"):
         skip_integration = pytest.mark.skip(reason="need --run-integration option to run")
         for item in items:
             if "integration" in item.keywords:
-                item.add_marker(skip_integration)
\ No newline at end of file
+                item.add_marker(skip_integration)
+    if not config.getoption("--run-benchmark"):
+        skip_benchmark = pytest.mark.skip(reason="need --run-benchmark option to run")
+        for item in items:
+            if "benchmark" in item.keywords:
+                item.add_marker(skip_benchmark)
+
+@pytest.fixture(scope="session")
+def benchmark_baseline(request):
+    config = request.config
+    baseline = BenchmarkBaseline(
+        config.getoption("--benchmark-baseline"),
+        config.getoption("--benchmark-threshold"),
+        config.getoption("--update-benchmark-baseline")
+    )
+    yield baseline
+    baseline.save()